@@ -3,10 +3,20 @@ Career Compass AI - Main Streamlit Application
 A web app that analyzes resumes and provides career guidance
 """
 
+import time
 import streamlit as st
-import pandas as pd
-from backend.resume_parser import parse_resume
-from backend.career_analyzer import analyze_career_fit, get_learning_plan, generate_career_roadmap
+from backend import metrics
+from backend.artifacts import get_report_export, get_role_artifacts
+from backend.jobs import CANCELLED, DONE, FAILED, PoolBusyError, get_job_manager
+from backend.learning_optimizer import optimize_learning_path
+from backend.reports import REPORT_FORMATS
+from backend.simulator import SkillSimulator
+
+# Seconds between reruns while an analysis job is running
+ANALYSIS_POLL_SECONDS = 0.3
+
+# Start the metrics exporters once per server process
+metrics.configure_from_env()
 
 
 # Page configuration
@@ -257,14 +267,19 @@ st.markdown("""
 # Initialize session state
 if 'page' not in st.session_state:
     st.session_state.page = 'landing'
-if 'resume_data' not in st.session_state:
-    st.session_state.resume_data = None
-if 'career_matches' not in st.session_state:
-    st.session_state.career_matches = None
+# Compact analysis of the current resume; role details are resolved from
+# the shared catalog at render time
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = None
 if 'selected_role' not in st.session_state:
     st.session_state.selected_role = None
+if 'analysis_job' not in st.session_state:
+    st.session_state.analysis_job = None
+if 'simulator' not in st.session_state:
+    st.session_state.simulator = None
 
 
+@metrics.timed('render_landing_page')
 def landing_page():
     """Landing page with introduction and Get Started button"""
     st.markdown('<div class="main-header"> Career Compass AI</div>', unsafe_allow_html=True)
@@ -300,6 +315,7 @@ def landing_page():
             st.rerun()
 
 
+@metrics.timed('render_upload_page')
 def upload_page():
     """Resume upload and analysis page"""
     st.markdown('<div class="main-header"> Upload Your Resume</div>', unsafe_allow_html=True)
@@ -326,24 +342,65 @@ def upload_page():
         if uploaded_file is not None:
             st.success(f"✅ File uploaded: {uploaded_file.name}")
             
-            if st.button("🔍 Analyze Resume", key="analyze"):
-                with st.spinner("Analyzing your resume... This may take a moment."):
-                    try:
-                        # Parse resume
-                        resume_data = parse_resume(uploaded_file)
-                        st.session_state.resume_data = resume_data
-                        
-                        # Analyze career fit
-                        career_matches = analyze_career_fit(resume_data['skills'])
-                        st.session_state.career_matches = career_matches
-                        
-                        # Move to results page
-                        st.session_state.page = 'results'
-                        st.rerun()
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error analyzing resume: {str(e)}")
-                        st.info("Please make sure your file is a valid PDF or TXT file.")
+            if st.session_state.analysis_job is None and st.button("🔍 Analyze Resume", key="analyze"):
+                try:
+                    job = get_job_manager().submit(uploaded_file.name, uploaded_file.getvalue())
+                    st.session_state.analysis_job = job.id
+                    st.rerun()
+                except PoolBusyError as e:
+                    st.error(f"❌ {str(e)}")
+        
+        if st.session_state.analysis_job is not None:
+            analysis_progress()
+
+
+def analysis_progress():
+    """Show the progress of the running analysis job and collect its result"""
+    manager = get_job_manager()
+    job = manager.get(st.session_state.analysis_job)
+    
+    if job is None:
+        st.session_state.analysis_job = None
+        return
+    
+    if job.status == DONE:
+        st.session_state.analysis = job.result
+        st.session_state.analysis_job = None
+        manager.discard(job.id)
+        
+        # Move to results page
+        st.session_state.page = 'results'
+        st.rerun()
+    
+    elif job.status == FAILED:
+        st.session_state.analysis_job = None
+        manager.discard(job.id)
+        st.error(f"❌ Error analyzing resume: {job.error}")
+        if job.error_info and job.error_info['reason'] != 'invalid':
+            st.info("This file is too large or too complex to process. Please upload a shorter PDF or a TXT file.")
+        else:
+            st.info("Please make sure your file is a valid PDF or TXT file.")
+    
+    elif job.status == CANCELLED:
+        st.session_state.analysis_job = None
+        manager.discard(job.id)
+        st.warning("Analysis cancelled.")
+    
+    else:
+        stage_progress = {'queued': 0.05, 'pages': 0.4, 'skills': 0.8, 'roles': 1.0}
+        st.progress(stage_progress.get(job.stage, 0.05), text="Analyzing your resume... This may take a moment.")
+        st.caption(
+            f"Pages extracted: {job.progress['pages']} · "
+            f"Skills found: {job.progress['skills']} · "
+            f"Roles scored: {job.progress['roles']}"
+        )
+        
+        if st.button("✖ Cancel Analysis", key="cancel_analysis"):
+            job.cancel()
+        
+        # Poll again shortly
+        time.sleep(ANALYSIS_POLL_SECONDS)
+        st.rerun()
 
 
 def get_score_class(score):
@@ -358,6 +415,7 @@ def get_score_class(score):
         return "score-poor"
 
 
+@metrics.timed('render_results_page')
 def results_page():
     """Display analysis results and top career matches"""
     st.markdown('<div class="main-header"> Your Career Analysis</div>', unsafe_allow_html=True)
@@ -365,22 +423,20 @@ def results_page():
     # Back button
     if st.button("← Upload New Resume"):
         st.session_state.page = 'upload'
-        st.session_state.resume_data = None
-        st.session_state.career_matches = None
+        st.session_state.analysis = None
         st.rerun()
     
     st.markdown("---")
     
-    if st.session_state.resume_data and st.session_state.career_matches:
-        resume_data = st.session_state.resume_data
-        career_matches = st.session_state.career_matches
+    if st.session_state.analysis is not None:
+        analysis = st.session_state.analysis
         
         # Display skills found
         st.markdown("<div style=\"animation: slideIn 1s ease-out;\">🎯 Skills Identified in Your Resume</div>", unsafe_allow_html=True)
-        st.info(f"  {resume_data['skill_count']} skills   detected from your resume")
+        st.info(f"  {analysis.skill_count} skills   detected from your resume")
         
         # Display skills in columns
-        skills_list = sorted(list(resume_data['skills']))
+        skills_list = sorted(analysis.skills)
         cols = st.columns(4)
         for idx, skill in enumerate(skills_list):
             with cols[idx % 4]:
@@ -392,7 +448,7 @@ def results_page():
         st.markdown("<div style=\"animation: slideIn 1.2s ease-out;\">🎯 Top Career Matches</div>", unsafe_allow_html=True)
         st.markdown("Based on your skills, here are your best career opportunities:")
         
-        for idx, match in enumerate(career_matches[:3], 1):
+        for idx, match in enumerate(analysis.matches(3), 1):
             with st.expander(f"  #{idx} {match['role_name']}   - Score: {match['combined_score']}/100", expanded=(idx==1)):
                 col1, col2, col3 = st.columns(3)
                 
@@ -419,23 +475,69 @@ def results_page():
                 st.markdown(f"  📚 Skills to Learn ({len(match['missing_skills'])}):   {', '.join(match['missing_skills']) if match['missing_skills'] else 'None'}")
                 
                 if st.button(f"View Learning Path for {match['role_name']}", key=f"view_{idx}"):
-                    st.session_state.selected_role = match
+                    st.session_state.selected_role = match['role_name']
                     st.session_state.page = 'learning'
                     st.rerun()
         
         st.markdown("---")
         
+        skill_simulator(analysis)
+        
+        st.markdown("---")
+        
         # Next button
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
             if st.button("📚 View Detailed Learning Paths", key="next_to_learning"):
-                st.session_state.selected_role = career_matches[0]  # Default to top match
+                st.session_state.selected_role = analysis.role_names[0]  # Default to top match
                 st.session_state.page = 'learning'
                 st.rerun()
 
 
+def get_simulator(analysis):
+    """Return the session's what-if simulator for this resume, creating it if needed"""
+    simulator = st.session_state.simulator
+    if (simulator is None or simulator.fingerprint != analysis.fingerprint
+            or simulator.catalog is not analysis.catalog):
+        simulator = SkillSimulator(analysis.skills, analysis.catalog, fingerprint=analysis.fingerprint)
+        st.session_state.simulator = simulator
+    return simulator
+
+
+def skill_simulator(analysis):
+    """What-if simulator: toggle skills and see the ranking update"""
+    st.markdown("<div style=\"animation: slideIn 1.3s ease-out;\">🧪 What If You Learned...?</div>", unsafe_allow_html=True)
+    st.markdown("Add skills you plan to learn or switch off ones you have to see how your top matches change.")
+    
+    simulator = get_simulator(analysis)
+    resume_skills = sorted(analysis.skills)
+    other_skills = sorted(set(simulator.catalog.index.skill_names) - set(resume_skills))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        added = st.multiselect("Skills to add", other_skills, key="whatif_add")
+    with col2:
+        removed = st.multiselect("Skills to remove", resume_skills, key="whatif_remove")
+    
+    # Only roles sharing a toggled skill are re-scored
+    simulator.set_skills((set(resume_skills) - set(removed)) | set(added))
+    
+    if not added and not removed:
+        st.caption("Select skills above to simulate a different profile.")
+        return
+    
+    for idx, match in enumerate(simulator.top_matches(5), 1):
+        change = match['score_change']
+        change_text = f" ({change:+.1f})" if change else ""
+        st.markdown(f"#{idx} **{match['role_name']}** - Score: {match['combined_score']}/100{change_text} · Skills match: {match['match_score']}%")
+
+
+@metrics.timed('render_learning_page')
 def learning_page():
     """Display detailed learning path and career roadmap"""
+    # pandas is only needed on this page, so it is imported on first use
+    import pandas as pd
+
     st.markdown('<div class="main-header"> Your Learning Path</div>', unsafe_allow_html=True)
     
     # Back button
@@ -445,25 +547,24 @@ def learning_page():
     
     st.markdown("---")
     
-    if st.session_state.selected_role:
-        role = st.session_state.selected_role
+    if st.session_state.selected_role and st.session_state.analysis is not None:
+        analysis = st.session_state.analysis
         
         # Role selector
         st.markdown("### Select a Career Role")
-        role_names = [match['role_name'] for match in st.session_state.career_matches]
+        role_names = analysis.role_names
         selected_role_name = st.selectbox(
             "Choose a role to explore:",
             role_names,
-            index=role_names.index(role['role_name'])
+            index=role_names.index(st.session_state.selected_role)
         )
         
         # Update selected role if changed
-        if selected_role_name != role['role_name']:
-            for match in st.session_state.career_matches:
-                if match['role_name'] == selected_role_name:
-                    st.session_state.selected_role = match
-                    role = match
-                    break
+        st.session_state.selected_role = selected_role_name
+        role = analysis.match(analysis.rank_of(selected_role_name))
+        
+        # Plan and roadmap are computed once per resume and role
+        artifacts = get_role_artifacts(analysis.fingerprint, role, analysis.catalog_version)
         
         st.markdown(f"## {role['role_name']}")
         st.markdown(f" {role['description']} ")
@@ -498,18 +599,15 @@ def learning_page():
             st.markdown("<div style=\"animation: slideIn 1.2s ease-out;\">### 📖 Personalized Learning Plan</div>", unsafe_allow_html=True)
             st.markdown("Here's your roadmap to acquire the missing skills:")
             
-            learning_plan = get_learning_plan(role)
-            
             # Create DataFrame for better display
             df_data = []
-            total_hours = 0
-            for item in learning_plan:
+            for item in artifacts.learning_plan:
                 df_data.append({
                     'Skill': item['skill'],
                     'Learning Resource': f"[YouTube Tutorial]({item['youtube_link']})",
                     'Estimated Time': f"{item['estimated_hours']} hours"
                 })
-                total_hours += item['estimated_hours']
+            total_hours = artifacts.total_hours
             
             df = pd.DataFrame(df_data)
             
@@ -527,70 +625,81 @@ def learning_page():
         st.markdown("<div style=\"animation: slideIn 1.4s ease-out;\">### 🚀 Career Progression Roadmap</div>", unsafe_allow_html=True)
         st.markdown("Your potential career path in this field:")
         
-        roadmap = generate_career_roadmap(role)
-        st.markdown(f'<div style="animation: slideIn 1.4s ease-out;"><strong>{roadmap}</strong></div>', unsafe_allow_html=True)
+        st.markdown(f'<div style="animation: slideIn 1.4s ease-out;"><strong>{artifacts.roadmap}</strong></div>', unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Learning path across several target roles under a time budget
+        st.markdown("<div style=\"animation: slideIn 1.6s ease-out;\">### 🧭 Multi-Role Learning Path</div>", unsafe_allow_html=True)
+        st.markdown("Pick several target roles and the hours you can study; skills shared by your targets are learned once.")
+        
+        target_roles = st.multiselect(
+            "Target roles",
+            role_names,
+            default=[selected_role_name],
+            key="path_targets"
+        )
+        budget_hours = st.number_input(
+            "Study budget in hours (0 for no limit)",
+            min_value=0,
+            value=0,
+            step=10,
+            key="path_budget"
+        )
+        
+        if target_roles:
+            path = optimize_learning_path(
+                [analysis.match(analysis.rank_of(name)) for name in target_roles],
+                budget_hours or None,
+                catalog=analysis.catalog
+            )
+            
+            if path.steps:
+                st.table(pd.DataFrame([
+                    {
+                        'Step': number,
+                        'Skill': step.skill,
+                        'Helps': ", ".join(step.roles),
+                        'Score Gain': f"+{step.score_gain}%",
+                        'Estimated Time': f"{step.estimated_hours} hours"
+                    }
+                    for number, step in enumerate(path.steps, 1)
+                ]))
+                st.info(f"  Total:   {path.total_hours} hours for +{path.score_gain}% combined score across your targets")
+            else:
+                st.success("No skill fits this budget or every target is already covered.")
+            
+            for name, score in path.projected_scores.items():
+                st.markdown(f"**{name}**: {score}% after this path")
+            if path.skipped_skills:
+                st.caption(f"Left for later: {', '.join(path.skipped_skills)}")
         
         st.markdown("---")
         
-        # Download report button (placeholder)
+        # Report export, rendered only when requested
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            st.download_button(
-                label="📥 Download Career Report",
-                data=generate_report(role),
-                file_name=f"career_report_{role['role_name'].replace(' ', '_')}.txt",
-                mime="text/plain"
+            export_format = st.selectbox(
+                "Report format",
+                list(REPORT_FORMATS),
+                format_func=lambda key: REPORT_FORMATS[key].label
             )
-
-
-def generate_report(role: dict) -> str:
-    """Generate a text report for download"""
-    report = f"""
-CAREER COMPASS AI - CAREER ANALYSIS REPORT
-==========================================
-
-Career Role: {role['role_name']}
-Description: {role['description']}
-
-SCORES
-------
-Skills Match: {role['match_score']}%
-Industry Demand: {role['demand_score']}/100
-Overall Score: {role['combined_score']}/100
-
-SKILLS YOU HAVE ({len(role['known_skills'])})
------------------
-{chr(10).join('✓ ' + skill for skill in role['known_skills']) if role['known_skills'] else 'None'}
-
-SKILLS TO LEARN ({len(role['missing_skills'])})
----------------
-{chr(10).join('○ ' + skill for skill in role['missing_skills']) if role['missing_skills'] else 'None'}
-
-LEARNING PLAN
--------------
-"""
-    
-    if role['missing_skills']:
-        learning_plan = get_learning_plan(role)
-        total_hours = 0
-        for item in learning_plan:
-            report += f"\nSkill: {item['skill']}\n"
-            report += f"Resource: {item['youtube_link']}\n"
-            report += f"Estimated Time: {item['estimated_hours']} hours\n"
-            total_hours += item['estimated_hours']
-        
-        report += f"\nTotal Learning Time: {total_hours} hours ({total_hours//40} weeks)\n"
-    
-    report += f"""
-CAREER PROGRESSION ROADMAP
---------------------------
-{generate_career_roadmap(role)}
-
----
-Generated by Career Compass AI
-"""
-    
-    return report
+            export_scope = st.radio("Include", ["This role", "All roles"], horizontal=True)
+            
+            export_key = (analysis.fingerprint, role['role_name'], export_format, export_scope)
+            if st.button("📄 Prepare Report", key="prepare_report"):
+                st.session_state.report_export = export_key
+            
+            if st.session_state.get('report_export') == export_key:
+                export_roles = [role['role_name']] if export_scope == "This role" else None
+                report_format = REPORT_FORMATS[export_format]
+                file_stem = role['role_name'].replace(' ', '_') if export_roles else "all_roles"
+                st.download_button(
+                    label="📥 Download Career Report",
+                    data=get_report_export(analysis, export_format, export_roles),
+                    file_name=f"career_report_{file_stem}.{report_format.extension}",
+                    mime=report_format.mime
+                )
 
 
 # Main app logic
@@ -0,0 +1,251 @@
+"""
+Process-wide cache of finished resume analyses shared by every session
+
+Entries are keyed on the content digest of the upload, its file type and
+the catalog version. They expire after a TTL, and the least recently used
+ones are evicted once the total estimated size exceeds a byte bound.
+Concurrent requests for the same key are coalesced: one caller computes
+while the others wait for its result (single flight).
+
+Configure with CAREER_COMPASS_ANALYSIS_CACHE_BYTES (0 disables caching
+but keeps single flight) and CAREER_COMPASS_ANALYSIS_CACHE_TTL (seconds).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple, Type, TypeVar
+
+from backend import metrics
+
+CACHE_BYTES_ENV = "CAREER_COMPASS_ANALYSIS_CACHE_BYTES"
+CACHE_TTL_ENV = "CAREER_COMPASS_ANALYSIS_CACHE_TTL"
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600.0
+
+# Seconds between checks of the abort callback while waiting on another caller
+WAIT_POLL_SECONDS = 0.1
+
+T = TypeVar('T')
+
+
+class _Entry(NamedTuple):
+    value: object
+    size: int
+    expires_at: float
+
+
+class _Flight:
+    """Computation in progress for one key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU with TTL, a byte bound and single-flight computation
+
+    Args:
+        max_bytes: Maximum total estimated size of cached values (0 caches nothing)
+        ttl_seconds: Lifetime of an entry
+        clock: Monotonic time source (overridable for benchmarks)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss or if it has expired
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: Hashable) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            self._drop(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def put(self, key: Hashable, value: object, size: int) -> None:
+        """
+        Store a value, evicting expired and then least recently used entries
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Estimated size of the value in bytes
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, size, self._clock() + self.ttl_seconds)
+            self.total_bytes += size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        now = self._clock()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            self._drop(key)
+            self.expirations += 1
+        while self.total_bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            self._drop(key)
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T], size_of: Callable[[T], int],
+                       abort_check: Optional[Callable[[], None]] = None,
+                       retry_on: Tuple[Type[BaseException], ...] = ()) -> Tuple[T, str]:
+        """
+        Return the cached value for a key, computing it at most once at a time
+
+        The first caller for a missing key runs ``compute``; callers arriving
+        while it runs wait for its result instead of computing again. If
+        the computation fails, waiting callers receive the same exception,
+        except for exceptions in ``retry_on`` (for example a cancelled
+        leader), after which one of them computes instead.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            size_of: Callable estimating the size of a value in bytes
+            abort_check: Called periodically while waiting; may raise to stop waiting
+            retry_on: Leader exceptions that make waiting callers retry
+
+        Returns:
+            Tuple of (value, outcome) where outcome is 'hit', 'miss' or 'coalesced'
+        """
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += 1
+                    metrics.inc(metrics.ANALYSIS_CACHE_LOOKUPS, 1, 'hit')
+                    return value, 'hit'
+
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+
+            if leader:
+                metrics.inc(metrics.ANALYSIS_CACHE_LOOKUPS, 1, 'miss')
+                try:
+                    flight.value = compute()
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                else:
+                    self.put(key, flight.value, size_of(flight.value))
+                    return flight.value, 'miss'
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+
+            metrics.inc(metrics.ANALYSIS_CACHE_LOOKUPS, 1, 'coalesced')
+            while not flight.done.wait(WAIT_POLL_SECONDS):
+                if abort_check is not None:
+                    abort_check()
+            if flight.error is None:
+                return flight.value, 'coalesced'
+            if not isinstance(flight.error, retry_on):
+                raise flight.error
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = self.misses = self.coalesced = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache effectiveness counters
+
+        Returns:
+            Dictionary with hits, misses, coalesced, evictions, expirations,
+            size and bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'bytes': self.total_bytes
+            }
+
+
+def _cache_from_env() -> AnalysisCache:
+    max_bytes = os.environ.get(CACHE_BYTES_ENV)
+    ttl_seconds = os.environ.get(CACHE_TTL_ENV)
+    return AnalysisCache(
+        max_bytes=int(max_bytes) if max_bytes else DEFAULT_MAX_BYTES,
+        ttl_seconds=float(ttl_seconds) if ttl_seconds else DEFAULT_TTL_SECONDS
+    )
+
+
+_analysis_cache = _cache_from_env()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide analysis cache"""
+    return _analysis_cache
+
+
+def configure_analysis_cache(max_bytes: int = DEFAULT_MAX_BYTES,
+                             ttl_seconds: float = DEFAULT_TTL_SECONDS) -> AnalysisCache:
+    """
+    Replace the process-wide analysis cache
+
+    Args:
+        max_bytes: Maximum total estimated size of cached analyses
+        ttl_seconds: Lifetime of an entry
+
+    Returns:
+        The new cache instance
+    """
+    global _analysis_cache
+    _analysis_cache = AnalysisCache(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+    return _analysis_cache
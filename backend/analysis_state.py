@@ -0,0 +1,259 @@
+"""
+Compact per-session analysis state and a bounded store for resume text
+
+A CompactAnalysis keeps what a session needs to redraw its pages: the
+resume fingerprint, the resume's skills as vocabulary IDs and the ranking
+as parallel arrays of role indexes and known-skill counts. Scores, skill
+lists and role details are rebuilt from the shared catalog when a page
+renders, so no per-session copy of descriptions, resources or career
+paths is kept.
+
+Resume text is not kept per session at all. It goes into one process-wide
+store whose total size is capped by CAREER_COMPASS_MAX_RESUME_TEXT_BYTES
+(0 disables retention).
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.career_analyzer import build_match
+from backend.catalog import RoleCatalog, get_catalog
+from backend.parse_cache import DEFAULT_MAX_TEXT_BYTES, max_text_bytes_from_env
+from backend.scoring import RoleScore
+
+# Rough fixed costs used by CompactAnalysis.nbytes
+_OBJECT_OVERHEAD = 200
+_ARRAY_OVERHEAD = 80
+
+
+class CompactAnalysis:
+    """
+    Ranked analysis of one resume stored as arrays over a shared catalog
+
+    Args:
+        fingerprint: Fingerprint of the analyzed resume
+        skills: Skills found in the resume
+        role_scores: RoleScores in ranking order
+        catalog: Catalog the resume was scored against
+    """
+
+    __slots__ = ('fingerprint', 'catalog', 'skill_ids', 'extra_skills', 'role_order', 'known_counts')
+
+    def __init__(self, fingerprint: str, skills: Iterable[str], role_scores: Iterable[RoleScore],
+                 catalog: RoleCatalog):
+        self.fingerprint = fingerprint
+        self.catalog = catalog
+
+        positions = catalog.skill_positions
+        skill_ids = array('I')
+        extra_skills = []
+        for skill in skills:
+            position = positions.get(skill)
+            if position is None:
+                extra_skills.append(skill)
+            else:
+                skill_ids.append(position)
+        self.skill_ids = skill_ids
+        # Skills outside the vocabulary (only possible with a custom matcher)
+        self.extra_skills = tuple(extra_skills)
+
+        self.role_order = array('I')
+        self.known_counts = array('I')
+        for role_score in role_scores:
+            self.role_order.append(role_score.role_index)
+            self.known_counts.append(role_score.known_count)
+
+    @classmethod
+    def from_resume(cls, resume_data: Dict, catalog: Optional[RoleCatalog] = None,
+                    k: Optional[int] = None) -> "CompactAnalysis":
+        """
+        Rank a parsed resume without materializing any match dictionaries
+
+        Args:
+            resume_data: Result of ``parse_resume``
+            catalog: Catalog to score against (defaults to the current catalog)
+            k: Number of roles to keep (None for every role)
+
+        Returns:
+            CompactAnalysis
+        """
+        catalog = catalog or get_catalog()
+        skill_ids = catalog.index.encode(resume_data['skills'])
+        return cls(resume_data['fingerprint'], resume_data['skills'], catalog.engine.rank(skill_ids, k), catalog)
+
+    @property
+    def skills(self) -> Set[str]:
+        """Skills found in the resume"""
+        vocabulary = self.catalog.skills
+        return {vocabulary[position] for position in self.skill_ids} | set(self.extra_skills)
+
+    @property
+    def skill_count(self) -> int:
+        """Number of skills found in the resume"""
+        return len(self.skill_ids) + len(self.extra_skills)
+
+    @property
+    def catalog_version(self) -> str:
+        """Version of the catalog the ranking came from"""
+        return self.catalog.version
+
+    @property
+    def role_names(self) -> List[str]:
+        """Names of the ranked roles, best first"""
+        names = self.catalog.index.role_names
+        return [names[role_index] for role_index in self.role_order]
+
+    def __len__(self) -> int:
+        return len(self.role_order)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this analysis, excluding the shared catalog"""
+        arrays = (self.skill_ids, self.role_order, self.known_counts)
+        return (
+            _OBJECT_OVERHEAD
+            + sum(_ARRAY_OVERHEAD + len(values) * values.itemsize for values in arrays)
+            + len(self.fingerprint)
+            + sum(len(skill) for skill in self.extra_skills)
+        )
+
+    def rank_of(self, role_name: str) -> int:
+        """Position of a role in the ranking (0 is the best match)"""
+        return self.role_order.index(self.catalog.index.role_ids[role_name])
+
+    def role_score(self, rank: int) -> RoleScore:
+        """Score of the role at a ranking position"""
+        return self.catalog.engine.role_score(self.role_order[rank], self.known_counts[rank])
+
+    def match(self, rank: int) -> Dict:
+        """
+        Full match dictionary of the role at a ranking position
+
+        Args:
+            rank: Position in the ranking (0 is the best match)
+
+        Returns:
+            Role match dictionary in the ``analyze_career_fit`` format
+        """
+        return build_match(self.catalog, self.role_score(rank), self.catalog.index.encode(self.skills))
+
+    def matches(self, k: Optional[int] = None, role_names: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Full match dictionaries of the k best roles, or of the named roles
+
+        Args:
+            k: Number of roles (None for every ranked role)
+            role_names: Build only these roles instead of the k best
+
+        Returns:
+            Role match dictionaries sorted by combined score (highest first)
+        """
+        skill_ids = self.catalog.index.encode(self.skills)
+        if role_names is not None:
+            ranks = sorted(self.rank_of(role_name) for role_name in set(role_names))
+        else:
+            ranks = range(len(self.role_order) if k is None else min(k, len(self.role_order)))
+        return [build_match(self.catalog, self.role_score(rank), skill_ids) for rank in ranks]
+
+    def resume_data(self) -> Dict:
+        """
+        Resume summary in the ``parse_resume`` format
+
+        Returns:
+            Dictionary with skills, skill_count, fingerprint and the retained
+            text (empty if it was not kept or has been evicted)
+        """
+        return {
+            'text': get_text_store().get(self.fingerprint) or "",
+            'skills': self.skills,
+            'skill_count': self.skill_count,
+            'fingerprint': self.fingerprint
+        }
+
+
+class ResumeTextStore:
+    """
+    Process-wide LRU of resume text bounded by total size
+
+    Args:
+        max_bytes: Maximum UTF-8 size of all retained text (0 keeps nothing)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_TEXT_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def put(self, fingerprint: str, text: str) -> bool:
+        """
+        Retain the text of a resume
+
+        Args:
+            fingerprint: Fingerprint of the resume
+            text: Extracted resume text
+
+        Returns:
+            True if the text was retained
+        """
+        size = len(text.encode('utf-8'))
+        if not text or size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if fingerprint in self._texts:
+                self._texts.move_to_end(fingerprint)
+                return True
+            self._texts[fingerprint] = text
+            self._sizes[fingerprint] = size
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                evicted, _ = self._texts.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+        return True
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Retained text of a resume, or None if it was not kept or has been evicted"""
+        with self._lock:
+            text = self._texts.get(fingerprint)
+            if text is not None:
+                self._texts.move_to_end(fingerprint)
+            return text
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+
+_text_store: Optional[ResumeTextStore] = None
+_text_store_lock = threading.Lock()
+
+
+def get_text_store() -> ResumeTextStore:
+    """Return the process-wide resume text store, creating it on first use"""
+    global _text_store
+    if _text_store is None:
+        with _text_store_lock:
+            if _text_store is None:
+                _text_store = ResumeTextStore(max_text_bytes_from_env())
+    return _text_store
+
+
+def configure_text_store(max_bytes: int) -> ResumeTextStore:
+    """
+    Replace the process-wide resume text store
+
+    Args:
+        max_bytes: Maximum UTF-8 size of all retained text (0 keeps nothing)
+
+    Returns:
+        The new store
+    """
+    global _text_store
+    with _text_store_lock:
+        _text_store = ResumeTextStore(max_bytes)
+    return _text_store
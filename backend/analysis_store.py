@@ -0,0 +1,584 @@
+"""
+Persistent SQLite store of analyzed resumes with full-text search
+
+Usage:
+    python -m backend.analysis_store import DB RESUME_DIR_OR_MANIFEST
+    python -m backend.analysis_store [--catalog FILE] rescore DB [--prune]
+    python -m backend.analysis_store search DB "kubernetes AND terraform"
+    python -m backend.analysis_store skills DB "Python,SQL"
+    python -m backend.analysis_store role DB "Data Scientist" [-k 10]
+
+Each resume is stored once per content hash with its skills, the scores
+of every role it shares a skill with (per catalog version) and its text
+in an FTS5 index. Writes are queued and committed in batches, and the
+database runs in WAL mode so readers never wait for a batch. When the
+catalog changes, ``rescore`` scores the stored skills against the new
+version without touching the original files.
+
+Set CAREER_COMPASS_STORE to a database path to record every analysis
+made by the app.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from backend import metrics
+from backend.catalog import RoleCatalog, get_catalog, use_catalog_file
+
+STORE_PATH_ENV = "CAREER_COMPASS_STORE"
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_SECONDS = 1.0
+RESCORE_BATCH_SIZE = 1000
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY,
+        fingerprint TEXT NOT NULL UNIQUE,
+        label TEXT NOT NULL,
+        file_type TEXT NOT NULL,
+        skills TEXT NOT NULL,
+        skill_count INTEGER NOT NULL,
+        analyzed_at REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS resume_skills (
+        fingerprint TEXT NOT NULL,
+        skill TEXT NOT NULL,
+        PRIMARY KEY (fingerprint, skill)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS resume_skills_skill ON resume_skills (skill, fingerprint)",
+    """CREATE TABLE IF NOT EXISTS role_scores (
+        catalog_version TEXT NOT NULL,
+        role_name TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        match_score REAL NOT NULL,
+        combined_score REAL NOT NULL,
+        known_count INTEGER NOT NULL,
+        PRIMARY KEY (catalog_version, role_name, fingerprint)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS role_scores_rank ON role_scores (catalog_version, role_name, combined_score DESC)",
+    "CREATE INDEX IF NOT EXISTS role_scores_resume ON role_scores (fingerprint)",
+    """CREATE TABLE IF NOT EXISTS scored_versions (
+        fingerprint TEXT NOT NULL,
+        catalog_version TEXT NOT NULL,
+        PRIMARY KEY (fingerprint, catalog_version)
+    ) WITHOUT ROWID"""
+)
+
+# The text index is keyed by resumes.id so replacing a resume deletes its
+# text by rowid instead of scanning the index
+_TEXT_INDEX = "CREATE VIRTUAL TABLE IF NOT EXISTS resume_text USING fts5(text)"
+_TEXT_TABLE = "CREATE TABLE IF NOT EXISTS resume_text (text TEXT)"
+
+
+class _PendingResume(NamedTuple):
+    fingerprint: str
+    label: str
+    file_type: str
+    skills: List[str]
+    text: str
+    analyzed_at: float
+    catalog_version: str
+    scores: List[Tuple]
+
+
+def score_rows(fingerprint: str, skills: Iterable[str], catalog: RoleCatalog) -> List[Tuple]:
+    """
+    Score a resume against every role it shares a skill with
+
+    Args:
+        fingerprint: Fingerprint of the resume
+        skills: Skills found in the resume
+        catalog: Catalog to score against
+
+    Returns:
+        role_scores rows (catalog_version, role_name, fingerprint,
+        match_score, combined_score, known_count)
+    """
+    index = catalog.index
+    version = catalog.version
+    return [
+        (version, index.role_names[score.role_index], fingerprint,
+         score.match_score, score.combined_score, score.known_count)
+        for score in catalog.engine.score_touched(index.encode(skills))
+    ]
+
+
+def _report_write_failure(path: str, operation: str, error: sqlite3.Error) -> None:
+    metrics.inc(metrics.STORE_WRITE_FAILURES, 1, operation)
+    print(f"{path}: analysis store {operation} failed: {type(error).__name__}: {error}", file=sys.stderr)
+
+
+class AnalysisStore:
+    """
+    SQLite archive of analyzed resumes with batched writes
+
+    Args:
+        path: Database file (created if missing)
+        batch_size: Queued resumes that trigger a commit
+        flush_seconds: Longest time a queued resume waits for its commit
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._pending: List[_PendingResume] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        try:
+            self._db.execute(_TEXT_INDEX)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: keep the text and search it with LIKE
+            self._db.execute(_TEXT_TABLE)
+            self.full_text = False
+        self._db.commit()
+
+    def add(self, resume_data: Dict, label: str = "", file_type: str = "",
+            catalog: Optional[RoleCatalog] = None) -> None:
+        """
+        Queue a parsed resume and its role scores for the next batch
+
+        Args:
+            resume_data: Result of ``parse_resume``
+            label: Display name such as the file name
+            file_type: Normalized file extension
+            catalog: Catalog to score against (defaults to the current catalog)
+        """
+        catalog = catalog or get_catalog()
+        fingerprint = resume_data['fingerprint']
+        pending = _PendingResume(
+            fingerprint, label, file_type, sorted(resume_data['skills']), resume_data.get('text') or "",
+            time.time(), catalog.version, score_rows(fingerprint, resume_data['skills'], catalog)
+        )
+        with self._lock:
+            self._pending.append(pending)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None and self.flush_seconds:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def try_add(self, resume_data: Dict, label: str = "", file_type: str = "",
+                catalog: Optional[RoleCatalog] = None) -> bool:
+        """
+        Queue a resume like ``add``, reporting database errors instead of raising
+
+        Used by the app, where archiving an analysis must never fail it. A
+        failed write is printed to stderr and counted in the metrics; the
+        queued batch is kept for the next flush.
+
+        Args:
+            resume_data: Result of ``parse_resume``
+            label: Display name such as the file name
+            file_type: Normalized file extension
+            catalog: Catalog to score against (defaults to the current catalog)
+
+        Returns:
+            True if the resume was queued and any triggered flush succeeded
+        """
+        try:
+            self.add(resume_data, label=label, file_type=file_type, catalog=catalog)
+        except sqlite3.Error as e:
+            _report_write_failure(self.path, 'add', e)
+            return False
+        return True
+
+    def _flush_in_background(self) -> None:
+        # Timer threads have no caller to raise to
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            _report_write_failure(self.path, 'flush', e)
+
+    def flush(self) -> int:
+        """
+        Commit every queued resume in one transaction
+
+        A resume queued more than once keeps its latest analysis. If the
+        write fails, the batch is put back in the queue for the next flush
+        and the error is raised.
+
+        Returns:
+            Number of resumes written
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+
+            latest = list({item.fingerprint: item for item in pending}.values())
+            try:
+                self._write(latest)
+            except sqlite3.Error:
+                self._pending[:0] = latest
+                raise
+            return len(latest)
+
+    def _write(self, pending: List[_PendingResume]) -> None:
+        # Callers hold the lock and pass at most one entry per fingerprint
+        fingerprints = [(item.fingerprint,) for item in pending]
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM resume_text WHERE rowid IN (SELECT id FROM resumes WHERE fingerprint = ?)",
+                fingerprints
+            )
+            for table in ('resume_skills', 'role_scores', 'scored_versions'):
+                self._db.executemany(f"DELETE FROM {table} WHERE fingerprint = ?", fingerprints)
+            self._db.executemany(
+                "INSERT INTO resumes (fingerprint, label, file_type, skills, skill_count, analyzed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (fingerprint) DO UPDATE SET "
+                "label = excluded.label, file_type = excluded.file_type, skills = excluded.skills, "
+                "skill_count = excluded.skill_count, analyzed_at = excluded.analyzed_at",
+                [(item.fingerprint, item.label, item.file_type, json.dumps(item.skills),
+                  len(item.skills), item.analyzed_at) for item in pending]
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO resume_skills VALUES (?, ?)",
+                [(item.fingerprint, skill.lower()) for item in pending for skill in item.skills]
+            )
+            self._db.executemany(
+                "INSERT INTO resume_text (rowid, text) SELECT id, ? FROM resumes WHERE fingerprint = ?",
+                [(item.text, item.fingerprint) for item in pending if item.text]
+            )
+            self._db.executemany(
+                "INSERT INTO role_scores VALUES (?, ?, ?, ?, ?, ?)",
+                [row for item in pending for row in item.scores]
+            )
+            self._db.executemany(
+                "INSERT INTO scored_versions VALUES (?, ?)",
+                [(item.fingerprint, item.catalog_version) for item in pending]
+            )
+
+    def rescore(self, catalog: Optional[RoleCatalog] = None, prune: bool = False,
+                batch_size: int = RESCORE_BATCH_SIZE) -> int:
+        """
+        Score stored resumes against a catalog version they lack scores for
+
+        Args:
+            catalog: Catalog to score against (defaults to the current catalog)
+            prune: Delete the scores of every other catalog version
+            batch_size: Resumes written per transaction
+
+        Returns:
+            Number of resumes scored
+        """
+        catalog = catalog or get_catalog()
+        version = catalog.version
+        with self._lock:
+            self.flush()
+            rows = self._db.execute(
+                "SELECT fingerprint, skills FROM resumes WHERE fingerprint NOT IN "
+                "(SELECT fingerprint FROM scored_versions WHERE catalog_version = ?)",
+                (version,)
+            ).fetchall()
+
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                with self._db:
+                    self._db.executemany(
+                        "INSERT INTO role_scores VALUES (?, ?, ?, ?, ?, ?)",
+                        [row for fingerprint, skills in chunk
+                         for row in score_rows(fingerprint, json.loads(skills), catalog)]
+                    )
+                    self._db.executemany(
+                        "INSERT INTO scored_versions VALUES (?, ?)",
+                        [(fingerprint, version) for fingerprint, _ in chunk]
+                    )
+
+            if prune:
+                with self._db:
+                    self._db.execute("DELETE FROM role_scores WHERE catalog_version != ?", (version,))
+                    self._db.execute("DELETE FROM scored_versions WHERE catalog_version != ?", (version,))
+        return len(rows)
+
+    def get(self, fingerprint: str) -> Optional[Dict]:
+        """
+        Look up a stored resume
+
+        Args:
+            fingerprint: Fingerprint of the resume
+
+        Returns:
+            Dictionary with fingerprint, label, file_type, skills,
+            skill_count and analyzed_at, or None if it is not stored
+        """
+        with self._lock:
+            self.flush()
+            row = self._db.execute(
+                "SELECT fingerprint, label, file_type, skills, skill_count, analyzed_at "
+                "FROM resumes WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'fingerprint': row[0],
+            'label': row[1],
+            'file_type': row[2],
+            'skills': set(json.loads(row[3])),
+            'skill_count': row[4],
+            'analyzed_at': row[5]
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def search_text(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Full-text search over the stored resume text
+
+        Args:
+            query: FTS5 query, for example 'kubernetes AND "data pipelines"'
+                (a plain substring when FTS5 is unavailable)
+            limit: Maximum number of results
+
+        Returns:
+            Matching resumes (fingerprint, label, snippet), best match first
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax
+        """
+        with self._lock:
+            self.flush()
+            try:
+                if self.full_text:
+                    rows = self._db.execute(
+                        "SELECT r.fingerprint, r.label, snippet(resume_text, 0, '[', ']', '...', 12) "
+                        "FROM resume_text JOIN resumes r ON r.id = resume_text.rowid "
+                        "WHERE resume_text MATCH ? ORDER BY bm25(resume_text) LIMIT ?",
+                        (query, limit)
+                    ).fetchall()
+                else:
+                    rows = self._db.execute(
+                        "SELECT r.fingerprint, r.label, substr(t.text, max(instr(lower(t.text), lower(?)) - 40, 1), 120) "
+                        "FROM resume_text t JOIN resumes r ON r.id = t.rowid "
+                        "WHERE t.text LIKE ? LIMIT ?",
+                        (query, f"%{query}%", limit)
+                    ).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query: {e}")
+        return [{'fingerprint': row[0], 'label': row[1], 'snippet': row[2]} for row in rows]
+
+    def find_by_skills(self, skills: Iterable[str], limit: int = 100) -> List[Dict]:
+        """
+        Find stored resumes that mention every given skill
+
+        Args:
+            skills: Skills to require (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            Matching resumes (fingerprint, label, skill_count), most recent first
+        """
+        keys = sorted({skill.lower() for skill in skills})
+        if not keys:
+            return []
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            self.flush()
+            rows = self._db.execute(
+                f"SELECT r.fingerprint, r.label, r.skill_count FROM resumes r JOIN ("
+                f"  SELECT fingerprint FROM resume_skills WHERE skill IN ({placeholders})"
+                f"  GROUP BY fingerprint HAVING COUNT(*) = ?"
+                f") matched ON matched.fingerprint = r.fingerprint "
+                f"ORDER BY r.analyzed_at DESC LIMIT ?",
+                (*keys, len(keys), limit)
+            ).fetchall()
+        return [{'fingerprint': row[0], 'label': row[1], 'skill_count': row[2]} for row in rows]
+
+    def top_for_role(self, role_name: str, k: int = 10,
+                     catalog_version: Optional[str] = None) -> List[Dict]:
+        """
+        Best stored resumes for a role
+
+        Args:
+            role_name: Name of the role
+            k: Number of resumes
+            catalog_version: Catalog version of the scores (defaults to the current catalog)
+
+        Returns:
+            Resumes with at least one of the role's skills (fingerprint,
+            label, match_score, combined_score, known_count), best first
+        """
+        version = catalog_version or get_catalog().version
+        with self._lock:
+            self.flush()
+            rows = self._db.execute(
+                "SELECT s.fingerprint, r.label, s.match_score, s.combined_score, s.known_count "
+                "FROM role_scores s JOIN resumes r ON r.fingerprint = s.fingerprint "
+                "WHERE s.catalog_version = ? AND s.role_name = ? "
+                "ORDER BY s.combined_score DESC, r.analyzed_at LIMIT ?",
+                (version, role_name, k)
+            ).fetchall()
+        return [
+            {'fingerprint': row[0], 'label': row[1], 'match_score': row[2],
+             'combined_score': row[3], 'known_count': row[4]}
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Commit queued resumes and close the database"""
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+
+def _open_store(path: Optional[str]) -> Optional[AnalysisStore]:
+    if not path:
+        return None
+    store = AnalysisStore(path)
+    # Commit analyses still waiting for the flush timer when the process exits
+    atexit.register(store.flush)
+    return store
+
+
+_store: Optional[AnalysisStore] = None
+_store_configured = False
+_store_lock = threading.Lock()
+
+
+def get_analysis_store() -> Optional[AnalysisStore]:
+    """Return the process-wide analysis store, or None if CAREER_COMPASS_STORE is not set"""
+    global _store, _store_configured
+    if not _store_configured:
+        with _store_lock:
+            if not _store_configured:
+                path = os.environ.get(STORE_PATH_ENV)
+                _store = _open_store(path)
+                _store_configured = True
+    return _store
+
+
+def configure_analysis_store(path: Optional[str]) -> Optional[AnalysisStore]:
+    """
+    Replace the process-wide analysis store
+
+    Args:
+        path: Database file, or None to stop recording analyses
+
+    Returns:
+        The new store, or None
+    """
+    global _store, _store_configured
+    with _store_lock:
+        previous = _store
+        _store = _open_store(path)
+        _store_configured = True
+    if previous is not None:
+        atexit.unregister(previous.flush)
+        previous.close()
+    return _store
+
+
+def import_resumes(store: AnalysisStore, paths: Iterable[str]) -> Tuple[int, int]:
+    """
+    Parse resume files and add them to a store
+
+    Args:
+        store: Store to add to
+        paths: Resume file paths
+
+    Returns:
+        Tuple of (imported, failed) counts
+    """
+    from backend.resume_parser import parse_resume
+
+    imported = failed = 0
+    for path in paths:
+        try:
+            with open(path, 'rb') as resume_file:
+                resume_data = parse_resume(resume_file, use_cache=False)
+        except Exception as e:
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        store.add(resume_data, label=path, file_type=path.rsplit('.', 1)[-1].lower())
+        imported += 1
+    store.flush()
+    return imported, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Manage and query the analysis store")
+    parser.add_argument('--catalog', help="Role catalog file (.json, .jsonl or SQLite)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="Parse and store resumes")
+    import_parser.add_argument('db')
+    import_parser.add_argument('source', help="Directory of resumes or manifest file with one path per line")
+
+    rescore_parser = commands.add_parser('rescore', help="Score stored resumes against the current catalog")
+    rescore_parser.add_argument('db')
+    rescore_parser.add_argument('--prune', action='store_true', help="Delete scores of other catalog versions")
+
+    search_parser = commands.add_parser('search', help="Full-text search over resume text")
+    search_parser.add_argument('db')
+    search_parser.add_argument('query')
+    search_parser.add_argument('-n', '--limit', type=int, default=20)
+
+    skills_parser = commands.add_parser('skills', help="Resumes mentioning every listed skill")
+    skills_parser.add_argument('db')
+    skills_parser.add_argument('skills', help="Comma-separated skills")
+    skills_parser.add_argument('-n', '--limit', type=int, default=100)
+
+    role_parser = commands.add_parser('role', help="Best stored resumes for a role")
+    role_parser.add_argument('db')
+    role_parser.add_argument('role')
+    role_parser.add_argument('-k', '--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    use_catalog_file(args.catalog)
+    store = AnalysisStore(args.db)
+    try:
+        if args.command == 'import':
+            from backend.batch import discover_resumes
+            imported, failed = import_resumes(store, discover_resumes(args.source))
+            print(f"Imported {imported} resumes ({failed} failed)", file=sys.stderr)
+            return 0
+        if args.command == 'rescore':
+            count = store.rescore(prune=args.prune)
+            print(f"Scored {count} resumes against catalog {get_catalog().version}", file=sys.stderr)
+            return 0
+
+        if args.command == 'search':
+            results = store.search_text(args.query, args.limit)
+        elif args.command == 'skills':
+            results = store.find_by_skills(
+                [skill.strip() for skill in args.skills.split(',') if skill.strip()], args.limit
+            )
+        else:
+            results = store.top_for_role(args.role, args.top)
+        for result in results:
+            print(json.dumps(result))
+        return 0
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Memoized per-role learning plans and roadmaps, and on-demand report exports
+
+Artifacts are keyed on (resume fingerprint, role name, catalog version), so
+Streamlit reruns and role switches on the learning page only re-render
+what was already computed for that resume. Report exports are rendered
+only when a format is requested, from matches built for the requested
+roles alone, and only the rendered bytes are cached.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from backend.analysis_state import CompactAnalysis
+from backend.career_analyzer import get_learning_plan, generate_career_roadmap
+from backend.reports import REPORT_FORMATS, AnalysisReport, render_report
+
+DEFAULT_MAX_ENTRIES = 512
+
+DEFAULT_MAX_EXPORTS = 64
+
+ArtifactKey = Tuple[str, str, str]
+
+T = TypeVar('T')
+
+
+class RoleArtifacts(NamedTuple):
+    """Everything the learning page derives from one role match"""
+    learning_plan: List[Dict]
+    total_hours: int
+    roadmap: str
+
+
+def build_role_artifacts(role_match: Dict) -> RoleArtifacts:
+    """
+    Compute the learning plan, total hours and roadmap of a role match
+
+    Args:
+        role_match: Dictionary containing role match information
+
+    Returns:
+        RoleArtifacts
+    """
+    learning_plan = get_learning_plan(role_match)
+    roadmap = generate_career_roadmap(role_match)
+    return RoleArtifacts(
+        learning_plan=learning_plan,
+        total_hours=sum(item['estimated_hours'] for item in learning_plan),
+        roadmap=roadmap
+    )
+
+
+class ArtifactCache:
+    """
+    Bounded, thread-safe LRU of derived artifacts
+
+    Args:
+        max_entries: Maximum number of artifacts kept
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], T]) -> T:
+        """
+        Return the artifact stored under a key, building it on first use
+
+        Args:
+            key: Cache key
+            builder: Zero-argument callable producing the artifact
+
+        Returns:
+            The cached or freshly built artifact
+        """
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return artifact
+            self.misses += 1
+
+        artifact = builder()
+
+        with self._lock:
+            self._entries[key] = artifact
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return artifact
+
+    def get(self, resume_fingerprint: str, role_match: Dict, catalog_version: str) -> RoleArtifacts:
+        """
+        Return the artifacts of a role match, computing them on first use
+
+        Args:
+            resume_fingerprint: Fingerprint of the analyzed resume
+            role_match: Dictionary containing role match information
+            catalog_version: Version of the catalog the match came from
+
+        Returns:
+            RoleArtifacts
+        """
+        key: ArtifactKey = (resume_fingerprint, role_match['role_name'], catalog_version)
+        return self.get_or_build(key, lambda: build_role_artifacts(role_match))
+
+    def clear(self) -> None:
+        """Drop every cached artifact"""
+        with self._lock:
+            self._entries.clear()
+
+
+_artifact_cache = ArtifactCache()
+_export_cache = ArtifactCache(max_entries=DEFAULT_MAX_EXPORTS)
+
+
+def get_role_artifacts(resume_fingerprint: str, role_match: Dict, catalog_version: str) -> RoleArtifacts:
+    """
+    Return the memoized artifacts of a role match from the process-wide cache
+
+    Args:
+        resume_fingerprint: Fingerprint of the analyzed resume
+        role_match: Dictionary containing role match information
+        catalog_version: Version of the catalog the analysis was ranked
+            against (not the current one, which may have been swapped since)
+
+    Returns:
+        RoleArtifacts
+    """
+    return _artifact_cache.get(resume_fingerprint, role_match, catalog_version)
+
+
+def get_report_export(analysis: CompactAnalysis, fmt: str,
+                      role_names: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Render a downloadable report on demand, memoized per resume, format and roles
+
+    Match dictionaries are built only for the requested roles and dropped
+    once the report is rendered; the cache keeps the rendered bytes.
+
+    Args:
+        analysis: Compact analysis of the resume
+        fmt: Key of ``backend.reports.REPORT_FORMATS``
+        role_names: Names of the roles to include (None for all)
+
+    Returns:
+        UTF-8 encoded report
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt}. Choose one of: {', '.join(REPORT_FORMATS)}")
+    catalog_version = analysis.catalog_version
+    fingerprint = analysis.fingerprint
+    roles_key = None if role_names is None else tuple(sorted(role_names))
+
+    def render() -> bytes:
+        report = AnalysisReport(analysis.resume_data(), analysis.matches(role_names=roles_key), catalog_version)
+        return render_report(fmt, report)
+
+    return _export_cache.get_or_build(('export', fingerprint, catalog_version, fmt, roles_key), render)
@@ -0,0 +1,281 @@
+"""
+Command-line batch analysis of resume files
+
+Usage:
+    python -m backend.batch RESUME_DIR_OR_MANIFEST [-o results.jsonl] [--workers N] [--chunk-size N]
+
+Each resume is parsed and scored in a pool of worker processes and one JSON
+object is written per line as soon as its chunk completes. Failures are
+written as error records instead of aborting the run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from backend import metrics
+from backend.career_analyzer import analyze_career_fit, top_k_roles
+from backend.catalog import use_catalog_file, warm_catalog
+from backend.pdf_pool import configure_pdf_pool
+from backend.resume_parser import parse_resume
+from backend.sandbox import configure_sandbox, get_sandbox
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt', '.text')
+
+DEFAULT_CHUNK_SIZE = 16
+DEFAULT_TOP_ROLES = 5
+
+
+def discover_resumes(source: str) -> Iterator[str]:
+    """
+    List the resume files to analyze
+
+    Args:
+        source: A directory (searched recursively) or a manifest file with
+            one path per line; relative manifest paths are resolved against
+            the manifest's directory and lines starting with # are ignored
+
+    Yields:
+        Paths of resume files
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield os.path.join(root, name)
+        return
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as manifest:
+        for line in manifest:
+            path = line.strip()
+            if not path or path.startswith('#'):
+                continue
+            yield path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+
+def analyze_file(path: str, top_roles: int = DEFAULT_TOP_ROLES) -> Dict:
+    """
+    Parse and score a single resume file
+
+    Args:
+        path: Path of the resume file
+        top_roles: Number of ranked roles to include (0 for all)
+
+    Returns:
+        Result record, or an error record if the file could not be analyzed
+    """
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as resume_file:
+            resume_data = parse_resume(resume_file, use_cache=False, skills_only=True)
+        parsed = time.perf_counter()
+
+        if top_roles:
+            career_matches = top_k_roles(resume_data['skills'], top_roles)
+        else:
+            career_matches = analyze_career_fit(resume_data['skills'])
+        finished = time.perf_counter()
+    except Exception as e:
+        return {
+            'path': path,
+            'error': f"{type(e).__name__}: {e}",
+            'timings_ms': {'total': round((time.perf_counter() - started) * 1000, 2)}
+        }
+
+    return {
+        'path': path,
+        'fingerprint': resume_data['fingerprint'],
+        'skills': sorted(resume_data['skills']),
+        'skill_count': resume_data['skill_count'],
+        'truncated': resume_data['truncated'],
+        'roles': [
+            {
+                'role_name': match['role_name'],
+                'match_score': match['match_score'],
+                'combined_score': match['combined_score']
+            }
+            for match in career_matches
+        ],
+        'timings_ms': {
+            'parse': round((parsed - started) * 1000, 2),
+            'analyze': round((finished - parsed) * 1000, 2),
+            'total': round((finished - started) * 1000, 2)
+        }
+    }
+
+
+def init_worker(catalog_path: Optional[str] = None) -> None:
+    """
+    Prepare a batch worker process
+
+    Files are already spread across worker processes, so large PDFs are
+    extracted inline rather than in a nested page-range pool, and the
+    extraction sandbox (if enabled) keeps its limits but runs a single
+    process per batch worker instead of its own pool.
+
+    Args:
+        catalog_path: Role catalog file (None for the configured catalog)
+    """
+    configure_pdf_pool(threshold=0)
+    sandbox = get_sandbox()
+    if sandbox is not None:
+        configure_sandbox(sandbox.limits, workers=1)
+    warm_catalog(catalog_path)
+
+
+def analyze_chunk(paths: List[str], top_roles: int = DEFAULT_TOP_ROLES) -> List[Dict]:
+    """
+    Analyze a chunk of resume files inside one worker
+
+    Args:
+        paths: Paths of the resume files
+        top_roles: Number of ranked roles to include per resume
+
+    Returns:
+        One record per path, in the same order
+    """
+    return [analyze_file(path, top_roles) for path in paths]
+
+
+def _chunked(paths: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chunk_records(future, chunk: List[str]) -> List[Dict]:
+    """Return a finished chunk's records, or error records if its worker died"""
+    try:
+        return future.result()
+    except Exception as e:
+        return [{'path': path, 'error': f"{type(e).__name__}: {e}"} for path in chunk]
+
+
+def _start_pool(workers: int, catalog_path: Optional[str]) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(catalog_path,))
+
+
+def run_batch(paths: Iterable[str], output: TextIO, workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, top_roles: int = DEFAULT_TOP_ROLES,
+              catalog_path: Optional[str] = None) -> Dict:
+    """
+    Analyze resumes in parallel and stream one JSON line per resume
+
+    At most two chunks per worker are in flight at any time, so memory use
+    stays flat no matter how many paths are supplied. If a worker process
+    dies, the chunks in flight get error records and the run continues in
+    a new pool.
+
+    Args:
+        paths: Resume file paths
+        output: Text stream receiving the JSON lines
+        workers: Number of worker processes (None for one per CPU, 1 to run inline)
+        chunk_size: Number of resumes handed to a worker at a time
+        top_roles: Number of ranked roles to include per resume (0 for all)
+        catalog_path: Role catalog file loaded in every worker (None for the default)
+
+    Returns:
+        Summary with processed, failed and elapsed_seconds
+    """
+    started = time.perf_counter()
+    summary = {'processed': 0, 'failed': 0}
+
+    def emit(records: List[Dict]) -> None:
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+            summary['processed'] += 1
+            if 'error' in record:
+                summary['failed'] += 1
+        output.flush()
+
+    chunks = _chunked(paths, max(chunk_size, 1))
+
+    if workers == 1:
+        use_catalog_file(catalog_path)
+        for chunk in chunks:
+            emit(analyze_chunk(chunk, top_roles))
+    else:
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = workers * 2
+        executor = _start_pool(workers, catalog_path)
+        pending = {}
+
+        def drain() -> None:
+            for future in wait(pending).done:
+                emit(_chunk_records(future, pending[future]))
+            pending.clear()
+
+        try:
+            for chunk in chunks:
+                try:
+                    future = executor.submit(analyze_chunk, chunk, top_roles)
+                except BrokenProcessPool:
+                    # A worker died (OOM kill, crash in a C extension) and took
+                    # the pool down: record the chunks that were in flight as
+                    # failed and continue with a fresh pool
+                    drain()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = _start_pool(workers, catalog_path)
+                    future = executor.submit(analyze_chunk, chunk, top_roles)
+                pending[future] = chunk
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        emit(_chunk_records(future, pending.pop(future)))
+            drain()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Analyze a directory or manifest of PDF/TXT resumes and write JSON lines"
+    )
+    parser.add_argument('source', help="Directory of resumes or manifest file with one path per line")
+    parser.add_argument('-o', '--output', help="Output JSONL file (default: stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU, 1 runs inline)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Resumes per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_ROLES,
+                        help=f"Ranked roles per resume, 0 for all (default: {DEFAULT_TOP_ROLES})")
+    parser.add_argument('--catalog', help="Role catalog file (.json, .jsonl or SQLite)")
+    args = parser.parse_args(argv)
+
+    # Validate the catalog once up front rather than in every worker
+    use_catalog_file(args.catalog)
+    metrics.configure_from_env()
+
+    paths = discover_resumes(args.source)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            summary = run_batch(paths, output, args.workers, args.chunk_size, args.top, args.catalog)
+    else:
+        summary = run_batch(paths, sys.stdout, args.workers, args.chunk_size, args.top, args.catalog)
+
+    print(
+        f"Analyzed {summary['processed']} resumes ({summary['failed']} failed) "
+        f"in {summary['elapsed_seconds']}s",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""
+Reverse search: rank previously analyzed resumes for a role
+
+Usage:
+    python -m backend.candidate_index add INDEX BATCH_RESULTS.jsonl
+    python -m backend.candidate_index query INDEX (--role NAME | --skills "A,B,C") [-k 10]
+
+The index keeps one posting list per skill: the sorted IDs of the
+candidates whose resume mentions it, stored as packed unsigned integer
+arrays. A query walks only the postings of the role's required skills,
+so candidates sharing none of them are never looked at. Candidates are
+scored exactly like ``calculate_match_score`` (case-insensitive, one
+point per required skill) and, for catalog roles, combined with the
+role's demand score like ``analyze_career_fit``.
+
+Index files are a small JSON header followed by the raw posting arrays;
+``batch`` JSONL output can be added directly.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from backend.catalog import RoleCatalog, UnknownRole, get_catalog, use_catalog_file
+from backend.scoring import DEMAND_WEIGHT, MATCH_WEIGHT
+
+MAGIC = b"CCCANDX1"
+DEFAULT_TOP_CANDIDATES = 10
+
+# Posting arrays hold unsigned 32-bit candidate IDs, written little-endian
+_POSTING_TYPECODE = 'I'
+
+
+class CandidateMatch(NamedTuple):
+    """One candidate ranked for a role or skill set"""
+    candidate_id: int
+    fingerprint: str
+    label: str
+    match_score: float
+    combined_score: float
+    known_count: int
+
+
+class CandidateIndex:
+    """
+    Skill posting lists over stored resumes
+
+    Candidates are identified by resume fingerprint; adding a fingerprint
+    again replaces its skills. Replaced entries are skipped by queries and
+    dropped when the index is saved.
+    """
+
+    def __init__(self):
+        self.fingerprints: List[str] = []
+        self.labels: List[str] = []
+        self._alive = bytearray()
+        self._by_fingerprint: Dict[str, int] = {}
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_names: List[str] = []
+        self._postings: List[array] = []
+
+    def __len__(self) -> int:
+        return len(self._by_fingerprint)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._by_fingerprint
+
+    @property
+    def skill_count(self) -> int:
+        """Number of distinct skills with a posting list"""
+        return len(self._skill_names)
+
+    def add(self, fingerprint: str, skills: Iterable[str], label: str = "") -> int:
+        """
+        Store the skills of one analyzed resume
+
+        Args:
+            fingerprint: Fingerprint (content digest) of the resume
+            skills: Skills found in the resume
+            label: Display name such as the file path
+
+        Returns:
+            ID of the candidate
+        """
+        previous = self._by_fingerprint.get(fingerprint)
+        if previous is not None:
+            self._alive[previous] = 0
+
+        candidate_id = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        self.labels.append(label)
+        self._alive.append(1)
+        self._by_fingerprint[fingerprint] = candidate_id
+
+        # IDs only grow, so appending keeps every posting list sorted
+        for key in {skill.lower() for skill in skills}:
+            skill_id = self._skill_ids.get(key)
+            if skill_id is None:
+                skill_id = self._skill_ids[key] = len(self._skill_names)
+                self._skill_names.append(key)
+                self._postings.append(array(_POSTING_TYPECODE))
+            self._postings[skill_id].append(candidate_id)
+        return candidate_id
+
+    def _count_known(self, required_skills: List[str]) -> Counter:
+        # Number of required skills each touched candidate has; a skill
+        # listed twice counts twice, as in calculate_match_score
+        counts = Counter()
+        for skill in required_skills:
+            skill_id = self._skill_ids.get(skill.lower())
+            if skill_id is not None:
+                counts.update(self._postings[skill_id])
+        return counts
+
+    def search(self, required_skills: List[str], k: int = DEFAULT_TOP_CANDIDATES,
+               demand_score: Optional[float] = None) -> List[CandidateMatch]:
+        """
+        Rank candidates against an ad-hoc list of required skills
+
+        Args:
+            required_skills: Skills to match, as in a role's required_skills
+            k: Number of candidates to return
+            demand_score: Demand score to combine with the match score
+                (None ranks by match score alone)
+
+        Returns:
+            Up to k candidates with at least one required skill, best first;
+            ties keep the order in which candidates were added
+        """
+        if not required_skills:
+            return []
+
+        alive = self._alive
+        counts = self._count_known(required_skills)
+        best = heapq.nsmallest(
+            k, ((-count, candidate_id) for candidate_id, count in counts.items() if alive[candidate_id])
+        )
+
+        results = []
+        for negative_count, candidate_id in best:
+            known_count = -negative_count
+            match_score = round(known_count / len(required_skills) * 100, 1)
+            if demand_score is None:
+                combined_score = match_score
+            else:
+                combined_score = round(match_score * MATCH_WEIGHT + demand_score * DEMAND_WEIGHT, 1)
+            results.append(CandidateMatch(
+                candidate_id, self.fingerprints[candidate_id], self.labels[candidate_id],
+                match_score, combined_score, known_count
+            ))
+        return results
+
+    def search_role(self, role_name: str, k: int = DEFAULT_TOP_CANDIDATES,
+                    catalog: Optional[RoleCatalog] = None) -> List[CandidateMatch]:
+        """
+        Rank candidates for a catalog role
+
+        Args:
+            role_name: Name of the role
+            k: Number of candidates to return
+            catalog: Catalog defining the role (defaults to the current catalog)
+
+        Returns:
+            Up to k candidates ranked by the role's combined score
+
+        Raises:
+            UnknownRole: If the catalog has no role with that name
+        """
+        catalog = catalog or get_catalog()
+        if role_name not in catalog:
+            raise UnknownRole(f"Unknown role: {role_name}")
+        index = catalog.index
+        role_index = index.role_ids[role_name]
+        return self.search(catalog.roles[role_name]['required_skills'], k, index.demand_scores[role_index])
+
+    def save(self, path: str) -> None:
+        """
+        Write the index, dropping replaced entries
+
+        The file is written next to the target and moved into place, so
+        readers never see a partial index.
+
+        Args:
+            path: Index file path
+        """
+        # Renumber the live candidates densely, keeping their order
+        new_ids = {}
+        fingerprints = []
+        labels = []
+        for candidate_id, fingerprint in enumerate(self.fingerprints):
+            if self._alive[candidate_id]:
+                new_ids[candidate_id] = len(fingerprints)
+                fingerprints.append(fingerprint)
+                labels.append(self.labels[candidate_id])
+
+        skills = []
+        postings = []
+        for skill, posting in zip(self._skill_names, self._postings):
+            compacted = array(_POSTING_TYPECODE, (
+                new_ids[candidate_id] for candidate_id in posting if candidate_id in new_ids
+            ))
+            if compacted:
+                skills.append(skill)
+                postings.append(compacted)
+
+        header = json.dumps({
+            'fingerprints': fingerprints,
+            'labels': labels,
+            'skills': skills,
+            'posting_lengths': [len(posting) for posting in postings]
+        }).encode('utf-8')
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as index_file:
+            index_file.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for posting in postings:
+                if sys.byteorder == 'big':
+                    posting.byteswap()
+                posting.tofile(index_file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CandidateIndex":
+        """
+        Read an index written by ``save``
+
+        Args:
+            path: Index file path
+
+        Returns:
+            CandidateIndex
+
+        Raises:
+            ValueError: If the file is not a candidate index
+        """
+        with open(path, 'rb') as index_file:
+            if index_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a candidate index: {path}")
+            header_length, = struct.unpack('<I', index_file.read(4))
+            header = json.loads(index_file.read(header_length).decode('utf-8'))
+
+            index = cls()
+            index.fingerprints = header['fingerprints']
+            index.labels = header['labels']
+            index._alive = bytearray(b"\1" * len(index.fingerprints))
+            index._by_fingerprint = {fingerprint: i for i, fingerprint in enumerate(index.fingerprints)}
+            index._skill_names = header['skills']
+            index._skill_ids = {skill: i for i, skill in enumerate(index._skill_names)}
+            for length in header['posting_lengths']:
+                posting = array(_POSTING_TYPECODE)
+                posting.fromfile(index_file, length)
+                if sys.byteorder == 'big':
+                    posting.byteswap()
+                index._postings.append(posting)
+        return index
+
+    @classmethod
+    def open(cls, path: str) -> "CandidateIndex":
+        """Load an index file, or start an empty index if it does not exist yet"""
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def add_batch_results(index: CandidateIndex, lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    Add the records written by ``python -m backend.batch``
+
+    Args:
+        index: Index to add to
+        lines: JSON lines; error records are skipped
+
+    Returns:
+        Tuple of (added, skipped) record counts
+    """
+    added = skipped = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if 'error' in record or 'fingerprint' not in record:
+            skipped += 1
+            continue
+        index.add(record['fingerprint'], record['skills'], record.get('path', ""))
+        added += 1
+    return added, skipped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Build and query the candidate index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = commands.add_parser('add', help="Add batch analysis results (JSONL) to an index")
+    add_parser.add_argument('index', help="Index file (created if missing)")
+    add_parser.add_argument('results', nargs='+', help="JSONL files written by backend.batch")
+
+    query_parser = commands.add_parser('query', help="Rank candidates for a role or skill list")
+    query_parser.add_argument('index', help="Index file")
+    target = query_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--role', help="Role name from the catalog")
+    target.add_argument('--skills', help="Comma-separated required skills")
+    query_parser.add_argument('-k', '--top', type=int, default=DEFAULT_TOP_CANDIDATES,
+                              help=f"Candidates to return (default: {DEFAULT_TOP_CANDIDATES})")
+    query_parser.add_argument('--catalog', help="Role catalog file (.json, .jsonl or SQLite)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        index = CandidateIndex.open(args.index)
+        for path in args.results:
+            with open(path, 'r', encoding='utf-8') as results:
+                added, skipped = add_batch_results(index, results)
+            print(f"{path}: added {added}, skipped {skipped}", file=sys.stderr)
+        index.save(args.index)
+        print(f"{args.index}: {len(index)} candidates, {index.skill_count} skills", file=sys.stderr)
+        return 0
+
+    index = CandidateIndex.load(args.index)
+    if args.role:
+        use_catalog_file(args.catalog)
+        try:
+            matches = index.search_role(args.role, args.top)
+        except UnknownRole as e:
+            print(e.args[0], file=sys.stderr)
+            return 1
+    else:
+        matches = index.search([skill.strip() for skill in args.skills.split(',') if skill.strip()], args.top)
+    for match in matches:
+        print(json.dumps(match._asdict()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
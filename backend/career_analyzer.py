@@ -2,8 +2,16 @@
 Career analysis and job role matching logic
 """
 
-from typing import List, Dict, Set
-from backend.data.job_roles_data import JOB_ROLES_DB
+from typing import List, Dict, Optional, Set
+from backend.catalog import RoleCatalog, UnknownRole, get_catalog
+
+# Study time assumed for a skill without a specific learning resource
+DEFAULT_ESTIMATED_HOURS = 30
+
+
+def resource_link(skill: str) -> str:
+    """Fallback YouTube search link for a skill without a specific resource"""
+    return f"https://www.youtube.com/results?search_query={skill.replace(' ', '+')}+tutorial"
 
 
 def calculate_match_score(user_skills: Set[str], required_skills: List[str]) -> float:
@@ -33,6 +41,87 @@ def calculate_match_score(user_skills: Set[str], required_skills: List[str]) ->
     return round(match_percentage, 1)
 
 
+def build_match(catalog: RoleCatalog, role_score, skill_ids: Set[int]) -> Dict:
+    """
+    Materialize the full match dictionary for one scored role
+
+    Args:
+        catalog: Catalog the role was scored against
+        role_score: RoleScore from the catalog's ScoringEngine
+        skill_ids: User skill IDs from ``RoleIndex.encode``
+
+    Returns:
+        Role match dictionary in the ``analyze_career_fit`` format
+    """
+    index = catalog.index
+    role_index = role_score.role_index
+    role_name = index.role_names[role_index]
+    details = catalog.role_details(role_name)
+
+    return {
+        'role_name': role_name,
+        'match_score': role_score.match_score,
+        'demand_score': index.demand_scores[role_index],
+        'combined_score': role_score.combined_score,
+        'description': details['description'],
+        'required_skills': catalog.roles[role_name]['required_skills'],
+        'known_skills': index.known_skills(role_index, skill_ids),
+        'missing_skills': index.missing_skills(role_index, skill_ids),
+        'learning_resources': details['learning_resources'],
+        'career_path': details['career_path']
+    }
+
+
+def top_k_roles(user_skills: Set[str], k: int, min_score: Optional[float] = None) -> List[Dict]:
+    """
+    Return only the k best job roles for a user
+
+    Roles are selected with a heap over the scores, and the full match
+    dictionaries (including role details fetched from the catalog) are
+    built only for the selected roles.
+
+    Args:
+        user_skills: Set of skills from user's resume
+        k: Number of roles to return
+        min_score: Minimum combined score a role needs to be returned
+
+    Returns:
+        Up to k job role matches sorted by combined score (highest first),
+        in the same format as ``analyze_career_fit``
+    """
+    catalog = get_catalog()
+    skill_ids = catalog.index.encode(user_skills)
+    return [
+        build_match(catalog, role_score, skill_ids)
+        for role_score in catalog.engine.rank(skill_ids, k, min_score)
+    ]
+
+
+def match_role(role_name: str, user_skills: Set[str]) -> Dict:
+    """
+    Score a user against a single named role
+
+    Args:
+        role_name: Name of the role in the current catalog
+        user_skills: Set of skills from user's resume
+
+    Returns:
+        Role match dictionary in the ``analyze_career_fit`` format
+
+    Raises:
+        UnknownRole: If the catalog has no role with that name
+    """
+    catalog = get_catalog()
+    index = catalog.index
+    role_index = index.role_ids.get(role_name)
+    if role_index is None:
+        raise UnknownRole(f"Unknown role: {role_name}")
+
+    skill_ids = index.encode(user_skills)
+    known_count = sum(1 for skill_id in index.role_skill_ids[role_index] if skill_id in skill_ids)
+    return build_match(catalog, catalog.engine.role_score(role_index, known_count), skill_ids)
+
+
 def analyze_career_fit(user_skills: Set[str]) -> List[Dict]:
     """
     Analyze user skills against all job roles and return ranked matches
@@ -45,46 +134,7 @@ def analyze_career_fit(user_skills: Set[str]) -> List[Dict]:
         Each match contains: role_name, match_score, demand_score, 
         combined_score, description, required_skills, missing_skills
     """
-    matches = []
-    
-    for role_name, role_data in JOB_ROLES_DB.items():
-        required_skills = role_data['required_skills']
-        match_score = calculate_match_score(user_skills, required_skills)
-        demand_score = role_data['demand_score']
-        
-        # Combined score: 70% match + 30% demand
-        combined_score = (match_score * 0.7) + (demand_score * 0.3)
-        
-        # Identify missing skills
-        user_skills_lower = {skill.lower() for skill in user_skills}
-        missing_skills = [
-            skill for skill in required_skills 
-            if skill.lower() not in user_skills_lower
-        ]
-        
-        # Identify known skills
-        known_skills = [
-            skill for skill in required_skills 
-            if skill.lower() in user_skills_lower
-        ]
-        
-        matches.append({
-            'role_name': role_name,
-            'match_score': match_score,
-            'demand_score': demand_score,
-            'combined_score': round(combined_score, 1),
-            'description': role_data['description'],
-            'required_skills': required_skills,
-            'known_skills': known_skills,
-            'missing_skills': missing_skills,
-            'learning_resources': role_data['learning_resources'],
-            'career_path': role_data['career_path']
-        })
-    
-    # Sort by combined score (highest first)
-    matches.sort(key=lambda x: x['combined_score'], reverse=True)
-    
-    return matches
+    return top_k_roles(user_skills, len(get_catalog()))
 
 
 def get_learning_plan(role_match: Dict) -> List[Dict]:
@@ -113,8 +163,8 @@ def get_learning_plan(role_match: Dict) -> List[Dict]:
             # Fallback for skills without specific resources
             learning_plan.append({
                 'skill': skill,
-                'youtube_link': f"https://www.youtube.com/results?search_query={skill.replace(' ', '+')}+tutorial",
-                'estimated_hours': 30  # Default estimate
+                'youtube_link': resource_link(skill),
+                'estimated_hours': DEFAULT_ESTIMATED_HOURS
             })
     
     return learning_plan
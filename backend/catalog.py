@@ -0,0 +1,625 @@
+"""
+Pluggable role catalog sources
+
+A catalog keeps only the scoring columns of every role (required skills
+and demand score) plus the skill vocabulary in memory. Descriptions,
+learning resources and career paths are fetched from the source only when
+a role is displayed, and the most recently used ones are kept in a small
+bounded cache.
+
+Supported sources:
+    - the built-in ``JOB_ROLES_DB`` / ``COMMON_SKILLS`` literals
+    - JSON: ``{"skills": [...], "aliases": {...}, "roles": {"Role name": {...}, ...}}``
+    - JSON Lines: one role object per line with a ``role_name`` key, and
+      optional ``{"skills": [...]}`` and ``{"aliases": {...}}`` lines
+    - SQLite: ``roles``, ``skills`` and optional ``aliases`` tables as
+      written by ``write_sqlite_catalog``
+    - Binary (``.ccat``): precompiled by ``backend.catalog_binary`` and
+      memory-mapped, so worker processes share one copy
+
+Aliases map a canonical skill to its alternative spellings, for example
+``{"Kubernetes": ["k8s"]}``, in the shape of ``SKILL_ALIASES``.
+
+Set the CAREER_COMPASS_CATALOG environment variable to a catalog file to
+replace the built-in catalog.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.data.skill_aliases import SKILL_ALIASES
+from backend.role_index import RoleIndex
+from backend.scoring import ScoringEngine
+from backend.skill_matcher import SkillMatcher
+
+CATALOG_PATH_ENV = "CAREER_COMPASS_CATALOG"
+
+BINARY_CATALOG_EXTENSION = ".ccat"
+
+SCORING_FIELDS = ('required_skills', 'demand_score')
+DETAIL_FIELDS = ('description', 'learning_resources', 'career_path')
+
+DEFAULT_DETAILS_CACHE_SIZE = 256
+
+
+class CatalogError(ValueError):
+    """Raised when a catalog source is missing or does not match the schema"""
+
+
+class UnknownRole(KeyError):
+    """Raised when a role name is not in the catalog"""
+
+
+def _check(condition: bool, message: str) -> None:
+    if not condition:
+        raise CatalogError(message)
+
+
+def validate_scoring_fields(role_name: str, role_data: Dict) -> None:
+    """
+    Validate the scoring columns of one role
+
+    Args:
+        role_name: Name of the role
+        role_data: Role data
+
+    Raises:
+        CatalogError: If a column is missing or malformed
+    """
+    _check(isinstance(role_name, str) and role_name.strip() != "", f"Invalid role name: {role_name!r}")
+    skills = role_data.get('required_skills')
+    _check(
+        isinstance(skills, list) and all(isinstance(skill, str) and skill.strip() for skill in skills),
+        f"Role '{role_name}': required_skills must be a list of non-empty strings"
+    )
+    demand_score = role_data.get('demand_score')
+    _check(
+        isinstance(demand_score, (int, float)) and not isinstance(demand_score, bool)
+        and 0 <= demand_score <= 100,
+        f"Role '{role_name}': demand_score must be a number between 0 and 100"
+    )
+
+
+def validate_detail_fields(role_name: str, role_data: Dict) -> None:
+    """
+    Validate the display columns of one role
+
+    Args:
+        role_name: Name of the role
+        role_data: Role data
+
+    Raises:
+        CatalogError: If a column is missing or malformed
+    """
+    _check(isinstance(role_data.get('description'), str), f"Role '{role_name}': description must be a string")
+    career_path = role_data.get('career_path')
+    _check(
+        isinstance(career_path, list) and all(isinstance(step, str) for step in career_path),
+        f"Role '{role_name}': career_path must be a list of strings"
+    )
+    resources = role_data.get('learning_resources')
+    _check(isinstance(resources, dict), f"Role '{role_name}': learning_resources must be an object")
+    for skill, resource in resources.items():
+        _check(
+            isinstance(resource, dict) and isinstance(resource.get('youtube'), str)
+            and isinstance(resource.get('estimated_hours'), (int, float)),
+            f"Role '{role_name}': learning resource for '{skill}' needs youtube and estimated_hours"
+        )
+
+
+def validate_aliases(aliases: Dict) -> Dict[str, List[str]]:
+    """
+    Validate an alias table
+
+    Args:
+        aliases: Mapping of canonical skill to its alternative spellings
+
+    Returns:
+        The alias table
+
+    Raises:
+        CatalogError: If the table is malformed
+    """
+    _check(isinstance(aliases, dict), "aliases must be an object mapping a skill to a list of aliases")
+    for skill, variants in aliases.items():
+        _check(
+            isinstance(variants, list) and all(isinstance(alias, str) and alias.strip() for alias in variants),
+            f"Aliases of '{skill}' must be a list of non-empty strings"
+        )
+    return aliases
+
+
+def _scoring_columns(role_data: Dict) -> Dict:
+    return {field: role_data[field] for field in SCORING_FIELDS}
+
+
+def _detail_columns(role_data: Dict) -> Dict:
+    return {field: role_data[field] for field in DETAIL_FIELDS}
+
+
+def _vocabulary(roles: Dict[str, Dict], skills: Optional[List[str]]) -> List[str]:
+    if skills is not None:
+        _check(
+            isinstance(skills, list) and all(isinstance(skill, str) and skill.strip() for skill in skills),
+            "skills must be a list of non-empty strings"
+        )
+        return list(skills)
+    # Without an explicit vocabulary every required skill is extractable
+    return list(dict.fromkeys(skill for role in roles.values() for skill in role['required_skills']))
+
+
+class RoleCatalog:
+    """
+    Scoring columns of a role catalog with on-demand role details
+
+    Args:
+        roles: Mapping of role name to its scoring columns, in catalog order
+        skills: Skill vocabulary used for resume keyword extraction
+        load_details: Callable returning the detail columns of a role
+        source: Human readable description of where the catalog came from
+        details_cache_size: Number of role details kept in memory
+        aliases: Mapping of canonical skill to its alternative spellings
+        index: Prebuilt RoleIndex (compiled from ``roles`` on first use if omitted)
+        version: Precomputed version digest (computed on first use if omitted)
+    """
+
+    def __init__(self, roles: Dict[str, Dict], skills: List[str],
+                 load_details: Callable[[str], Dict], source: str = "",
+                 details_cache_size: int = DEFAULT_DETAILS_CACHE_SIZE,
+                 aliases: Optional[Dict[str, List[str]]] = None,
+                 index: Optional[RoleIndex] = None, version: Optional[str] = None):
+        _check(len(roles) > 0, f"Catalog contains no roles: {source}")
+        self.roles = roles
+        self.skills = skills
+        self.aliases = aliases or {}
+        self.source = source
+        self._load_details = load_details
+        self._details: "OrderedDict[str, Dict]" = OrderedDict()
+        self._details_cache_size = details_cache_size
+        self._lock = threading.Lock()
+        self._version = version
+        self._skill_positions = None
+        self._index = index
+        self._engine = None
+        self._matcher = None
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __contains__(self, role_name: str) -> bool:
+        return role_name in self.roles
+
+    @property
+    def version(self) -> str:
+        """Digest of the scoring columns and vocabulary, used to key caches"""
+        if self._version is None:
+            columns = [self.skills, list(self.roles.items())]
+            if self.aliases:
+                columns.append(self.aliases)
+            payload = json.dumps(columns, sort_keys=True)
+            self._version = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        return self._version
+
+    @property
+    def skill_positions(self) -> Dict[str, int]:
+        """Mapping of skill name to its position in the vocabulary"""
+        if self._skill_positions is None:
+            self._skill_positions = {skill: position for position, skill in enumerate(self.skills)}
+        return self._skill_positions
+
+    @property
+    def alias_map(self) -> Dict[str, str]:
+        """Mapping of every alias to its canonical skill"""
+        return {alias: skill for skill, variants in self.aliases.items() for alias in variants}
+
+    @property
+    def index(self) -> RoleIndex:
+        """RoleIndex compiled from this catalog on first use"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = RoleIndex(self.roles, self.alias_map)
+        return self._index
+
+    @property
+    def engine(self) -> ScoringEngine:
+        """ScoringEngine over ``index``, compiled on first use"""
+        if self._engine is None:
+            index = self.index
+            with self._lock:
+                if self._engine is None:
+                    self._engine = ScoringEngine(index)
+        return self._engine
+
+    @property
+    def matcher(self) -> SkillMatcher:
+        """SkillMatcher over the skill vocabulary, compiled on first use"""
+        if self._matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    self._matcher = SkillMatcher(self.skills, self.alias_map)
+        return self._matcher
+
+    def compile(self) -> "RoleCatalog":
+        """
+        Build the index, scoring engine and skill matcher now instead of on first use
+
+        Returns:
+            This catalog
+        """
+        self.engine
+        self.matcher
+        return self
+
+    def role_details(self, role_name: str) -> Dict:
+        """
+        Fetch the display columns of a role
+
+        Args:
+            role_name: Name of the role
+
+        Returns:
+            Dictionary with description, learning_resources and career_path
+
+        Raises:
+            KeyError: If the role is not in the catalog
+        """
+        if role_name not in self.roles:
+            raise KeyError(role_name)
+
+        with self._lock:
+            details = self._details.get(role_name)
+            if details is not None:
+                self._details.move_to_end(role_name)
+                return details
+
+        details = self._load_details(role_name)
+        validate_detail_fields(role_name, details)
+
+        with self._lock:
+            self._details[role_name] = details
+            while len(self._details) > self._details_cache_size:
+                self._details.popitem(last=False)
+        return details
+
+    def role(self, role_name: str) -> Dict:
+        """
+        Fetch every column of a role
+
+        Args:
+            role_name: Name of the role
+
+        Returns:
+            Role data in the JOB_ROLES_DB shape
+        """
+        role_data = dict(self.roles[role_name])
+        role_data.update(self.role_details(role_name))
+        return role_data
+
+
+def catalog_from_dict(roles: Dict[str, Dict], skills: Optional[List[str]] = None,
+                      source: str = "<dict>",
+                      aliases: Optional[Dict[str, List[str]]] = None) -> RoleCatalog:
+    """
+    Build a catalog from an in-memory JOB_ROLES_DB shaped mapping
+
+    Args:
+        roles: Mapping of role name to full role data
+        skills: Skill vocabulary (defaults to every required skill)
+        source: Description of the source
+        aliases: Mapping of canonical skill to its alternative spellings
+
+    Returns:
+        RoleCatalog whose details are served from ``roles``
+    """
+    for role_name, role_data in roles.items():
+        _check(isinstance(role_data, dict), f"Role '{role_name}' must be an object")
+        validate_scoring_fields(role_name, role_data)
+        validate_detail_fields(role_name, role_data)
+
+    scoring = {role_name: _scoring_columns(role_data) for role_name, role_data in roles.items()}
+    return RoleCatalog(
+        scoring, _vocabulary(scoring, skills),
+        lambda role_name: _detail_columns(roles[role_name]), source,
+        aliases=validate_aliases(aliases or {})
+    )
+
+
+def load_json_catalog(path: str) -> RoleCatalog:
+    """
+    Load a catalog from a JSON document
+
+    Role details are kept as compact encoded JSON and only decoded when a
+    role is displayed.
+
+    Args:
+        path: Path of the JSON file
+
+    Returns:
+        RoleCatalog
+    """
+    with open(path, 'r', encoding='utf-8') as catalog_file:
+        document = json.load(catalog_file)
+
+    _check(isinstance(document, dict) and isinstance(document.get('roles'), dict),
+           f"{path}: expected an object with a 'roles' object")
+
+    scoring = {}
+    encoded_details = {}
+    for role_name, role_data in document['roles'].items():
+        _check(isinstance(role_data, dict), f"Role '{role_name}' must be an object")
+        validate_scoring_fields(role_name, role_data)
+        validate_detail_fields(role_name, role_data)
+        scoring[role_name] = _scoring_columns(role_data)
+        encoded_details[role_name] = json.dumps(_detail_columns(role_data), separators=(',', ':'))
+
+    return RoleCatalog(
+        scoring, _vocabulary(scoring, document.get('skills')),
+        lambda role_name: json.loads(encoded_details[role_name]), path,
+        aliases=validate_aliases(document.get('aliases', {}))
+    )
+
+
+def load_jsonl_catalog(path: str) -> RoleCatalog:
+    """
+    Load a catalog from a JSON Lines file
+
+    Only the scoring columns and the byte offset of every role are kept;
+    details are re-read from the file when a role is displayed.
+
+    Args:
+        path: Path of the JSON Lines file
+
+    Returns:
+        RoleCatalog
+    """
+    scoring = {}
+    offsets = {}
+    skills = None
+    aliases = {}
+
+    with open(path, 'rb') as catalog_file:
+        offset = catalog_file.tell()
+        for line_number, line in enumerate(iter(catalog_file.readline, b''), 1):
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise CatalogError(f"{path}:{line_number}: invalid JSON ({e})")
+                _check(isinstance(record, dict), f"{path}:{line_number}: expected an object")
+
+                if 'role_name' in record:
+                    role_name = record['role_name']
+                    validate_scoring_fields(role_name, record)
+                    scoring[role_name] = _scoring_columns(record)
+                    offsets[role_name] = offset
+                elif 'skills' in record:
+                    skills = record['skills']
+                elif 'aliases' in record:
+                    aliases.update(validate_aliases(record['aliases']))
+                else:
+                    raise CatalogError(f"{path}:{line_number}: expected a role, skills or aliases record")
+            offset = catalog_file.tell()
+
+    def load_details(role_name: str) -> Dict:
+        with open(path, 'rb') as catalog_file:
+            catalog_file.seek(offsets[role_name])
+            return _detail_columns(json.loads(catalog_file.readline()))
+
+    return RoleCatalog(scoring, _vocabulary(scoring, skills), load_details, path, aliases=aliases)
+
+
+def load_sqlite_catalog(path: str) -> RoleCatalog:
+    """
+    Load a catalog from a SQLite database
+
+    Only the scoring columns are read up front; details are queried when a
+    role is displayed.
+
+    Args:
+        path: Path of the SQLite database
+
+    Returns:
+        RoleCatalog
+    """
+    _check(os.path.exists(path), f"Catalog database not found: {path}")
+    connection = sqlite3.connect(path, check_same_thread=False)
+    lock = threading.Lock()
+
+    try:
+        rows = connection.execute(
+            "SELECT name, required_skills, demand_score FROM roles ORDER BY position"
+        ).fetchall()
+        skill_rows = connection.execute("SELECT name FROM skills ORDER BY position").fetchall()
+    except sqlite3.Error as e:
+        raise CatalogError(f"{path}: not a role catalog database ({e})")
+
+    aliases: Dict[str, List[str]] = {}
+    has_aliases = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aliases'"
+    ).fetchone()
+    if has_aliases:
+        for alias, skill in connection.execute("SELECT alias, skill FROM aliases ORDER BY rowid"):
+            aliases.setdefault(skill, []).append(alias)
+
+    scoring = {}
+    for role_name, required_skills, demand_score in rows:
+        try:
+            role_data = {'required_skills': json.loads(required_skills), 'demand_score': demand_score}
+        except ValueError:
+            raise CatalogError(f"Role '{role_name}': required_skills is not valid JSON")
+        validate_scoring_fields(role_name, role_data)
+        scoring[role_name] = role_data
+
+    def load_details(role_name: str) -> Dict:
+        with lock:
+            description, learning_resources, career_path = connection.execute(
+                "SELECT description, learning_resources, career_path FROM roles WHERE name = ?",
+                (role_name,)
+            ).fetchone()
+        return {
+            'description': description,
+            'learning_resources': json.loads(learning_resources),
+            'career_path': json.loads(career_path)
+        }
+
+    skills = [name for (name,) in skill_rows] or None
+    return RoleCatalog(scoring, _vocabulary(scoring, skills), load_details, path,
+                       aliases=validate_aliases(aliases))
+
+
+def load_catalog(path: str) -> RoleCatalog:
+    """
+    Load a catalog file, choosing the source from its extension
+
+    Args:
+        path: Path of a .json, .jsonl, .ccat, .db, .sqlite or .sqlite3 file
+
+    Returns:
+        RoleCatalog
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        return load_json_catalog(path)
+    if extension == '.jsonl':
+        return load_jsonl_catalog(path)
+    if extension in ('.db', '.sqlite', '.sqlite3'):
+        return load_sqlite_catalog(path)
+    if extension == BINARY_CATALOG_EXTENSION:
+        from backend.catalog_binary import load_binary_catalog
+        return load_binary_catalog(path)
+    raise CatalogError(f"Unsupported catalog format: {path}")
+
+
+def write_json_catalog(catalog: RoleCatalog, path: str) -> None:
+    """
+    Write a catalog as a JSON document
+
+    Args:
+        catalog: Catalog to export
+        path: Destination path
+    """
+    document = {
+        'skills': list(catalog.skills),
+        'aliases': catalog.aliases,
+        'roles': {role_name: catalog.role(role_name) for role_name in catalog.roles}
+    }
+    with open(path, 'w', encoding='utf-8') as catalog_file:
+        json.dump(document, catalog_file, indent=2)
+
+
+def write_sqlite_catalog(catalog: RoleCatalog, path: str) -> None:
+    """
+    Write a catalog as a SQLite database
+
+    Args:
+        catalog: Catalog to export
+        path: Destination path (replaced if it exists)
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(
+            "CREATE TABLE roles (name TEXT PRIMARY KEY, position INTEGER NOT NULL, "
+            "required_skills TEXT NOT NULL, demand_score NUMERIC NOT NULL, description TEXT NOT NULL, "
+            "learning_resources TEXT NOT NULL, career_path TEXT NOT NULL)"
+        )
+        connection.execute("CREATE TABLE skills (name TEXT PRIMARY KEY, position INTEGER NOT NULL)")
+        connection.executemany(
+            "INSERT INTO skills (name, position) VALUES (?, ?)",
+            [(skill, position) for position, skill in enumerate(catalog.skills)]
+        )
+        connection.execute("CREATE TABLE aliases (alias TEXT PRIMARY KEY, skill TEXT NOT NULL)")
+        connection.executemany(
+            "INSERT INTO aliases (alias, skill) VALUES (?, ?)",
+            [(alias, skill) for skill, variants in catalog.aliases.items() for alias in variants]
+        )
+        rows = []
+        for position, role_name in enumerate(catalog.roles):
+            role_data = catalog.role(role_name)
+            rows.append((
+                role_name, position, json.dumps(role_data['required_skills']),
+                role_data['demand_score'], role_data['description'],
+                json.dumps(role_data['learning_resources']), json.dumps(role_data['career_path'])
+            ))
+        connection.executemany("INSERT INTO roles VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.close()
+
+
+_catalog: Optional[RoleCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> RoleCatalog:
+    """
+    Return the process-wide catalog
+
+    The catalog named by CAREER_COMPASS_CATALOG is loaded on first use,
+    falling back to the built-in job roles.
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                path = os.environ.get(CATALOG_PATH_ENV)
+                if path:
+                    _catalog = load_catalog(path)
+                else:
+                    _catalog = catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="builtin",
+                                                 aliases=SKILL_ALIASES)
+    return _catalog
+
+
+def set_catalog(catalog: RoleCatalog) -> RoleCatalog:
+    """
+    Replace the process-wide catalog
+
+    Args:
+        catalog: Catalog to use from now on
+
+    Returns:
+        The catalog
+    """
+    global _catalog
+    with _catalog_lock:
+        _catalog = catalog
+    return catalog
+
+
+def use_catalog_file(path: Optional[str]) -> None:
+    """
+    Load a catalog file and make it the process-wide catalog
+
+    Usable as a process pool initializer. Does nothing when path is empty.
+
+    Args:
+        path: Catalog file path, or None to keep the current catalog
+    """
+    if path:
+        set_catalog(load_catalog(path))
+
+
+def warm_catalog(path: Optional[str] = None) -> RoleCatalog:
+    """
+    Load (optionally from a file) and compile the process-wide catalog
+
+    Nothing is compiled at import time; call this from a worker pool
+    initializer or a background thread so the first request does not pay
+    for building the index and matcher.
+
+    Args:
+        path: Catalog file to load first, or None to keep the current catalog
+
+    Returns:
+        The compiled process-wide catalog
+    """
+    use_catalog_file(path)
+    return get_catalog().compile()
@@ -0,0 +1,459 @@
+"""
+Precompiled binary role catalogs loaded with mmap
+
+Usage:
+    python -m backend.catalog_binary DEST.ccat [--source CATALOG_FILE]
+
+``write_binary_catalog`` compiles a catalog into one file: the skill
+vocabulary, the role-by-skill incidence in both directions (offset and ID
+arrays), demand scores, hash tables for skill and role name lookups and
+the role details, with every string stored once in a shared string table.
+
+``load_binary_catalog`` maps the file read-only and serves the RoleIndex
+straight from the mapping. Nothing is parsed at load time, and processes
+that load the same file share its pages through the page cache instead of
+each building its own copy of the index.
+
+Layout: MAGIC, a little-endian u32 header length, a JSON header (catalog
+version, aliases and section table) and 8-byte aligned sections of packed
+little-endian arrays.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.catalog import (
+    BINARY_CATALOG_EXTENSION, CatalogError, RoleCatalog, get_catalog, use_catalog_file
+)
+from backend.role_index import RoleIndex
+
+MAGIC = b"CCCATLG1"
+
+_ALIGNMENT = 8
+_ID_TYPECODE = 'I'
+_OFFSET_TYPECODE = 'Q'
+
+
+def _key_hash(encoded: bytes) -> int:
+    return zlib.crc32(encoded)
+
+
+class _StringTableBuilder:
+    """Deduplicated UTF-8 strings addressed by ID"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.offsets = array(_OFFSET_TYPECODE, [0])
+
+    def add(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.offsets) - 1
+            self.blob += value.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def _flatten(rows: Iterable[Iterable[int]]) -> Tuple[array, array]:
+    # Offsets and values of a list of lists; row i is values[offsets[i]:offsets[i + 1]]
+    offsets = array(_ID_TYPECODE, [0])
+    values = array(_ID_TYPECODE)
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return offsets, values
+
+
+def _hash_slots(keys: List[bytes]) -> array:
+    # Open addressing with linear probing; a slot holds entry + 1, 0 is empty
+    size = 8
+    while size < len(keys) * 2:
+        size *= 2
+    slots = array(_ID_TYPECODE, bytes(size * array(_ID_TYPECODE).itemsize))
+    for entry, key in enumerate(keys):
+        slot = _key_hash(key) & (size - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (size - 1)
+        slots[slot] = entry + 1
+    return slots
+
+
+def write_binary_catalog(catalog: RoleCatalog, path: str) -> None:
+    """
+    Compile a catalog into a binary catalog file
+
+    The file keeps the catalog's version, so caches keyed by version are
+    shared with the source catalog. It is written next to the target and
+    moved into place, so readers never map a partial file.
+
+    Args:
+        catalog: Catalog to compile
+        path: Destination path
+    """
+    index = catalog.index
+    strings = _StringTableBuilder()
+    role_names = list(catalog.roles)
+    sections: Dict[str, array] = {}
+
+    sections['vocabulary'] = array(_ID_TYPECODE, (strings.add(skill) for skill in catalog.skills))
+    sections['skill_names'] = array(_ID_TYPECODE, (strings.add(name) for name in index.skill_names))
+    sections['role_names'] = array(_ID_TYPECODE, (strings.add(name) for name in role_names))
+
+    demand_scores = [catalog.roles[name]['demand_score'] for name in role_names]
+    sections['demand_scores'] = array('d', demand_scores)
+    sections['demand_is_int'] = array('B', (isinstance(score, int) for score in demand_scores))
+
+    # Required skills exactly as written, duplicates included, for callers
+    # that read the role data rather than the index
+    sections['required_offsets'], sections['required_skills'] = _flatten(
+        [strings.add(skill) for skill in catalog.roles[name]['required_skills']] for name in role_names
+    )
+    sections['role_skill_offsets'], sections['role_skill_ids'] = _flatten(index.role_skill_ids)
+    sections['posting_offsets'], sections['postings'] = _flatten(index.postings)
+
+    skill_keys = list(index.skill_ids)
+    sections['skill_keys'] = array(_ID_TYPECODE, (strings.add(key) for key in skill_keys))
+    sections['skill_key_ids'] = array(_ID_TYPECODE, (index.skill_ids[key] for key in skill_keys))
+    sections['skill_slots'] = _hash_slots([key.encode('utf-8') for key in skill_keys])
+    sections['role_slots'] = _hash_slots([name.encode('utf-8') for name in role_names])
+
+    details = bytearray()
+    detail_offsets = array(_OFFSET_TYPECODE, [0])
+    for name in role_names:
+        details += json.dumps(catalog.role_details(name), separators=(',', ':')).encode('utf-8')
+        detail_offsets.append(len(details))
+    sections['detail_offsets'] = detail_offsets
+    sections['details'] = array('B', details)
+
+    sections['string_offsets'] = strings.offsets
+    sections['strings'] = array('B', strings.blob)
+
+    # Section offsets depend on the header length, so lay out relative to
+    # the end of the header and shift once its size is known
+    layout = {}
+    position = 0
+    for name, values in sections.items():
+        layout[name] = [position, values.typecode, len(values)]
+        position += -(-len(values) * values.itemsize // _ALIGNMENT) * _ALIGNMENT
+
+    def encode_header(shift: int) -> bytes:
+        return json.dumps({
+            'version': catalog.version,
+            'source': catalog.source,
+            'aliases': catalog.aliases,
+            'sections': {name: [offset + shift, typecode, count]
+                         for name, (offset, typecode, count) in layout.items()}
+        }, separators=(',', ':')).encode('utf-8')
+
+    # Pad the header so the first section starts aligned; widening the
+    # offsets can only grow the header, so iterate until it fits
+    shift = 0
+    while True:
+        header = encode_header(shift)
+        start = -(-(len(MAGIC) + 4 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+        if start == shift:
+            break
+        shift = start
+    header += b" " * (start - len(MAGIC) - 4 - len(header))
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as catalog_file:
+        catalog_file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for values in sections.values():
+            if sys.byteorder == 'big':
+                values = array(values.typecode, values)
+                values.byteswap()
+            data = values.tobytes()
+            catalog_file.write(data + bytes(-len(data) % _ALIGNMENT))
+    os.replace(temp_path, path)
+
+
+class _StringTable:
+    """Strings of a mapped catalog, decoded on access"""
+
+    def __init__(self, blob: memoryview, offsets: Sequence):
+        self._blob = blob
+        self._offsets = offsets
+
+    def raw(self, string_id: int) -> memoryview:
+        return self._blob[self._offsets[string_id]:self._offsets[string_id + 1]]
+
+    def __getitem__(self, string_id: int) -> str:
+        return str(self.raw(string_id), 'utf-8')
+
+
+class _StringArray(Sequence):
+    """Read-only list of strings stored as string table IDs"""
+
+    def __init__(self, string_ids: Sequence, strings: _StringTable):
+        self._ids = string_ids
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._strings[string_id] for string_id in self._ids[position]]
+        return self._strings[self._ids[position]]
+
+    def __iter__(self) -> Iterator[str]:
+        strings = self._strings
+        for string_id in self._ids:
+            yield strings[string_id]
+
+
+class _Rows(Sequence):
+    """Read-only list of ID tuples stored as offset and value arrays"""
+
+    def __init__(self, offsets: Sequence, values: Sequence):
+        self._offsets = offsets
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> Tuple[int, ...]:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return tuple(self._values[self._offsets[row]:self._offsets[row + 1]])
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for row in range(len(self)):
+            yield self[row]
+
+
+class _DemandScores(Sequence):
+    """Demand scores with their original int or float type"""
+
+    def __init__(self, scores: Sequence, is_int: Sequence):
+        self._scores = scores
+        self._is_int = is_int
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __getitem__(self, role_index: int):
+        score = self._scores[role_index]
+        return int(score) if self._is_int[role_index] else score
+
+
+class _HashLookup(Mapping):
+    """
+    Read-only string-keyed mapping backed by a mapped hash table
+
+    Args:
+        slots: Hash slots written by ``_hash_slots``
+        keys: String table ID of each entry's key
+        values: Value of each entry (None maps every key to its entry number)
+        strings: String table
+    """
+
+    def __init__(self, slots: Sequence, keys: Sequence, values: Optional[Sequence], strings: _StringTable):
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._keys = keys
+        self._values = values
+        self._strings = strings
+
+    def __getitem__(self, key: str) -> int:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        encoded = key.encode('utf-8')
+        slots = self._slots
+        slot = _key_hash(encoded) & self._mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                raise KeyError(key)
+            entry -= 1
+            if self._strings.raw(self._keys[entry]) == encoded:
+                return entry if self._values is None else self._values[entry]
+            slot = (slot + 1) & self._mask
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        strings = self._strings
+        for string_id in self._keys:
+            yield strings[string_id]
+
+
+class _MappedRoles(Mapping):
+    """Scoring columns of every role, decoded from the mapping on access"""
+
+    def __init__(self, names: _StringArray, role_ids: _HashLookup, required: _Rows,
+                 strings: _StringTable, demand_scores: _DemandScores):
+        self._names = names
+        self._role_ids = role_ids
+        self._required = required
+        self._strings = strings
+        self._demand_scores = demand_scores
+
+    def __getitem__(self, role_name: str) -> Dict:
+        role_index = self._role_ids[role_name]
+        strings = self._strings
+        return {
+            'required_skills': [strings[string_id] for string_id in self._required[role_index]],
+            'demand_score': self._demand_scores[role_index]
+        }
+
+    def __contains__(self, role_name) -> bool:
+        return self._role_ids.get(role_name) is not None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+
+class MappedRoleIndex(RoleIndex):
+    """
+    RoleIndex whose tables are views over a mapped binary catalog
+
+    Lookups and postings are read from the mapping on access.
+    """
+
+    def __init__(self, skill_ids: Mapping, skill_names: Sequence, role_names: Sequence,
+                 role_ids: Mapping, demand_scores: Sequence, role_skill_ids: Sequence,
+                 postings: Sequence):
+        # The parent constructor compiles from role dicts; every table is
+        # already compiled here
+        self.skill_ids = skill_ids
+        self.skill_names = skill_names
+        self.role_names = role_names
+        self.role_ids = role_ids
+        self.demand_scores = demand_scores
+        self.role_skill_ids = role_skill_ids
+        self.postings = postings
+
+
+class _MappedFile:
+    """Sections of a mapped binary catalog"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as catalog_file:
+            try:
+                self._map = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CatalogError(f"Not a binary role catalog: {path}")
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise CatalogError(f"Not a binary role catalog: {path}")
+        header_length, = struct.unpack_from('<I', self._map, len(MAGIC))
+        try:
+            self.header = json.loads(self._map[len(MAGIC) + 4:len(MAGIC) + 4 + header_length])
+        except ValueError as e:
+            raise CatalogError(f"{path}: corrupt binary catalog header ({e})")
+        self.path = path
+        self._view = memoryview(self._map)
+
+    def section(self, name: str) -> Sequence:
+        try:
+            offset, typecode, count = self.header['sections'][name]
+        except KeyError:
+            raise CatalogError(f"{self.path}: binary catalog has no '{name}' section")
+        end = offset + count * array(typecode).itemsize
+        if end > len(self._map):
+            raise CatalogError(f"{self.path}: binary catalog is truncated")
+        view = self._view[offset:end]
+        if typecode == 'B':
+            return view
+        if sys.byteorder == 'big':
+            # Big-endian hosts get a private swapped copy instead of a view
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(typecode)
+
+
+def load_binary_catalog(path: str) -> RoleCatalog:
+    """
+    Map a binary catalog file written by ``write_binary_catalog``
+
+    Args:
+        path: Path of the .ccat file
+
+    Returns:
+        RoleCatalog whose index, scoring columns and details are read from
+        the mapping
+
+    Raises:
+        CatalogError: If the file is not a binary catalog
+    """
+    mapped = _MappedFile(path)
+    strings = _StringTable(mapped.section('strings'), mapped.section('string_offsets'))
+    role_names = _StringArray(mapped.section('role_names'), strings)
+    role_ids = _HashLookup(mapped.section('role_slots'), mapped.section('role_names'), None, strings)
+    demand_scores = _DemandScores(mapped.section('demand_scores'), mapped.section('demand_is_int'))
+
+    index = MappedRoleIndex(
+        skill_ids=_HashLookup(
+            mapped.section('skill_slots'), mapped.section('skill_keys'),
+            mapped.section('skill_key_ids'), strings
+        ),
+        skill_names=_StringArray(mapped.section('skill_names'), strings),
+        role_names=role_names,
+        role_ids=role_ids,
+        demand_scores=demand_scores,
+        role_skill_ids=_Rows(mapped.section('role_skill_offsets'), mapped.section('role_skill_ids')),
+        postings=_Rows(mapped.section('posting_offsets'), mapped.section('postings'))
+    )
+    roles = _MappedRoles(
+        role_names, role_ids,
+        _Rows(mapped.section('required_offsets'), mapped.section('required_skills')),
+        strings, demand_scores
+    )
+
+    details = mapped.section('details')
+    detail_offsets = mapped.section('detail_offsets')
+
+    def load_details(role_name: str) -> Dict:
+        role_index = role_ids[role_name]
+        return json.loads(str(details[detail_offsets[role_index]:detail_offsets[role_index + 1]], 'utf-8'))
+
+    return RoleCatalog(
+        roles, _StringArray(mapped.section('vocabulary'), strings), load_details, path,
+        aliases=mapped.header['aliases'], index=index, version=mapped.header['version']
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compile a role catalog into a binary catalog file")
+    parser.add_argument('dest', help=f"Output file ({BINARY_CATALOG_EXTENSION})")
+    parser.add_argument('--source', help="Catalog file to compile (default: the current catalog)")
+    args = parser.parse_args(argv)
+
+    try:
+        use_catalog_file(args.source)
+        catalog = get_catalog()
+    except CatalogError as e:
+        print(e, file=sys.stderr)
+        return 1
+    write_binary_catalog(catalog, args.dest)
+    print(f"{args.dest}: {len(catalog)} roles, {len(catalog.index.skill_names)} skills, "
+          f"{os.path.getsize(args.dest)} bytes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Alternative spellings of the skills in COMMON_SKILLS
+
+Each canonical skill maps to the variants that should be reported as that
+skill during keyword extraction. Matching is case-insensitive and on whole
+tokens, so only variants that are unambiguous on their own belong here.
+A variant must also not be a token of another skill's spelling: "JS"
+would match inside "Node.js" and "React JS", "ML" inside "ML Ops" and
+"scikit" inside "scikit-image", so those are left out.
+"""
+
+SKILL_ALIASES = {
+    # Programming Languages
+    "JavaScript": ["ECMAScript", "Java Script"],
+    "C++": ["CPP"],
+    "C#": ["CSharp", "C Sharp"],
+    "Go": ["Golang"],
+
+    # Web Technologies
+    "React": ["ReactJS", "React.js", "React JS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Node.js": ["NodeJS", "Node JS"],
+    "Express.js": ["ExpressJS"],
+    "Spring Boot": ["SpringBoot"],
+    "REST APIs": ["REST API", "RESTful API", "RESTful APIs", "RESTful"],
+
+    # Databases
+    "PostgreSQL": ["Postgres", "Postgre SQL", "Postgre"],
+    "MongoDB": ["Mongo"],
+    "NoSQL": ["No SQL"],
+    "DynamoDB": ["Amazon DynamoDB", "Dynamo DB"],
+
+    # Data Science & ML
+    "TensorFlow": ["Tensor Flow"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "NumPy": ["Num Py"],
+    "Data Visualization": ["Data Visualisation", "Data Viz"],
+    "NLP": ["Natural Language Processing"],
+
+    # Cloud & DevOps
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Kubernetes": ["k8s", "K8"],
+    "CI/CD": ["CICD", "CI CD"],
+    "MLOps": ["ML Ops"],
+
+    # Analytics & BI
+    "Power BI": ["PowerBI", "Power-BI"],
+    "Data Cleaning": ["Data Cleansing", "Data Wrangling"],
+    "ETL": ["Extract Transform Load"],
+
+    # Other
+    "Agile": ["Agile Methodologies"],
+    "JIRA": ["Atlassian Jira"],
+}
@@ -0,0 +1,256 @@
+"""
+Process-wide background worker pool for resume analysis jobs
+
+The Streamlit script thread submits a job and polls it on every rerun
+instead of parsing and scoring inline, so a heavy PDF never blocks the
+page and concurrent sessions share one bounded pool of workers.
+
+The workers are threads: they report progress, honour cancellation and
+share the analysis cache and catalog in this process. The CPU-heavy step,
+PDF text extraction, runs in the sandbox's worker processes (see
+backend/sandbox.py), so a job thread mostly waits on those and holds the
+GIL only for skill matching and scoring, which take milliseconds.
+"""
+
+import io
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from backend.analysis_cache import get_analysis_cache
+from backend.analysis_state import CompactAnalysis, get_text_store
+from backend.analysis_store import get_analysis_store
+from backend.catalog import get_catalog, warm_catalog
+from backend.parse_cache import content_digest
+from backend.resume_parser import ProgressCallback, parse_resume
+from backend.sandbox import ExtractionError
+
+# Environment variable overriding the number of analysis workers
+WORKERS_ENV = "CAREER_COMPASS_WORKERS"
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 32
+DEFAULT_MAX_RETAINED = 256
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested"""
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when too many analysis jobs are already waiting"""
+
+
+def run_analysis(filename: str, content: bytes,
+                 progress: Optional[ProgressCallback] = None,
+                 abort_check: Optional[Callable[[], None]] = None) -> CompactAnalysis:
+    """
+    Parse a resume and rank every role, sharing results across sessions
+
+    Results are taken from the process-wide analysis cache when the same
+    file was analyzed against the same catalog before, and concurrent
+    uploads of the same file are computed only once. Match dictionaries are
+    not built here; pages materialize the roles they show from the compact
+    result. The resume text goes to the shared, size-capped text store, and
+    the analysis is archived in the analysis store when one is configured;
+    archive errors are reported but never fail the analysis.
+
+    Args:
+        filename: Original file name, used to detect the file type
+        content: Raw file content
+        progress: Optional callback receiving ('pages', n), ('skills', n)
+            and ('roles', n) updates
+        abort_check: Called while waiting on an identical upload; may raise
+            to stop waiting
+
+    Returns:
+        CompactAnalysis of the resume
+    """
+    catalog = get_catalog()
+    file_type = filename.split('.')[-1].lower()
+    key = (content_digest(content), file_type, catalog.version)
+
+    def compute() -> CompactAnalysis:
+        uploaded_file = io.BytesIO(content)
+        uploaded_file.name = filename
+        resume_data = parse_resume(uploaded_file, progress=progress)
+        get_text_store().put(resume_data['fingerprint'], resume_data['text'])
+        store = get_analysis_store()
+        if store is not None:
+            store.try_add(resume_data, label=filename, file_type=file_type, catalog=catalog)
+        return CompactAnalysis.from_resume(resume_data, catalog)
+
+    analysis, outcome = get_analysis_cache().get_or_compute(
+        key, compute, lambda analysis: analysis.nbytes,
+        abort_check=abort_check, retry_on=(JobCancelled,)
+    )
+    if progress is not None:
+        if outcome != 'miss':
+            progress('skills', analysis.skill_count)
+        progress('roles', len(analysis))
+    return analysis
+
+
+class AnalysisJob:
+    """
+    One submitted analysis with its status, progress counters and result
+    """
+
+    def __init__(self, filename: str):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = QUEUED
+        self.progress: Dict[str, int] = {'pages': 0, 'skills': 0, 'roles': 0}
+        self.stage = QUEUED
+        self.result: Optional[CompactAnalysis] = None
+        self.error: Optional[str] = None
+        # Reason and limit when a sandbox limit rejected the upload
+        self.error_info: Optional[Dict] = None
+        self.future = None
+        self._cancel_requested = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """True once the job has completed, failed or been cancelled"""
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def report(self, stage: str, count: int) -> None:
+        """
+        Progress callback handed to the analysis pipeline
+
+        Args:
+            stage: Name of the counter being updated
+            count: New value of the counter
+
+        Raises:
+            JobCancelled: If cancellation has been requested
+        """
+        self.check_cancelled()
+        self.stage = stage
+        self.progress[stage] = count
+
+    def check_cancelled(self) -> None:
+        """
+        Raise if cancellation has been requested
+
+        Raises:
+            JobCancelled: If cancellation has been requested
+        """
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+
+    def cancel(self) -> None:
+        """Request cancellation; a running job stops at its next progress update"""
+        self._cancel_requested.set()
+        if self.future is not None and self.future.cancel():
+            self.status = CANCELLED
+
+    def run(self, content: bytes) -> None:
+        """Execute the job in a worker thread"""
+        if self._cancel_requested.is_set():
+            self.status = CANCELLED
+            return
+
+        self.status = RUNNING
+        try:
+            self.result = run_analysis(self.filename, content, self.report, self.check_cancelled)
+            self.status = DONE
+        except JobCancelled:
+            self.status = CANCELLED
+        except ExtractionError as e:
+            self.error = str(e)
+            self.error_info = e.to_dict()
+            self.status = FAILED
+        except Exception as e:
+            self.error = str(e)
+            self.status = FAILED
+
+
+class JobManager:
+    """
+    Bounded thread pool plus a registry of recent jobs
+
+    With the sandbox disabled (CAREER_COMPASS_SANDBOX=0) extraction runs on
+    these threads too, and concurrent jobs then contend for the GIL.
+
+    Args:
+        max_workers: Number of analyses running at the same time
+        max_pending: Maximum number of unfinished jobs before submissions are refused
+        max_retained: Maximum number of jobs remembered for polling
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 max_retained: int = DEFAULT_MAX_RETAINED):
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Start compiling the catalog on a worker as soon as the pool exists
+        self._executor.submit(warm_catalog)
+
+    def submit(self, filename: str, content: bytes) -> AnalysisJob:
+        """
+        Queue a resume for analysis
+
+        Args:
+            filename: Original file name
+            content: Raw file content
+
+        Returns:
+            The queued job
+
+        Raises:
+            PoolBusyError: If too many jobs are already pending
+        """
+        job = AnalysisJob(filename)
+        with self._lock:
+            pending = sum(1 for existing in self._jobs.values() if not existing.finished)
+            if pending >= self.max_pending:
+                raise PoolBusyError("The analysis service is busy. Please try again in a moment.")
+
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_retained:
+                oldest_id = next(iter(self._jobs))
+                if not self._jobs[oldest_id].finished:
+                    break
+                del self._jobs[oldest_id]
+
+            job.future = self._executor.submit(job.run, content)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Look up a job by ID"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job once its result has been collected"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, creating it on first use"""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                workers = int(os.environ.get(WORKERS_ENV) or DEFAULT_MAX_WORKERS)
+                _job_manager = JobManager(max_workers=workers)
+    return _job_manager
@@ -0,0 +1,185 @@
+"""
+Multi-role learning path optimizer
+
+Given several target roles and a study-time budget, choose which missing
+skills to learn, and in what order, to gain the most combined score per
+hour. A skill required by several target roles is learned (and counted)
+once and credited to every role that needs it.
+
+Each skill is worth the combined-score points it adds across the target
+roles, so picking skills under a budget is a 0/1 knapsack. Small
+instances are solved exactly by dynamic programming over whole hours;
+larger ones use a greedy pass over a priority queue ordered by score gain
+per hour.
+"""
+
+import heapq
+import math
+from typing import Dict, List, NamedTuple, Optional
+
+from backend.career_analyzer import DEFAULT_ESTIMATED_HOURS, resource_link
+from backend.catalog import RoleCatalog, get_catalog
+from backend.scoring import MATCH_WEIGHT
+
+# Largest (candidate skills x budget hours) solved exactly
+EXACT_SOLVER_LIMIT = 200_000
+
+
+class LearningStep(NamedTuple):
+    """One skill of an optimized learning path"""
+    skill: str
+    youtube_link: str
+    estimated_hours: float
+    roles: List[str]
+    score_gain: float
+
+
+class LearningPath(NamedTuple):
+    """Result of ``optimize_learning_path``"""
+    steps: List[LearningStep]
+    total_hours: float
+    score_gain: float
+    projected_scores: Dict[str, float]
+    skipped_skills: List[str]
+    method: str
+
+
+class _Candidate(NamedTuple):
+    skill: str
+    youtube_link: str
+    hours: float
+    value: float
+    roles: List[str]
+
+
+def _collect_candidates(role_matches: List[Dict]) -> List[_Candidate]:
+    # One candidate per missing skill across all targets, valued by the
+    # combined-score points it adds to each role that requires it
+    skills: Dict[str, Dict] = {}
+    for match in role_matches:
+        per_skill_value = MATCH_WEIGHT * 100 / len(match['required_skills']) if match['required_skills'] else 0.0
+        for skill in match['missing_skills']:
+            resource = match['learning_resources'].get(skill)
+            hours = resource['estimated_hours'] if resource else DEFAULT_ESTIMATED_HOURS
+            link = resource['youtube'] if resource else resource_link(skill)
+
+            candidate = skills.get(skill)
+            if candidate is None:
+                skills[skill] = {'hours': hours, 'link': link, 'value': per_skill_value, 'roles': [match['role_name']]}
+            else:
+                # Shared skills are learned once, from the quickest resource
+                if hours < candidate['hours']:
+                    candidate['hours'] = hours
+                    candidate['link'] = link
+                candidate['value'] += per_skill_value
+                candidate['roles'].append(match['role_name'])
+
+    return [
+        _Candidate(skill, data['link'], data['hours'], data['value'], data['roles'])
+        for skill, data in skills.items()
+    ]
+
+
+def _ratio(candidate: _Candidate) -> float:
+    return candidate.value / candidate.hours if candidate.hours > 0 else math.inf
+
+
+def _select_greedy(candidates: List[_Candidate], budget: float) -> List[_Candidate]:
+    heap = [(-_ratio(candidate), candidate.hours, position) for position, candidate in enumerate(candidates)]
+    heapq.heapify(heap)
+
+    chosen = []
+    remaining = budget
+    while heap and remaining > 0:
+        _, hours, position = heapq.heappop(heap)
+        if hours <= remaining:
+            chosen.append(candidates[position])
+            remaining -= hours
+
+    # A single valuable skill can beat many cheap ones; keep the better plan
+    fitting = [candidate for candidate in candidates if candidate.hours <= budget]
+    if fitting:
+        best_single = max(fitting, key=lambda candidate: candidate.value)
+        if best_single.value > sum(candidate.value for candidate in chosen):
+            return [best_single]
+    return chosen
+
+
+def _select_exact(candidates: List[_Candidate], budget: int) -> List[_Candidate]:
+    # best[h] is the highest value reachable within h hours; keep[i][h]
+    # records whether candidate i is taken in that optimum
+    weights = [math.ceil(candidate.hours) for candidate in candidates]
+    best = [0.0] * (budget + 1)
+    keep = []
+    for candidate, weight in zip(candidates, weights):
+        taken = bytearray(budget + 1)
+        for hours in range(budget, weight - 1, -1):
+            value = best[hours - weight] + candidate.value
+            if value > best[hours] + 1e-9:
+                best[hours] = value
+                taken[hours] = 1
+        keep.append(taken)
+
+    chosen = []
+    hours = budget
+    for position in range(len(candidates) - 1, -1, -1):
+        if keep[position][hours]:
+            chosen.append(candidates[position])
+            hours -= weights[position]
+    return chosen
+
+
+def optimize_learning_path(role_matches: List[Dict], budget_hours: Optional[float] = None,
+                           catalog: Optional[RoleCatalog] = None) -> LearningPath:
+    """
+    Choose and order the missing skills of several target roles under a time budget
+
+    Args:
+        role_matches: Match dictionaries of the target roles (``analyze_career_fit`` format)
+        budget_hours: Study hours available (None to learn every missing skill)
+        catalog: Catalog the matches came from (defaults to the current catalog)
+
+    Returns:
+        LearningPath with the ordered steps, total hours, total combined
+        score gain, projected combined score of every target role, the
+        skills left out and the selection method ('all', 'exact' or 'greedy')
+    """
+    catalog = catalog or get_catalog()
+    candidates = _collect_candidates(role_matches)
+
+    if budget_hours is None or budget_hours >= sum(candidate.hours for candidate in candidates):
+        chosen, method = candidates, 'all'
+    elif len(candidates) * max(int(budget_hours), 1) <= EXACT_SOLVER_LIMIT:
+        chosen, method = _select_exact(candidates, max(int(budget_hours), 0)), 'exact'
+    else:
+        chosen, method = _select_greedy(candidates, budget_hours), 'greedy'
+
+    # Learn the most score per hour first
+    chosen = sorted(chosen, key=lambda candidate: (-_ratio(candidate), candidate.hours, candidate.skill))
+
+    index = catalog.index
+    engine = catalog.engine
+    known_counts = {match['role_name']: len(match['known_skills']) for match in role_matches}
+    projected = {match['role_name']: match['combined_score'] for match in role_matches}
+
+    steps = []
+    for candidate in chosen:
+        step_gain = 0.0
+        for role_name in candidate.roles:
+            known_counts[role_name] += 1
+            score = engine.role_score(index.role_ids[role_name], known_counts[role_name]).combined_score
+            step_gain += score - projected[role_name]
+            projected[role_name] = score
+        steps.append(LearningStep(
+            candidate.skill, candidate.youtube_link, candidate.hours, candidate.roles, round(step_gain, 1)
+        ))
+
+    chosen_skills = {candidate.skill for candidate in chosen}
+    return LearningPath(
+        steps=steps,
+        total_hours=sum(step.estimated_hours for step in steps),
+        score_gain=round(sum(projected.values()) - sum(match['combined_score'] for match in role_matches), 1),
+        projected_scores=projected,
+        skipped_skills=[candidate.skill for candidate in candidates if candidate.skill not in chosen_skills],
+        method=method
+    )
@@ -0,0 +1,368 @@
+"""
+In-process latency and throughput metrics with Prometheus text export
+
+Instrumentation is off by default and costs a single flag check per call
+while disabled. Enable it with CAREER_COMPASS_METRICS=1 (or ``enable()``),
+then export with ``render_prometheus()``, ``write_prometheus(path)``, a
+periodic file writer (CAREER_COMPASS_METRICS_FILE) or a local HTTP
+endpoint (CAREER_COMPASS_METRICS_PORT).
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+METRICS_ENV = "CAREER_COMPASS_METRICS"
+METRICS_PORT_ENV = "CAREER_COMPASS_METRICS_PORT"
+METRICS_FILE_ENV = "CAREER_COMPASS_METRICS_FILE"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SKILL_BUCKETS = (0, 1, 5, 10, 20, 30, 50, 75, 100, 200)
+
+_enabled = False
+_configured = False
+_configure_lock = threading.Lock()
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        """Add to the counter"""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Current value for the given label values"""
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by label values"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float],
+                 label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation"""
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        """Number of observations for the given label values"""
+        with self._lock:
+            series = self._series.get(label_values)
+            return sum(series[:-1]) if series else 0
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), series[:-1]):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float('inf') else _format_value(bound)
+                    labels = _format_labels(self.label_names, label_values, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """Named collection of counters and histograms"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help_text, label_names)
+            return self._metrics[name]
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float],
+                  label_names: Sequence[str] = ()) -> Histogram:
+        """Get or create a histogram"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, buckets, label_names)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "careercompass_stage_seconds", "Wall-clock time spent in each pipeline stage",
+    LATENCY_BUCKETS, ("stage",)
+)
+PDF_PAGES = REGISTRY.histogram(
+    "careercompass_pdf_pages", "Pages extracted per PDF document", PAGE_BUCKETS
+)
+SKILLS_FOUND = REGISTRY.histogram(
+    "careercompass_skills_found", "Skills identified per parsed resume", SKILL_BUCKETS
+)
+BYTES_PROCESSED = REGISTRY.counter(
+    "careercompass_bytes_processed_total", "Bytes of uploaded resumes processed", ("file_type",)
+)
+PARSE_CACHE_LOOKUPS = REGISTRY.counter(
+    "careercompass_parse_cache_lookups_total", "Parse cache lookups by result", ("result",)
+)
+ANALYSIS_CACHE_LOOKUPS = REGISTRY.counter(
+    "careercompass_analysis_cache_lookups_total",
+    "Shared analysis cache lookups by result (hit, miss or coalesced)", ("result",)
+)
+EXTRACTION_FAILURES = REGISTRY.counter(
+    "careercompass_extraction_failures_total",
+    "Sandboxed PDF extractions rejected or aborted, by reason", ("reason",)
+)
+SERVICE_REQUESTS = REGISTRY.counter(
+    "careercompass_service_requests_total",
+    "HTTP analysis service requests by endpoint and status code", ("endpoint", "status")
+)
+STORE_WRITE_FAILURES = REGISTRY.counter(
+    "careercompass_store_write_failures_total",
+    "Analysis store writes that failed with a database error, by operation (add or flush)", ("operation",)
+)
+SANDBOX_RECYCLES = REGISTRY.counter(
+    "careercompass_sandbox_recycles_total",
+    "Extraction worker processes retired, by cause (jobs or failure)", ("cause",)
+)
+
+
+def enable() -> None:
+    """Turn instrumentation on"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Turn instrumentation off"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is currently on"""
+    return _enabled
+
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator recording the wall-clock time of every call under a stage label
+
+    Args:
+        stage: Value of the ``stage`` label
+
+    Returns:
+        Decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage)
+        return wrapper
+    return decorator
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record time spent in a stage that the caller measured itself
+
+    Used where a stage is interleaved with another one, such as PDF pages
+    being extracted and matched in turn, so it cannot be wrapped in a
+    single timed call.
+
+    Args:
+        stage: Value of the ``stage`` label
+        seconds: Time spent in the stage
+    """
+    if _enabled:
+        STAGE_SECONDS.observe(seconds, stage)
+
+
+def observe(histogram: Histogram, value: float, *label_values: str) -> None:
+    """Record a histogram observation when instrumentation is enabled"""
+    if _enabled:
+        histogram.observe(value, *label_values)
+
+
+def inc(counter: Counter, amount: float = 1, *label_values: str) -> None:
+    """Increment a counter when instrumentation is enabled"""
+    if _enabled:
+        counter.inc(amount, *label_values)
+
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format"""
+    return REGISTRY.render()
+
+
+def write_prometheus(path: str) -> None:
+    """
+    Atomically write the current metrics to a file
+
+    Suitable for the node exporter textfile collector.
+
+    Args:
+        path: Destination file path
+    """
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(render_prometheus())
+    os.replace(temporary_path, path)
+
+
+def start_metrics_file_writer(path: str, interval: float = 15.0) -> threading.Thread:
+    """
+    Rewrite the metrics file periodically from a daemon thread
+
+    Args:
+        path: Destination file path
+        interval: Seconds between writes
+
+    Returns:
+        The writer thread
+    """
+    def write_forever():
+        while True:
+            write_prometheus(path)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=write_forever, name="metrics-file-writer", daemon=True)
+    thread.start()
+    return thread
+
+
+def _make_handler() -> type:
+    # http.server pulls in email, ssl and socket; only pay for it when serving
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """
+    Serve the metrics on http://host:port/metrics from a daemon thread
+
+    Args:
+        port: TCP port
+        host: Interface to bind (local only by default)
+
+    Returns:
+        The running server
+    """
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _make_handler())
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def configure_from_env() -> None:
+    """
+    Enable instrumentation and exporters according to the environment
+
+    Called by the entry points (the Streamlit app, the HTTP service and the
+    batch CLI) rather than at import, so worker processes that import this
+    module never bind the exporter port or overwrite the metrics file.
+    Only the first call in a process has any effect, and calls from
+    multiprocessing children do nothing.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+    # Worker processes always have multiprocessing loaded; the exporters
+    # belong to their parent
+    multiprocessing = sys.modules.get('multiprocessing')
+    if multiprocessing is not None and multiprocessing.parent_process() is not None:
+        return
+    if os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes", "on"):
+        enable()
+        port = os.environ.get(METRICS_PORT_ENV)
+        if port:
+            start_metrics_server(int(port))
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            start_metrics_file_writer(path)
@@ -0,0 +1,247 @@
+"""
+Content-addressed cache for parsed resumes with an optional on-disk tier
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Environment variable naming a directory for the persistent cache tier
+CACHE_DIR_ENV = "CAREER_COMPASS_CACHE_DIR"
+
+# Environment variable capping the resume text kept across all sessions;
+# the in-memory tier of the parse cache honours the same limit
+MAX_TEXT_BYTES_ENV = "CAREER_COMPASS_MAX_RESUME_TEXT_BYTES"
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_TEXT_BYTES = 64 * 1024 * 1024
+
+
+def max_text_bytes_from_env() -> int:
+    """Resume text limit from CAREER_COMPASS_MAX_RESUME_TEXT_BYTES, or the default"""
+    max_bytes = os.environ.get(MAX_TEXT_BYTES_ENV)
+    return int(max_bytes) if max_bytes else DEFAULT_MAX_TEXT_BYTES
+
+
+def content_digest(content: bytes) -> str:
+    """
+    Compute the digest that identifies an uploaded file
+
+    Args:
+        content: Raw bytes of the uploaded file
+
+    Returns:
+        Hex encoded SHA-256 digest
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(digest: str, file_type: str, vocabulary_fingerprint: str,
+                   options: str = "") -> str:
+    """
+    Build the cache key for one parse result
+
+    Args:
+        digest: Content digest of the uploaded file
+        file_type: Normalized file extension ("pdf", "txt", ...)
+        vocabulary_fingerprint: Fingerprint of the skill vocabulary
+        options: Parse options that change the result (budgets, modes)
+
+    Returns:
+        Cache key string
+    """
+    return f"{digest}:{file_type}:{vocabulary_fingerprint}:{options}"
+
+
+def _encode(result: Dict) -> str:
+    payload = dict(result)
+    payload['skills'] = sorted(result['skills'])
+    return json.dumps(payload)
+
+
+def _decode(raw: str) -> Dict:
+    result = json.loads(raw)
+    result['skills'] = set(result['skills'])
+    return result
+
+
+def _text_size(result: Dict) -> int:
+    return len(result.get('text', '').encode('utf-8'))
+
+
+def _copy(result: Dict) -> Dict:
+    copied = dict(result)
+    copied['skills'] = set(result['skills'])
+    return copied
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parse results backed by an optional SQLite store
+
+    Entries are keyed on the content digest of the uploaded file plus the
+    fingerprint of the skill vocabulary, so re-uploading the same file
+    skips PDF extraction entirely while a vocabulary change invalidates
+    every earlier result.
+
+    The in-memory tier is bounded both by entry count and by the total
+    UTF-8 size of the resume text it holds; a result whose text alone
+    exceeds that size is only kept on disk.
+
+    Args:
+        max_entries: Maximum number of results kept in memory
+        disk_dir: Directory for the persistent SQLite tier, or None to disable it
+        max_text_bytes: Maximum size of the resume text kept in memory
+            (defaults to CAREER_COMPASS_MAX_RESUME_TEXT_BYTES)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Optional[str] = None,
+                 max_text_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_text_bytes = max_text_bytes_from_env() if max_text_bytes is None else max_text_bytes
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.text_bytes = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._db = sqlite3.connect(
+                os.path.join(disk_dir, "parse_cache.sqlite3"),
+                check_same_thread=False
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a parse result
+
+        Args:
+            key: Cache key built with ``make_cache_key``
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(result)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM parse_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    result = _decode(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return _copy(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: Dict) -> None:
+        """
+        Store a parse result
+
+        Args:
+            key: Cache key built with ``make_cache_key``
+            result: Result dictionary returned by ``parse_resume``
+        """
+        with self._lock:
+            self._remember(key, _copy(result))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, value) VALUES (?, ?)",
+                    (key, _encode(result))
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, result: Dict) -> None:
+        self._forget(key)
+        size = _text_size(result)
+        if size > self.max_text_bytes:
+            return
+        self._entries[key] = result
+        self._sizes[key] = size
+        self.text_bytes += size
+        while len(self._entries) > self.max_entries or self.text_bytes > self.max_text_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self.text_bytes -= self._sizes.pop(evicted)
+            self.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.text_bytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        """Drop every in-memory and on-disk entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.text_bytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM parse_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache effectiveness counters
+
+        Returns:
+            Dictionary with hits, misses, disk_hits, evictions, size and
+            text_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'text_bytes': self.text_bytes
+            }
+
+
+_parse_cache = ParseCache(disk_dir=os.environ.get(CACHE_DIR_ENV) or None)
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the process-wide parse cache"""
+    return _parse_cache
+
+
+def configure_parse_cache(max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Optional[str] = None,
+                          max_text_bytes: Optional[int] = None) -> ParseCache:
+    """
+    Replace the process-wide parse cache
+
+    Args:
+        max_entries: Maximum number of results kept in memory
+        disk_dir: Directory for the persistent SQLite tier, or None to disable it
+        max_text_bytes: Maximum size of the resume text kept in memory
+            (defaults to CAREER_COMPASS_MAX_RESUME_TEXT_BYTES)
+
+    Returns:
+        The new cache instance
+    """
+    global _parse_cache
+    _parse_cache = ParseCache(max_entries=max_entries, disk_dir=disk_dir, max_text_bytes=max_text_bytes)
+    return _parse_cache
@@ -0,0 +1,145 @@
+"""
+Process pool for extracting large PDFs in parallel page ranges
+
+Text extraction is pure Python and holds the GIL, so threads do not help
+with a 300-page portfolio. Documents with at least
+CAREER_COMPASS_PARALLEL_PDF_PAGES pages (0 disables parallel extraction)
+are split into page ranges that are extracted in worker processes and
+reassembled in page order. Smaller resumes are extracted inline and never
+start the pool.
+
+CAREER_COMPASS_PDF_WORKERS sets the number of worker processes; with a
+single worker extraction always stays inline.
+"""
+
+import math
+import os
+import threading
+from typing import List, Optional, Tuple
+
+# Environment variables configuring parallel extraction
+PARALLEL_PAGES_ENV = "CAREER_COMPASS_PARALLEL_PDF_PAGES"
+PDF_WORKERS_ENV = "CAREER_COMPASS_PDF_WORKERS"
+
+DEFAULT_PARALLEL_PAGES = 64
+DEFAULT_PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+# Smallest page range sent to a worker; each task re-reads the document
+# structure, so tiny ranges cost more than they save
+MIN_PAGES_PER_RANGE = 8
+
+
+class PdfPool:
+    """
+    Lazily started process pool used for parallel page-range extraction
+
+    Workers are spawned rather than forked so the pool can be started
+    safely from a multi-threaded server process.
+
+    Args:
+        threshold: Minimum page count extracted in parallel (0 disables)
+        workers: Number of worker processes
+    """
+
+    def __init__(self, threshold: int = DEFAULT_PARALLEL_PAGES, workers: int = DEFAULT_PDF_WORKERS):
+        self.threshold = threshold
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any document can be extracted in parallel"""
+        return self.threshold > 0 and self.workers > 1
+
+    def should_split(self, page_count: int) -> bool:
+        """
+        Decide whether a document is large enough to extract in parallel
+
+        Args:
+            page_count: Number of pages that will be extracted
+
+        Returns:
+            True if the page count reaches the threshold
+        """
+        return self.enabled and page_count >= self.threshold
+
+    def page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """
+        Split pages into contiguous (start, stop) ranges for the workers
+
+        Two ranges per worker keep the workers busy when some pages are
+        much slower to extract than others.
+
+        Args:
+            page_count: Number of pages to extract
+
+        Returns:
+            Ranges in page order covering every page once
+        """
+        size = max(math.ceil(page_count / (self.workers * 2)), MIN_PAGES_PER_RANGE)
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    def executor(self):
+        """Return the worker pool (a ProcessPoolExecutor), starting it on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Imported here so processes that never split a PDF skip them
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def reset(self) -> None:
+        """Discard the worker pool (for example after a worker crashed)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _pool_from_env() -> PdfPool:
+    threshold = os.environ.get(PARALLEL_PAGES_ENV)
+    workers = os.environ.get(PDF_WORKERS_ENV)
+    return PdfPool(
+        threshold=int(threshold) if threshold else DEFAULT_PARALLEL_PAGES,
+        workers=int(workers) if workers else DEFAULT_PDF_WORKERS
+    )
+
+
+_pdf_pool: Optional[PdfPool] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> PdfPool:
+    """Return the process-wide PDF extraction pool settings, creating them on first use"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                _pdf_pool = _pool_from_env()
+    return _pdf_pool
+
+
+def configure_pdf_pool(threshold: int = DEFAULT_PARALLEL_PAGES,
+                       workers: int = DEFAULT_PDF_WORKERS) -> PdfPool:
+    """
+    Replace the process-wide PDF extraction pool
+
+    Args:
+        threshold: Minimum page count extracted in parallel (0 disables)
+        workers: Number of worker processes
+
+    Returns:
+        The new pool
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        previous, _pdf_pool = _pdf_pool, PdfPool(threshold, workers)
+    if previous is not None:
+        previous.reset()
+    return _pdf_pool
@@ -0,0 +1,288 @@
+"""
+Downloadable career reports in text, Markdown, CSV and JSON
+
+Every format is rendered from one shared AnalysisReport by a writer that
+streams into a text stream, so exporting many roles never builds the
+document by repeated string concatenation. Nothing is rendered until a
+format is actually requested.
+"""
+
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, TextIO
+
+from backend.career_analyzer import get_learning_plan, generate_career_roadmap
+
+
+class AnalysisReport:
+    """
+    One resume analysis shared by every report format
+
+    Learning plans and roadmaps are derived lazily per role and reused
+    across formats.
+
+    Args:
+        resume_data: Result of ``parse_resume``
+        career_matches: Ranked role matches from ``analyze_career_fit``
+        catalog_version: Version of the catalog the matches came from
+    """
+
+    def __init__(self, resume_data: Dict, career_matches: List[Dict], catalog_version: str = ""):
+        self.fingerprint = resume_data.get('fingerprint', "")
+        self.skills = sorted(resume_data['skills'])
+        self.career_matches = career_matches
+        self.catalog_version = catalog_version
+        self._plans: Dict[str, List[Dict]] = {}
+        self._roadmaps: Dict[str, str] = {}
+
+    def roles(self, role_names: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Select role matches in ranking order
+
+        Args:
+            role_names: Names of the roles to include (None for all)
+
+        Returns:
+            List of role match dictionaries
+        """
+        if role_names is None:
+            return list(self.career_matches)
+        wanted = set(role_names)
+        return [match for match in self.career_matches if match['role_name'] in wanted]
+
+    def learning_plan(self, role: Dict) -> List[Dict]:
+        """Learning plan of a role, computed once"""
+        plan = self._plans.get(role['role_name'])
+        if plan is None:
+            plan = self._plans[role['role_name']] = get_learning_plan(role)
+        return plan
+
+    def roadmap(self, role: Dict) -> str:
+        """Career roadmap of a role, computed once"""
+        roadmap = self._roadmaps.get(role['role_name'])
+        if roadmap is None:
+            roadmap = self._roadmaps[role['role_name']] = generate_career_roadmap(role)
+        return roadmap
+
+
+def write_text_report(role: Dict, stream: TextIO, learning_plan: Optional[List[Dict]] = None,
+                      roadmap: Optional[str] = None) -> None:
+    """
+    Write the plain-text report of one role
+
+    Args:
+        role: Dictionary containing role match information
+        stream: Destination text stream
+        learning_plan: Precomputed learning plan (computed if omitted)
+        roadmap: Precomputed roadmap (computed if omitted)
+    """
+    write = stream.write
+    write(f"""
+CAREER COMPASS AI - CAREER ANALYSIS REPORT
+==========================================
+
+Career Role: {role['role_name']}
+Description: {role['description']}
+
+SCORES
+------
+Skills Match: {role['match_score']}%
+Industry Demand: {role['demand_score']}/100
+Overall Score: {role['combined_score']}/100
+
+SKILLS YOU HAVE ({len(role['known_skills'])})
+-----------------
+{chr(10).join('✓ ' + skill for skill in role['known_skills']) if role['known_skills'] else 'None'}
+
+SKILLS TO LEARN ({len(role['missing_skills'])})
+---------------
+{chr(10).join('○ ' + skill for skill in role['missing_skills']) if role['missing_skills'] else 'None'}
+
+LEARNING PLAN
+-------------
+""")
+
+    if role['missing_skills']:
+        if learning_plan is None:
+            learning_plan = get_learning_plan(role)
+        total_hours = 0
+        for item in learning_plan:
+            write(f"\nSkill: {item['skill']}\n")
+            write(f"Resource: {item['youtube_link']}\n")
+            write(f"Estimated Time: {item['estimated_hours']} hours\n")
+            total_hours += item['estimated_hours']
+
+        write(f"\nTotal Learning Time: {total_hours} hours ({total_hours//40} weeks)\n")
+
+    if roadmap is None:
+        roadmap = generate_career_roadmap(role)
+
+    write(f"""
+CAREER PROGRESSION ROADMAP
+--------------------------
+{roadmap}
+
+---
+Generated by Career Compass AI
+""")
+
+
+def generate_report(role: dict, learning_plan: Optional[List[Dict]] = None,
+                    roadmap: Optional[str] = None) -> str:
+    """Generate a text report for download, reusing a precomputed plan and roadmap if given"""
+    stream = io.StringIO()
+    write_text_report(role, stream, learning_plan, roadmap)
+    return stream.getvalue()
+
+
+def write_text(analysis: AnalysisReport, stream: TextIO, role_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Write the plain-text reports of the selected roles one after another
+
+    Args:
+        analysis: Shared analysis
+        stream: Destination text stream
+        role_names: Names of the roles to include (None for all)
+    """
+    for role in analysis.roles(role_names):
+        write_text_report(role, stream, analysis.learning_plan(role), analysis.roadmap(role))
+
+
+def write_markdown(analysis: AnalysisReport, stream: TextIO, role_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Write a Markdown report covering the selected roles
+
+    Args:
+        analysis: Shared analysis
+        stream: Destination text stream
+        role_names: Names of the roles to include (None for all)
+    """
+    write = stream.write
+    write("# Career Compass AI - Career Analysis Report\n\n")
+    write(f"**Skills identified ({len(analysis.skills)}):** {', '.join(analysis.skills) or 'None'}\n")
+
+    for role in analysis.roles(role_names):
+        write(f"\n## {role['role_name']}\n\n")
+        write(f"{role['description']}\n\n")
+        write("| Skills Match | Industry Demand | Overall Score |\n|---|---|---|\n")
+        write(f"| {role['match_score']}% | {role['demand_score']}/100 | {role['combined_score']}/100 |\n\n")
+        write(f"**Skills you have ({len(role['known_skills'])}):** {', '.join(role['known_skills']) or 'None'}\n\n")
+        write(f"**Skills to learn ({len(role['missing_skills'])}):** {', '.join(role['missing_skills']) or 'None'}\n")
+
+        learning_plan = analysis.learning_plan(role)
+        if learning_plan:
+            write("\n### Learning Plan\n\n| Skill | Resource | Estimated Time |\n|---|---|---|\n")
+            total_hours = 0
+            for item in learning_plan:
+                write(f"| {item['skill']} | [YouTube Tutorial]({item['youtube_link']}) | {item['estimated_hours']} hours |\n")
+                total_hours += item['estimated_hours']
+            write(f"\n**Total learning time:** {total_hours} hours ({total_hours//40} weeks)\n")
+
+        write(f"\n### Career Progression Roadmap\n\n{analysis.roadmap(role)}\n")
+
+    write("\n---\nGenerated by Career Compass AI\n")
+
+
+CSV_COLUMNS = ['role_name', 'combined_score', 'skill', 'youtube_link', 'estimated_hours']
+
+
+def write_csv(analysis: AnalysisReport, stream: TextIO, role_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Write the learning plan rows of the selected roles as CSV
+
+    Args:
+        analysis: Shared analysis
+        stream: Destination text stream
+        role_names: Names of the roles to include (None for all)
+    """
+    writer = csv.writer(stream)
+    writer.writerow(CSV_COLUMNS)
+    for role in analysis.roles(role_names):
+        for item in analysis.learning_plan(role):
+            writer.writerow([
+                role['role_name'], role['combined_score'],
+                item['skill'], item['youtube_link'], item['estimated_hours']
+            ])
+
+
+def write_json(analysis: AnalysisReport, stream: TextIO, role_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Write the full machine-readable analysis as JSON, one role at a time
+
+    Args:
+        analysis: Shared analysis
+        stream: Destination text stream
+        role_names: Names of the roles to include (None for all)
+    """
+    write = stream.write
+    write('{"fingerprint": ' + json.dumps(analysis.fingerprint))
+    write(', "catalog_version": ' + json.dumps(analysis.catalog_version))
+    write(', "skills": ' + json.dumps(analysis.skills))
+    write(', "roles": [')
+    for position, role in enumerate(analysis.roles(role_names)):
+        if position:
+            write(', ')
+        learning_plan = analysis.learning_plan(role)
+        json.dump({
+            'role_name': role['role_name'],
+            'match_score': role['match_score'],
+            'demand_score': role['demand_score'],
+            'combined_score': role['combined_score'],
+            'description': role['description'],
+            'known_skills': role['known_skills'],
+            'missing_skills': role['missing_skills'],
+            'learning_plan': learning_plan,
+            'total_hours': sum(item['estimated_hours'] for item in learning_plan),
+            'career_path': role['career_path']
+        }, stream)
+    write(']}\n')
+
+
+class ReportFormat(NamedTuple):
+    """Registered export format"""
+    label: str
+    extension: str
+    mime: str
+    writer: Callable[[AnalysisReport, TextIO, Optional[Iterable[str]]], None]
+
+
+REPORT_FORMATS: Dict[str, ReportFormat] = {
+    'text': ReportFormat("Text", "txt", "text/plain", write_text),
+    'markdown': ReportFormat("Markdown", "md", "text/markdown", write_markdown),
+    'csv': ReportFormat("CSV (learning plan)", "csv", "text/csv", write_csv),
+    'json': ReportFormat("JSON (full analysis)", "json", "application/json", write_json)
+}
+
+
+def export_report(fmt: str, analysis: AnalysisReport, stream: TextIO,
+                  role_names: Optional[Iterable[str]] = None) -> None:
+    """
+    Stream a report in the requested format
+
+    Args:
+        fmt: Key of REPORT_FORMATS
+        analysis: Shared analysis
+        stream: Destination text stream (for example an open file)
+        role_names: Names of the roles to include (None for all)
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt}. Choose one of: {', '.join(REPORT_FORMATS)}")
+    REPORT_FORMATS[fmt].writer(analysis, stream, role_names)
+
+
+def render_report(fmt: str, analysis: AnalysisReport, role_names: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Render a report in the requested format for download
+
+    Args:
+        fmt: Key of REPORT_FORMATS
+        analysis: Shared analysis
+        role_names: Names of the roles to include (None for all)
+
+    Returns:
+        UTF-8 encoded report
+    """
+    stream = io.StringIO()
+    export_report(fmt, analysis, stream, role_names)
+    return stream.getvalue().encode('utf-8')
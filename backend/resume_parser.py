@@ -2,37 +2,189 @@
 Resume parsing utilities to extract text and skills from PDF/text files
 """
 
-import re
-from typing import List, Set
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
+import io
+import time
+from contextlib import closing
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Set
 
-from backend.data.job_roles_data import COMMON_SKILLS
+from backend.catalog import get_catalog
+from backend import metrics
+from backend.parse_cache import content_digest, get_parse_cache, make_cache_key
+from backend.pdf_pool import PdfPool, get_pdf_pool
+from backend.sandbox import INVALID, ExtractionError, get_sandbox
 
+# Default extraction budgets applied by parse_resume so that very long or
+# scanned documents cannot stall a worker
+DEFAULT_MAX_PAGES = 200
+DEFAULT_MAX_CHARS = 1_000_000
 
-def extract_text_from_pdf(pdf_file) -> str:
+# Called as progress(stage, count) while a resume is parsed, for example
+# progress('pages', 3) after the third page has been extracted. Raising
+# from the callback aborts parsing.
+ProgressCallback = Callable[[str, int], None]
+
+# PyPDF2 is imported on the first PDF so TXT-only processes never load it
+_pdf_reader_class = None
+
+
+def _get_pdf_reader_class():
+    global _pdf_reader_class
+    if _pdf_reader_class is None:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
+        _pdf_reader_class = PdfReader
+    return _pdf_reader_class
+
+
+def pdf_support_available() -> bool:
+    """Whether PyPDF2 can be imported (imports it if so)"""
+    try:
+        _get_pdf_reader_class()
+    except ImportError:
+        return False
+    return True
+
+
+def _extract_page_range(content: bytes, start: int, stop: int,
+                        max_chars: Optional[int] = None) -> List[str]:
+    # Runs in a PDF pool worker; each page is cut to the overall budget so
+    # no more text than can be used is sent back
+    pdf_reader = _get_pdf_reader_class()(io.BytesIO(content))
+    texts = []
+    for index in range(start, stop):
+        page_text = pdf_reader.pages[index].extract_text() or ""
+        texts.append(page_text if max_chars is None else page_text[:max_chars])
+    return texts
+
+
+def _iter_pages_parallel(pool: PdfPool, content: bytes, page_count: int,
+                         max_chars: Optional[int]) -> Iterator[str]:
+    # Ranges are submitted up front and consumed in page order; closing the
+    # iterator early cancels the ranges no worker has started yet
+    from concurrent.futures.process import BrokenProcessPool
+
+    futures = [
+        pool.executor().submit(_extract_page_range, content, start, stop, max_chars)
+        for start, stop in pool.page_ranges(page_count)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        pool.reset()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _iter_pages_in_process(pdf_reader, pdf_file, max_pages: Optional[int],
+                           max_chars: Optional[int]) -> Iterator[str]:
+    page_count = len(pdf_reader.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    if max_chars is not None and max_chars <= 0:
+        page_count = 0
+
+    pool = get_pdf_pool()
+    if pool.should_split(page_count):
+        yield from _iter_pages_parallel(pool, read_uploaded_bytes(pdf_file), page_count, max_chars)
+    else:
+        for page in islice(pdf_reader.pages, page_count):
+            yield page.extract_text() or ""
+
+
+def iter_pdf_pages(pdf_file, max_pages: Optional[int] = None,
+                   max_chars: Optional[int] = None) -> Iterator[str]:
+    """
+    Lazily extract text from a PDF file one page at a time
+
+    Extraction stops as soon as either budget is exhausted, so only the
+    pages that are actually consumed are ever decoded. Extraction runs in
+    the sandbox workers when the sandbox is enabled; otherwise documents at
+    or above the PDF pool threshold are extracted in parallel page ranges.
+    Pages are always yielded in order.
+    
+    Args:
+        pdf_file: Uploaded PDF file object from Streamlit
+        max_pages: Maximum number of pages to extract (None for no limit)
+        max_chars: Maximum number of characters to yield (None for no limit)
+        
+    Yields:
+        Text of each page, truncated to the remaining character budget
+
+    Raises:
+        ExtractionError: If the PDF cannot be read or breaks a sandbox limit
+    """
+    PdfReader = _get_pdf_reader_class()
+    
+    try:
+        sandbox = get_sandbox()
+        if sandbox is not None:
+            pages = sandbox.iter_pages(read_uploaded_bytes(pdf_file), max_pages, max_chars)
+        else:
+            pages = _iter_pages_in_process(PdfReader(pdf_file), pdf_file, max_pages, max_chars)
+
+        with closing(pages):
+            remaining = max_chars
+            for page_text in pages:
+                if remaining is not None:
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
+                yield page_text
+                if remaining is not None and remaining <= 0:
+                    break
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(INVALID, f"Error reading PDF: {str(e)}")
+
+
+@metrics.timed('extract_text_from_pdf')
+def extract_text_from_pdf(pdf_file, max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None) -> str:
     """
     Extract text content from a PDF file
     
     Args:
         pdf_file: Uploaded PDF file object from Streamlit
+        max_pages: Maximum number of pages to extract (None for no limit)
+        max_chars: Maximum number of characters to extract (None for no limit)
         
     Returns:
         Extracted text as string
     """
-    if PdfReader is None:
-        raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
+    return "".join(
+        page_text + "\n"
+        for page_text in iter_pdf_pages(pdf_file, max_pages, max_chars)
+    )
+
+
+def extract_skills_from_pdf(pdf_file, max_pages: Optional[int] = None,
+                            max_chars: Optional[int] = None) -> Set[str]:
+    """
+    Extract skills from a PDF file without keeping its text in memory
+
+    Pages are fed to the skill matcher as they are extracted, and
+    extraction stops early once every known skill has been found.
     
-    try:
-        pdf_reader = PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        raise Exception(f"Error reading PDF: {str(e)}")
+    Args:
+        pdf_file: Uploaded PDF file object from Streamlit
+        max_pages: Maximum number of pages to scan (None for no limit)
+        max_chars: Maximum number of characters to scan (None for no limit)
+        
+    Returns:
+        Set of identified skills
+    """
+    scanner = get_catalog().matcher.scanner()
+    for page_text in iter_pdf_pages(pdf_file, max_pages, max_chars):
+        scanner.feed(page_text)
+        if scanner.complete:
+            break
+    return scanner.found
 
 
 def extract_text_from_txt(txt_file) -> str:
@@ -52,6 +204,7 @@ def extract_text_from_txt(txt_file) -> str:
         raise Exception(f"Error reading text file: {str(e)}")
 
 
+@metrics.timed('extract_skills_from_text')
 def extract_skills_from_text(text: str) -> Set[str]:
     """
     Extract skills from resume text using keyword matching
@@ -62,46 +215,151 @@ def extract_skills_from_text(text: str) -> Set[str]:
     Returns:
         Set of identified skills
     """
-    text_lower = text.lower()
-    found_skills = set()
-    
-    for skill in COMMON_SKILLS:
-        # Create pattern to match skill as whole word (case-insensitive)
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.add(skill)
-    
-    return found_skills
+    return get_catalog().matcher.find(text)
+
+
+def read_uploaded_bytes(uploaded_file) -> bytes:
+    """
+    Read the full content of an uploaded file without consuming it
+
+    Args:
+        uploaded_file: Streamlit uploaded file object or binary file handle
+
+    Returns:
+        Raw file content
+    """
+    if hasattr(uploaded_file, 'getvalue'):
+        return uploaded_file.getvalue()
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    return uploaded_file.read()
 
 
-def parse_resume(uploaded_file) -> dict:
+@metrics.timed('parse_resume')
+def parse_resume(uploaded_file, use_cache: bool = True,
+                 max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+                 max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+                 skills_only: bool = False,
+                 progress: Optional[ProgressCallback] = None) -> dict:
     """
     Main function to parse resume and extract information
+
+    Results are cached on the digest of the uploaded bytes, so analysing
+    the same file again skips text extraction entirely. PDF pages are
+    streamed into the skill matcher as they are extracted. Only the first
+    max_pages pages and max_chars characters are read; the ``truncated``
+    flag of the result tells whether the resume was longer than that.
     
     Args:
         uploaded_file: Streamlit uploaded file object
+        use_cache: Whether to consult and fill the parse cache
+        max_pages: Maximum number of PDF pages to extract (None for no limit)
+        max_chars: Maximum number of characters to extract (None for no limit)
+        skills_only: Skip building the resume text when only skills are needed
+            (every page within the budgets is still scanned)
+        progress: Optional callback receiving ('pages', n) and ('skills', n) updates
         
     Returns:
         Dictionary containing:
-            - text: Full resume text
+            - text: Full resume text (empty when skills_only is set)
             - skills: Set of identified skills
             - skill_count: Number of skills found
+            - fingerprint: Digest of the uploaded file content
+            - truncated: Whether max_pages or max_chars cut the resume short
     """
     file_type = uploaded_file.name.split('.')[-1].lower()
+    if file_type not in ['pdf', 'txt', 'text']:
+        raise ValueError(f"Unsupported file type: {file_type}. Please upload PDF or TXT file.")
+
+    content = read_uploaded_bytes(uploaded_file)
+    fingerprint = content_digest(content)
+    matcher = get_catalog().matcher
+    cache = get_parse_cache()
+    cache_key = make_cache_key(
+        fingerprint, file_type, matcher.fingerprint,
+        options=f"{max_pages}:{max_chars}:{'skills' if skills_only else 'full'}:truncation"
+    )
+
+    metrics.inc(metrics.BYTES_PROCESSED, len(content), file_type)
+
+    if use_cache:
+        cached = cache.get(cache_key)
+        metrics.inc(metrics.PARSE_CACHE_LOOKUPS, 1, 'miss' if cached is None else 'hit')
+        if cached is not None:
+            if progress is not None:
+                progress('skills', cached['skill_count'])
+            return cached
     
-    # Extract text based on file type
+    # Extract text and skills based on file type. PDF pages are extracted
+    # and matched in turn, so each stage's time is summed over the pages.
+    # One page and one character beyond the budgets are requested so that a
+    # document the budgets cut short can be reported as truncated.
+    truncated = False
     if file_type == 'pdf':
-        text = extract_text_from_pdf(uploaded_file)
-    elif file_type in ['txt', 'text']:
-        text = extract_text_from_txt(uploaded_file)
+        scanner = matcher.scanner()
+        pages = []
+        page_count = 0
+        remaining = max_chars
+        extract_seconds = match_seconds = 0.0
+        page_iterator = iter_pdf_pages(
+            io.BytesIO(content),
+            None if max_pages is None else max_pages + 1,
+            None if max_chars is None else max_chars + 1
+        )
+        while True:
+            started = time.perf_counter()
+            page_text = next(page_iterator, None)
+            extracted = time.perf_counter()
+            extract_seconds += extracted - started
+            if page_text is None:
+                break
+            if remaining is not None and len(page_text) > remaining:
+                page_text = page_text[:remaining]
+                truncated = True
+            if page_count == max_pages or (truncated and not page_text):
+                truncated = True
+                break
+            page_count += 1
+            scanner.feed(page_text)
+            match_seconds += time.perf_counter() - extracted
+            if remaining is not None:
+                remaining -= len(page_text)
+            if not skills_only:
+                pages.append(page_text + "\n")
+            if progress is not None:
+                progress('pages', page_count)
+            if truncated:
+                break
+        page_iterator.close()
+        text = "".join(pages)
+        skills = scanner.found
+        metrics.observe(metrics.PDF_PAGES, page_count)
+        metrics.observe_stage('extract_text_from_pdf', extract_seconds)
+        metrics.observe_stage('extract_skills_from_text', match_seconds)
     else:
-        raise ValueError(f"Unsupported file type: {file_type}. Please upload PDF or TXT file.")
-    
-    # Extract skills
-    skills = extract_skills_from_text(text)
+        text = extract_text_from_txt(io.BytesIO(content))
+        if max_chars is not None and len(text) > max_chars:
+            text = text[:max_chars]
+            truncated = True
+        started = time.perf_counter()
+        skills = matcher.find(text)
+        metrics.observe_stage('extract_skills_from_text', time.perf_counter() - started)
+        if skills_only:
+            text = ""
+
+    metrics.observe(metrics.SKILLS_FOUND, len(skills))
+    if progress is not None:
+        progress('skills', len(skills))
     
-    return {
+    result = {
         'text': text,
         'skills': skills,
-        'skill_count': len(skills)
-    }
\ No newline at end of file
+        'skill_count': len(skills),
+        'fingerprint': fingerprint,
+        'truncated': truncated
+    }
+
+    if use_cache:
+        cache.put(cache_key, result)
+
+    return result
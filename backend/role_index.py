@@ -0,0 +1,144 @@
+"""
+Precompiled role index with interned skill IDs and inverted postings
+"""
+
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class RoleIndex:
+    """
+    Normalized, read-only view of a role catalog built once per catalog
+
+    Skills are lowercased and interned to dense integer IDs. For every role
+    the index keeps its required skill IDs (in catalog order), and for every
+    skill the sorted list of roles that require it. Queries walk only the
+    postings of the user's skills, so their cost depends on the resume
+    rather than the catalog size. Aliases resolve to the ID of their
+    canonical skill.
+
+    A skill listed twice by a role (in any case) counts twice, as in
+    ``calculate_match_score``: it appears twice in the role's skill IDs and
+    the role appears twice in the skill's postings.
+
+    Args:
+        roles: Mapping of role name to role data with at least
+            ``required_skills`` and ``demand_score`` (the JOB_ROLES_DB shape)
+        aliases: Optional mapping of alias to canonical skill name
+    """
+
+    def __init__(self, roles: Dict[str, Dict], aliases: Optional[Dict[str, str]] = None):
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.role_names: List[str] = []
+        self.role_ids: Dict[str, int] = {}
+        self.demand_scores: List[int] = []
+        self.role_skill_ids: List[Tuple[int, ...]] = []
+        self.postings: List[Tuple[int, ...]] = []
+
+        postings: List[List[int]] = []
+        for role_name, role_data in roles.items():
+            role_index = len(self.role_names)
+            skill_ids = tuple(self._intern(skill, postings) for skill in role_data['required_skills'])
+            for skill_id in skill_ids:
+                postings[skill_id].append(role_index)
+
+            role_name = sys.intern(role_name)
+            self.role_names.append(role_name)
+            self.role_ids[role_name] = role_index
+            self.demand_scores.append(role_data['demand_score'])
+            self.role_skill_ids.append(skill_ids)
+
+        self.postings = [tuple(role_list) for role_list in postings]
+
+        # Aliases share the lookup table so encoding costs the same with or
+        # without them; a skill required by some role always wins over an alias
+        for alias, skill in (aliases or {}).items():
+            skill_id = self.skill_ids.get(skill.lower())
+            if skill_id is not None:
+                self.skill_ids.setdefault(sys.intern(alias.lower()), skill_id)
+
+    def _intern(self, skill: str, postings: List[List[int]]) -> int:
+        key = skill.lower()
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_ids[sys.intern(key)] = skill_id
+            self.skill_names.append(sys.intern(skill))
+            postings.append([])
+        return skill_id
+
+    def __len__(self) -> int:
+        return len(self.role_names)
+
+    def encode(self, skills: Iterable[str]) -> Set[int]:
+        """
+        Map skill names to skill IDs
+
+        Aliases map to their canonical skill; skills that no role requires
+        are ignored.
+
+        Args:
+            skills: Skill names or aliases (case-insensitive)
+
+        Returns:
+            Set of skill IDs
+        """
+        skill_ids = self.skill_ids
+        encoded = set()
+        for skill in skills:
+            skill_id = skill_ids.get(skill.lower())
+            if skill_id is not None:
+                encoded.add(skill_id)
+        return encoded
+
+    def overlap_counts(self, skill_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Count known skills per role by walking the postings of the user's skills
+
+        Args:
+            skill_ids: Skill IDs from ``encode``
+
+        Returns:
+            Mapping of role index to number of required skills the user has,
+            containing only roles that share at least one skill
+        """
+        counts: Dict[int, int] = {}
+        postings = self.postings
+        for skill_id in skill_ids:
+            for role_index in postings[skill_id]:
+                counts[role_index] = counts.get(role_index, 0) + 1
+        return counts
+
+    def required_skills(self, role_index: int) -> List[str]:
+        """Required skill names of a role, in catalog order"""
+        names = self.skill_names
+        return [names[skill_id] for skill_id in self.role_skill_ids[role_index]]
+
+    def known_skills(self, role_index: int, skill_ids: Set[int]) -> List[str]:
+        """
+        Required skills of a role that the user has, in catalog order
+
+        Args:
+            role_index: Index of the role
+            skill_ids: User skill IDs from ``encode``
+
+        Returns:
+            List of skill names
+        """
+        names = self.skill_names
+        return [names[skill_id] for skill_id in self.role_skill_ids[role_index] if skill_id in skill_ids]
+
+    def missing_skills(self, role_index: int, skill_ids: Set[int]) -> List[str]:
+        """
+        Required skills of a role that the user lacks, in catalog order
+
+        Args:
+            role_index: Index of the role
+            skill_ids: User skill IDs from ``encode``
+
+        Returns:
+            List of skill names
+        """
+        names = self.skill_names
+        return [names[skill_id] for skill_id in self.role_skill_ids[role_index] if skill_id not in skill_ids]
@@ -0,0 +1,423 @@
+"""
+Sandboxed PDF text extraction in recycled worker processes
+
+A malformed or adversarial PDF can keep PyPDF2 busy for minutes or make
+it allocate without bound. Extraction therefore runs in separate worker
+processes with enforced limits:
+
+- input size, checked before the document leaves the app process
+- page count, checked as soon as the worker has opened the document
+- address space, set with RLIMIT_AS inside the worker (where supported)
+- wall-clock time per document, after which the worker is killed
+
+A violation raises ExtractionError, which carries a machine-readable
+reason, instead of hanging or crashing the app process. Workers are
+retired after a fixed number of documents and after any failure, so a
+leak or a corrupted state never outlives one document.
+
+Large documents are split into page ranges across idle workers, using
+the threshold of the PDF pool (see backend.pdf_pool).
+
+Configure with CAREER_COMPASS_SANDBOX (0 extracts in-process), and
+CAREER_COMPASS_SANDBOX_WORKERS, _MAX_BYTES, _MAX_PAGES, _MEMORY_BYTES,
+_TIMEOUT (seconds) and _JOBS_PER_WORKER.
+"""
+
+import io
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from backend import metrics
+from backend.pdf_pool import DEFAULT_PDF_WORKERS, MIN_PAGES_PER_RANGE, get_pdf_pool
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+SANDBOX_ENV = "CAREER_COMPASS_SANDBOX"
+SANDBOX_WORKERS_ENV = "CAREER_COMPASS_SANDBOX_WORKERS"
+SANDBOX_MAX_BYTES_ENV = "CAREER_COMPASS_SANDBOX_MAX_BYTES"
+SANDBOX_MAX_PAGES_ENV = "CAREER_COMPASS_SANDBOX_MAX_PAGES"
+SANDBOX_MEMORY_ENV = "CAREER_COMPASS_SANDBOX_MEMORY_BYTES"
+SANDBOX_TIMEOUT_ENV = "CAREER_COMPASS_SANDBOX_TIMEOUT"
+SANDBOX_JOBS_ENV = "CAREER_COMPASS_SANDBOX_JOBS_PER_WORKER"
+
+DEFAULT_SANDBOX_WORKERS = max(DEFAULT_PDF_WORKERS, 2)
+
+# Seconds a worker gets to acknowledge a stop request before it is killed
+STOP_GRACE_SECONDS = 2.0
+
+# ExtractionError reasons
+TOO_LARGE = 'too_large'
+TOO_MANY_PAGES = 'too_many_pages'
+MEMORY = 'memory'
+TIMEOUT = 'timeout'
+CRASHED = 'crashed'
+INVALID = 'invalid'
+
+
+class ExtractionError(Exception):
+    """
+    Raised when a PDF is rejected or its extraction is aborted
+
+    Args:
+        reason: One of the module's reason constants (for example 'timeout')
+        message: Human-readable description
+        limit: The limit that was exceeded, if any
+    """
+
+    def __init__(self, reason: str, message: str, limit: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.limit = limit
+
+    def to_dict(self) -> Dict:
+        """Structured form of the error for job results and API responses"""
+        return {'reason': self.reason, 'message': str(self), 'limit': self.limit}
+
+
+class ExtractionLimits(NamedTuple):
+    """Limits enforced on every sandboxed extraction (0 disables a limit)"""
+    max_bytes: int = 20 * 1024 * 1024
+    max_pages: int = 2000
+    max_memory_bytes: int = 1024 * 1024 * 1024
+    timeout_seconds: float = 60.0
+    max_jobs_per_worker: int = 50
+
+
+def _worker_main(conn, max_memory_bytes: int, max_pages: int) -> None:
+    # Entry point of a sandbox worker process. Requests are ('open', content),
+    # ('range', start, stop, max_chars, stream) and ('stop',); a stop
+    # request is only acted on while a range is being extracted.
+    if max_memory_bytes and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+    from PyPDF2 import PdfReader
+
+    reader = None
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+
+        try:
+            if request[0] == 'open':
+                reader = PdfReader(io.BytesIO(request[1]))
+                page_count = len(reader.pages)
+                if max_pages and page_count > max_pages:
+                    reader = None
+                    conn.send(('error', TOO_MANY_PAGES,
+                               f"PDF has {page_count} pages; the limit is {max_pages}", max_pages))
+                else:
+                    conn.send(('count', page_count))
+            elif request[0] == 'range':
+                _, start, stop, max_chars, stream = request
+                pages = []
+                for index in range(start, stop):
+                    if conn.poll() and conn.recv()[0] == 'stop':
+                        break
+                    page_text = reader.pages[index].extract_text() or ""
+                    if max_chars is not None:
+                        page_text = page_text[:max_chars]
+                    if stream:
+                        conn.send(('page', page_text))
+                    else:
+                        pages.append(page_text)
+                reader = None
+                conn.send(('pages', pages))
+        except MemoryError:
+            reader = None
+            conn.send(('error', MEMORY, "PDF extraction exceeded the worker memory limit", max_memory_bytes))
+            return
+        except Exception as e:
+            reader = None
+            conn.send(('error', INVALID, f"Error reading PDF: {str(e)}", None))
+
+
+class _Worker:
+    """One sandbox process and the parent end of its pipe"""
+
+    def __init__(self, context, limits: ExtractionLimits):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, limits.max_memory_bytes, limits.max_pages),
+            name="pdf-sandbox", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def send(self, request: Tuple) -> None:
+        try:
+            self.conn.send(request)
+        except OSError:
+            raise ExtractionError(CRASHED, "The PDF extraction worker stopped unexpectedly")
+
+    def receive(self, deadline: Optional[float], timeout_seconds: float) -> Tuple:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        try:
+            ready = self.conn.poll(remaining if remaining is None else max(remaining, 0))
+            if not ready:
+                raise ExtractionError(
+                    TIMEOUT, f"PDF extraction took longer than {timeout_seconds:g} seconds", timeout_seconds
+                )
+            response = self.conn.recv()
+        except (EOFError, OSError):
+            raise ExtractionError(CRASHED, "The PDF extraction worker stopped unexpectedly")
+        if response[0] == 'error':
+            raise ExtractionError(*response[1:])
+        return response
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """
+    Bounded set of extraction worker processes, started on demand
+
+    Args:
+        limits: Limits enforced on every extraction
+        workers: Maximum number of worker processes
+    """
+
+    def __init__(self, limits: ExtractionLimits = ExtractionLimits(),
+                 workers: int = DEFAULT_SANDBOX_WORKERS):
+        self.limits = limits
+        self.workers = max(workers, 1)
+        self.recycled = 0
+        self._context = None
+        self._idle: List[_Worker] = []
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+
+    def _acquire(self, blocking: bool = True) -> Optional[_Worker]:
+        if not self._slots.acquire(blocking):
+            return None
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is not None and worker.process.is_alive():
+            return worker
+        try:
+            if worker is not None:
+                worker.kill()
+            if self._context is None:
+                # Imported on the first PDF so TXT-only processes never load it
+                import multiprocessing
+                self._context = multiprocessing.get_context('spawn')
+            return _Worker(self._context, self.limits)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def warm(self, count: int = 1) -> int:
+        """
+        Start idle workers ahead of the first document
+
+        Args:
+            count: Number of workers to have ready
+
+        Returns:
+            Number of workers that are now idle
+        """
+        started = []
+        while len(started) < count:
+            worker = self._acquire(blocking=False)
+            if worker is None:
+                break
+            started.append(worker)
+        with self._lock:
+            self._idle.extend(started)
+            idle = len(self._idle)
+        for _ in started:
+            self._slots.release()
+        return idle
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        worker.jobs += 1
+        limit = self.limits.max_jobs_per_worker
+        if healthy and not (limit and worker.jobs >= limit):
+            with self._lock:
+                self._idle.append(worker)
+        else:
+            worker.kill()
+            self.recycled += 1
+            metrics.inc(metrics.SANDBOX_RECYCLES, 1, 'jobs' if healthy else 'failure')
+        self._slots.release()
+
+    def _stop(self, worker: _Worker) -> bool:
+        # Interrupt a range in progress and discard its remaining output
+        try:
+            worker.send(('stop',))
+            grace = time.monotonic() + STOP_GRACE_SECONDS
+            while worker.receive(grace, STOP_GRACE_SECONDS)[0] == 'page':
+                pass
+        except ExtractionError:
+            return False
+        return True
+
+    def iter_pages(self, content: bytes, max_pages: Optional[int] = None,
+                   max_chars: Optional[int] = None) -> Iterator[str]:
+        """
+        Extract the text of a PDF page by page in sandbox workers
+
+        Pages are yielded in order. Closing the iterator early stops the
+        workers at their next page.
+
+        Args:
+            content: Raw PDF content
+            max_pages: Maximum number of pages to extract (None for no limit)
+            max_chars: Maximum number of characters per page (None for no limit)
+
+        Yields:
+            Text of each page
+
+        Raises:
+            ExtractionError: If the document breaks a limit, cannot be read,
+                or its worker dies
+        """
+        limits = self.limits
+        if limits.max_bytes and len(content) > limits.max_bytes:
+            metrics.inc(metrics.EXTRACTION_FAILURES, 1, TOO_LARGE)
+            raise ExtractionError(
+                TOO_LARGE, f"PDF is {len(content)} bytes; the limit is {limits.max_bytes}", limits.max_bytes
+            )
+
+        deadline = time.monotonic() + limits.timeout_seconds if limits.timeout_seconds else None
+        workers = [self._acquire()]
+        ranging = set()
+        finished = set()
+        healthy = True
+        try:
+            first = workers[0]
+            first.send(('open', content))
+            page_count = first.receive(deadline, limits.timeout_seconds)[1]
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            if max_chars is not None and max_chars <= 0:
+                page_count = 0
+
+            # Spread large documents over whichever workers are idle
+            if get_pdf_pool().should_split(page_count):
+                wanted = min(self.workers, page_count // MIN_PAGES_PER_RANGE)
+                while len(workers) < wanted:
+                    extra = self._acquire(blocking=False)
+                    if extra is None:
+                        break
+                    workers.append(extra)
+                    extra.send(('open', content))
+
+            size = -(-page_count // len(workers)) if page_count else 0
+            ranges = [(start, min(start + size, page_count)) for start in range(0, page_count, size or 1)]
+            first.send(('range', 0, ranges[0][1] if ranges else 0, max_chars, True))
+            ranging.add(first)
+            for worker, (start, stop) in zip(workers[1:], ranges[1:]):
+                worker.receive(deadline, limits.timeout_seconds)
+                worker.send(('range', start, stop, max_chars, False))
+                ranging.add(worker)
+            for worker in workers[len(ranges) or 1:]:
+                # Acquired but not needed after rounding the ranges
+                worker.receive(deadline, limits.timeout_seconds)
+                worker.send(('range', 0, 0, None, False))
+                ranging.add(worker)
+
+            while True:
+                response = first.receive(deadline, limits.timeout_seconds)
+                if response[0] != 'page':
+                    break
+                yield response[1]
+            finished.add(first)
+            for worker in workers[1:]:
+                response = worker.receive(deadline, limits.timeout_seconds)
+                finished.add(worker)
+                yield from response[1]
+        except ExtractionError as e:
+            healthy = False
+            metrics.inc(metrics.EXTRACTION_FAILURES, 1, e.reason)
+            raise
+        finally:
+            for worker in workers:
+                # A worker is reused only if its pipe is known to be drained
+                clean = healthy and (worker in finished or (worker in ranging and self._stop(worker)))
+                self._release(worker, clean)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report worker usage
+
+        Returns:
+            Dictionary with the worker limit, idle workers and workers recycled so far
+        """
+        with self._lock:
+            return {'workers': self.workers, 'idle': len(self._idle), 'recycled': self.recycled}
+
+    def shutdown(self) -> None:
+        """Stop every idle worker"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+def _int_env(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _sandbox_from_env() -> Optional[ExtractionSandbox]:
+    if os.environ.get(SANDBOX_ENV, "1").lower() in ("0", "false", "no", "off"):
+        return None
+    defaults = ExtractionLimits()
+    timeout_seconds = os.environ.get(SANDBOX_TIMEOUT_ENV)
+    limits = ExtractionLimits(
+        max_bytes=_int_env(SANDBOX_MAX_BYTES_ENV, defaults.max_bytes),
+        max_pages=_int_env(SANDBOX_MAX_PAGES_ENV, defaults.max_pages),
+        max_memory_bytes=_int_env(SANDBOX_MEMORY_ENV, defaults.max_memory_bytes),
+        timeout_seconds=float(timeout_seconds) if timeout_seconds else defaults.timeout_seconds,
+        max_jobs_per_worker=_int_env(SANDBOX_JOBS_ENV, defaults.max_jobs_per_worker)
+    )
+    return ExtractionSandbox(limits, _int_env(SANDBOX_WORKERS_ENV, DEFAULT_SANDBOX_WORKERS))
+
+
+_sandbox: Optional[ExtractionSandbox] = None
+_sandbox_configured = False
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox() -> Optional[ExtractionSandbox]:
+    """Return the process-wide extraction sandbox, or None if extraction runs in-process"""
+    global _sandbox, _sandbox_configured
+    if not _sandbox_configured:
+        with _sandbox_lock:
+            if not _sandbox_configured:
+                _sandbox = _sandbox_from_env()
+                _sandbox_configured = True
+    return _sandbox
+
+
+def configure_sandbox(limits: Optional[ExtractionLimits] = ExtractionLimits(),
+                      workers: int = DEFAULT_SANDBOX_WORKERS) -> Optional[ExtractionSandbox]:
+    """
+    Replace the process-wide extraction sandbox
+
+    Args:
+        limits: Limits to enforce, or None to extract in-process
+        workers: Maximum number of worker processes
+
+    Returns:
+        The new sandbox, or None if it was disabled
+    """
+    global _sandbox, _sandbox_configured
+    with _sandbox_lock:
+        previous = _sandbox
+        _sandbox = None if limits is None else ExtractionSandbox(limits, workers)
+        _sandbox_configured = True
+    if previous is not None:
+        previous.shutdown()
+    return _sandbox
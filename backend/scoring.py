@@ -0,0 +1,182 @@
+"""
+Compiled skill-by-role scoring engine
+
+Scoring works on a RoleIndex. A single user is scored by walking the
+inverted postings of their skills, so only roles sharing at least one
+skill are touched; every other role has the same precomputed zero-match
+score. Batches are scored one user at a time through the same postings,
+which keeps the cost per resume proportional to its skills.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from backend import metrics
+from backend.role_index import RoleIndex
+
+# Weights of the combined score
+MATCH_WEIGHT = 0.7
+DEMAND_WEIGHT = 0.3
+
+
+class RoleScore(NamedTuple):
+    """Score of one role for one user"""
+    role_index: int
+    match_score: float
+    combined_score: float
+    known_count: int
+
+
+def _rank_key(role_score: RoleScore) -> Tuple[float, int]:
+    # Highest combined score first, ties keep catalog order
+    return (-role_score.combined_score, role_score.role_index)
+
+
+class ScoringEngine:
+    """
+    Scores users against every role of a RoleIndex
+
+    Args:
+        index: Compiled role index
+    """
+
+    def __init__(self, index: RoleIndex):
+        self.index = index
+        # Per role, (match_score, combined_score) indexed by number of known
+        # skills; roles with the same skill count and demand share a table
+        tables: Dict[Tuple[int, float], List[Tuple[float, float]]] = {}
+        self._score_tables: List[List[Tuple[float, float]]] = []
+        for skill_ids, demand_score in zip(index.role_skill_ids, index.demand_scores):
+            key = (len(skill_ids), demand_score)
+            table = tables.get(key)
+            if table is None:
+                table = tables[key] = self._score_table(*key)
+            self._score_tables.append(table)
+        self._zero_scores = [
+            RoleScore(role_index, table[0][0], table[0][1], 0)
+            for role_index, table in enumerate(self._score_tables)
+        ]
+        # Roles ranked by their score when the user has none of their skills
+        self._zero_ranking = sorted(self._zero_scores, key=_rank_key)
+
+    @staticmethod
+    def _score_table(required_count: int, demand_score: int) -> List[Tuple[float, float]]:
+        table = []
+        for known_count in range(required_count + 1):
+            match_score = round(known_count / required_count * 100, 1) if required_count else 0.0
+            combined_score = round(match_score * MATCH_WEIGHT + demand_score * DEMAND_WEIGHT, 1)
+            table.append((match_score, combined_score))
+        return table
+
+    def role_score(self, role_index: int, known_count: int) -> RoleScore:
+        """
+        Build the score of a role for a given number of known skills
+
+        Args:
+            role_index: Index of the role
+            known_count: Number of the role's required skills the user has
+
+        Returns:
+            RoleScore for the role
+        """
+        match_score, combined_score = self._score_tables[role_index][known_count]
+        return RoleScore(role_index, match_score, combined_score, known_count)
+
+    def score_touched(self, skill_ids: Iterable[int]) -> List[RoleScore]:
+        """
+        Score only the roles that share at least one skill with the user
+
+        Args:
+            skill_ids: User skill IDs from ``RoleIndex.encode``
+
+        Returns:
+            RoleScores of the touched roles, in no particular order
+        """
+        return [
+            self.role_score(role_index, known_count)
+            for role_index, known_count in self.index.overlap_counts(skill_ids).items()
+        ]
+
+    def score_ids(self, skill_ids: Iterable[int]) -> List[RoleScore]:
+        """
+        Score one encoded user against every role
+
+        Args:
+            skill_ids: User skill IDs from ``RoleIndex.encode``
+
+        Returns:
+            One RoleScore per role, in catalog order
+        """
+        scores = list(self._zero_scores)
+        for role_score in self.score_touched(skill_ids):
+            scores[role_score.role_index] = role_score
+        return scores
+
+    def score(self, user_skills: Set[str]) -> List[RoleScore]:
+        """
+        Score one user against every role
+
+        Args:
+            user_skills: Set of skills from the user's resume
+
+        Returns:
+            One RoleScore per role, in catalog order
+        """
+        return self.score_ids(self.index.encode(user_skills))
+
+    @metrics.timed('score_roles')
+    def rank(self, skill_ids: Set[int], k: Optional[int] = None,
+             min_score: Optional[float] = None) -> List[RoleScore]:
+        """
+        Select the k best roles for one encoded user
+
+        Only roles sharing a skill with the user are scored; the best
+        untouched roles are taken from a precomputed ranking, and heap
+        selection avoids sorting the whole catalog.
+
+        Args:
+            skill_ids: User skill IDs from ``RoleIndex.encode``
+            k: Number of roles to return (None for every role)
+            min_score: Drop roles whose combined score is below this value
+
+        Returns:
+            RoleScores sorted by combined score (highest first)
+        """
+        return self.select(self.score_touched(skill_ids), k, min_score)
+
+    def select(self, touched: List[RoleScore], k: Optional[int] = None,
+               min_score: Optional[float] = None) -> List[RoleScore]:
+        """
+        Select the k best roles given the scores of every touched role
+
+        Roles missing from ``touched`` are assumed to have no known skills
+        and are taken from the precomputed zero-match ranking.
+
+        Args:
+            touched: RoleScores of the roles sharing a skill with the user
+            k: Number of roles to return (None for every role)
+            min_score: Drop roles whose combined score is below this value
+
+        Returns:
+            RoleScores sorted by combined score (highest first)
+        """
+        if k is None:
+            k = len(self._zero_scores)
+        if k <= 0:
+            return []
+
+        touched_roles = {role_score.role_index for role_score in touched}
+
+        candidates = list(touched)
+        needed = k
+        for role_score in self._zero_ranking:
+            if needed == 0 or (min_score is not None and role_score.combined_score < min_score):
+                break
+            if role_score.role_index not in touched_roles:
+                candidates.append(role_score)
+                needed -= 1
+
+        if min_score is not None:
+            candidates = [role_score for role_score in candidates if role_score.combined_score >= min_score]
+
+        return heapq.nsmallest(k, candidates, key=_rank_key)
@@ -0,0 +1,449 @@
+"""
+Local JSON HTTP service for programmatic resume analysis
+
+Usage:
+    python -m backend.service [--host 127.0.0.1] [--port 8600] [--workers N] [--max-queue N] [--catalog FILE]
+
+Endpoints (all request and response bodies are JSON):
+
+    POST /parse          {"filename": "cv.pdf", "content": "<base64>"} or {"text": "..."}
+    POST /analyze        a resume as above, or {"skills": [...]}; optional "top" and "detail"
+    POST /learning-plan  {"role": "Data Scientist"} plus a resume or "skills"
+    POST /batch          {"requests": [{"op": "analyze", ...}, ...]}
+    GET  /health
+    GET  /metrics        Prometheus text format
+
+Requests run on a bounded, pre-warmed worker pool that shares the compiled
+catalog, the parse and analysis caches and the extraction sandbox. When
+the workers and the queue are full, new requests are refused with 429
+instead of piling up. Connections are kept alive (HTTP/1.1).
+"""
+
+import argparse
+import base64
+import binascii
+import io
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from backend import metrics
+from backend.career_analyzer import (analyze_career_fit, generate_career_roadmap, get_learning_plan,
+                                     match_role, top_k_roles)
+from backend.catalog import UnknownRole, get_catalog, use_catalog_file, warm_catalog
+from backend.jobs import DEFAULT_MAX_WORKERS, run_analysis
+from backend.resume_parser import parse_resume
+from backend.sandbox import ExtractionError, get_sandbox
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_MAX_BODY_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_BATCH = 100
+DEFAULT_TOP_ROLES = 5
+
+# Seconds a client is asked to wait after a 429
+RETRY_AFTER_SECONDS = 1
+
+
+class ServiceBusy(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+
+class RequestError(ValueError):
+    """Raised for a malformed request; reported as 400"""
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _resume_file(payload: Dict) -> Tuple[str, bytes]:
+    # A resume is either plain text or base64 file content with a file name
+    if 'text' in payload:
+        if not isinstance(payload['text'], str):
+            raise RequestError("'text' must be a string")
+        return payload.get('filename') or "resume.txt", payload['text'].encode('utf-8')
+    if 'content' in payload:
+        filename = payload.get('filename')
+        if not isinstance(filename, str) or not filename:
+            raise RequestError("'filename' is required with 'content'")
+        try:
+            return filename, base64.b64decode(payload['content'], validate=True)
+        except (binascii.Error, TypeError, ValueError):
+            raise RequestError("'content' must be base64-encoded")
+    raise RequestError("Provide a resume as 'text' or as 'filename' and 'content'")
+
+
+def _skills(payload: Dict) -> Optional[Set[str]]:
+    skills = payload.get('skills')
+    if skills is None:
+        return None
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise RequestError("'skills' must be a list of strings")
+    return set(skills)
+
+
+def _top(payload: Dict) -> Optional[int]:
+    top = payload.get('top', DEFAULT_TOP_ROLES)
+    if top is None:
+        return None
+    # bool is an int subclass, but JSON true/false is not a role count
+    if not isinstance(top, int) or isinstance(top, bool) or top < 0:
+        raise RequestError("'top' must be a non-negative integer (0 for every role)")
+    return top or None
+
+
+def _summary(match: Dict) -> Dict:
+    return {
+        'role_name': match['role_name'],
+        'match_score': match['match_score'],
+        'demand_score': match['demand_score'],
+        'combined_score': match['combined_score']
+    }
+
+
+def parse(payload: Dict) -> Dict:
+    """
+    Extract skills from a resume
+
+    Args:
+        payload: Resume as 'text', or 'filename' and base64 'content';
+            'include_text' adds the extracted text
+
+    Returns:
+        Dictionary with fingerprint, skills, skill_count and truncated
+        (and text)
+    """
+    filename, content = _resume_file(payload)
+    uploaded_file = io.BytesIO(content)
+    uploaded_file.name = filename
+    include_text = bool(payload.get('include_text'))
+    resume_data = parse_resume(uploaded_file, skills_only=not include_text)
+
+    result = {
+        'fingerprint': resume_data['fingerprint'],
+        'skills': resume_data['skills'],
+        'skill_count': resume_data['skill_count'],
+        'truncated': resume_data['truncated']
+    }
+    if include_text:
+        result['text'] = resume_data['text']
+    return result
+
+
+def analyze(payload: Dict) -> Dict:
+    """
+    Rank roles for a resume or a list of skills
+
+    Args:
+        payload: Resume or 'skills'; 'top' limits the roles (default 5, 0
+            for all) and 'detail': false returns scores only
+
+    Returns:
+        Dictionary with skills, roles and, for resumes, the fingerprint
+    """
+    top = _top(payload)
+    skills = _skills(payload)
+    if skills is not None:
+        roles = analyze_career_fit(skills) if top is None else top_k_roles(skills, top)
+        result = {'skills': skills}
+    else:
+        filename, content = _resume_file(payload)
+        analysis = run_analysis(filename, content)
+        roles = analysis.matches(top)
+        result = {'fingerprint': analysis.fingerprint, 'skills': analysis.skills}
+
+    result['roles'] = roles if payload.get('detail', True) else [_summary(match) for match in roles]
+    return result
+
+
+def learning_plan(payload: Dict) -> Dict:
+    """
+    Build the learning plan and roadmap toward one role
+
+    Args:
+        payload: 'role' plus a resume or 'skills'
+
+    Returns:
+        Dictionary with the role's scores, learning_plan, total_hours and roadmap
+    """
+    role_name = payload.get('role')
+    if not isinstance(role_name, str):
+        raise RequestError("'role' is required")
+    skills = _skills(payload)
+    if skills is None:
+        skills = run_analysis(*_resume_file(payload)).skills
+
+    match = match_role(role_name, skills)
+    plan = get_learning_plan(match)
+    result = _summary(match)
+    result.update({
+        'known_skills': match['known_skills'],
+        'missing_skills': match['missing_skills'],
+        'learning_plan': plan,
+        'total_hours': sum(item['estimated_hours'] for item in plan),
+        'roadmap': generate_career_roadmap(match)
+    })
+    return result
+
+
+def _error(e: Exception) -> Tuple[int, Dict]:
+    # Map an exception to an HTTP status and a structured error body
+    if isinstance(e, ExtractionError):
+        return 422, e.to_dict()
+    if isinstance(e, UnknownRole):
+        return 404, {'reason': 'not_found', 'message': e.args[0] if e.args else str(e)}
+    if isinstance(e, ValueError):
+        return 400, {'reason': 'bad_request', 'message': str(e)}
+    return 500, {'reason': 'internal', 'message': f"{type(e).__name__}: {e}"}
+
+
+class AnalysisService:
+    """
+    Bounded worker pool executing service operations
+
+    Args:
+        workers: Operations running at the same time
+        max_queue: Operations allowed to wait for a worker before 429s
+        max_batch: Maximum number of requests in one /batch call
+    """
+
+    def __init__(self, workers: int = DEFAULT_MAX_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.rejected = 0
+        self.operations: Dict[str, Callable[[Dict], Dict]] = {
+            'parse': parse,
+            'analyze': analyze,
+            'learning-plan': learning_plan,
+            'batch': self.batch
+        }
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+        self._admission = threading.BoundedSemaphore(workers + max_queue)
+
+    def warm(self) -> None:
+        """Compile the catalog and start every worker thread and an extraction worker"""
+        for future in [self._executor.submit(warm_catalog) for _ in range(self.workers)]:
+            future.result()
+        sandbox = get_sandbox()
+        if sandbox is not None:
+            sandbox.warm(1)
+
+    def call(self, operation: str, payload: Dict) -> Dict:
+        """
+        Run an operation on the worker pool
+
+        Args:
+            operation: Name of the operation ('parse', 'analyze', 'learning-plan' or 'batch')
+            payload: Decoded JSON request body
+
+        Returns:
+            JSON-serializable result
+
+        Raises:
+            ServiceBusy: If every worker is busy and the queue is full
+        """
+        if not self._admission.acquire(blocking=False):
+            self.rejected += 1
+            raise ServiceBusy()
+        try:
+            return self._executor.submit(self.operations[operation], payload).result()
+        finally:
+            self._admission.release()
+
+    def batch(self, payload: Dict) -> Dict:
+        """
+        Run several operations in one worker, reporting errors per item
+
+        Args:
+            payload: {'requests': [{'op': name, ...request fields}, ...]}
+
+        Returns:
+            {'results': [...]} where each item has either 'result' or 'error' and 'status'
+        """
+        requests = payload.get('requests')
+        if not isinstance(requests, list):
+            raise RequestError("'requests' must be a list")
+        if len(requests) > self.max_batch:
+            raise RequestError(f"A batch may contain at most {self.max_batch} requests")
+
+        results = []
+        for request in requests:
+            operation = request.get('op') if isinstance(request, dict) else None
+            try:
+                if operation not in ('parse', 'analyze', 'learning-plan'):
+                    raise RequestError("'op' must be 'parse', 'analyze' or 'learning-plan'")
+                results.append({'status': 200, 'result': self.operations[operation](request)})
+            except Exception as e:
+                status, error = _error(e)
+                results.append({'status': status, 'error': error})
+        return {'results': results}
+
+    def shutdown(self) -> None:
+        """Stop the worker pool after the running operations"""
+        self._executor.shutdown(wait=True)
+
+
+def make_handler(service: AnalysisService, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES) -> type:
+    """
+    Build the request handler class bound to a service
+
+    Args:
+        service: Service executing the operations
+        max_body_bytes: Largest accepted request body
+
+    Returns:
+        BaseHTTPRequestHandler subclass
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class AnalysisHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "CareerCompass"
+        # Headers and body are separate writes; without TCP_NODELAY a
+        # kept-alive connection stalls on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/json",
+                  headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if self.close_connection:
+                self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(body)
+            endpoint = self.path.split('?')[0].strip('/')
+            known = endpoint in service.operations or endpoint in ('health', 'metrics')
+            metrics.inc(metrics.SERVICE_REQUESTS, 1, endpoint if known else 'other', str(status))
+
+        def _send_json(self, status: int, data: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+            self._send(status, json.dumps(data, default=_json_default).encode('utf-8'), headers=headers)
+
+        def _send_error(self, status: int, reason: str, message: str,
+                        headers: Optional[Dict[str, str]] = None) -> None:
+            self._send_json(status, {'error': {'reason': reason, 'message': message}}, headers)
+
+        def do_GET(self):
+            path = self.path.split('?')[0].rstrip('/')
+            if path == '/health':
+                self._send_json(200, {'status': 'ok', 'catalog_version': get_catalog().version})
+            elif path == '/metrics':
+                self._send(200, metrics.render_prometheus().encode('utf-8'),
+                           "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                self._send_error(404, 'not_found', f"No endpoint {path or '/'}")
+
+        def do_POST(self):
+            operation = self.path.split('?')[0].strip('/')
+            length = self.headers.get('Content-Length')
+            if length is None or not length.isdigit():
+                self.close_connection = True
+                self._send_error(411, 'length_required', "Content-Length is required")
+                return
+            if int(length) > max_body_bytes:
+                # The body is not read, so the connection cannot be reused
+                self.close_connection = True
+                self._send_error(413, 'too_large', f"Request bodies are limited to {max_body_bytes} bytes")
+                return
+            body = self.rfile.read(int(length))
+
+            if operation not in service.operations:
+                self._send_error(404, 'not_found', f"No endpoint /{operation}")
+                return
+            try:
+                payload = json.loads(body)
+                if not isinstance(payload, dict):
+                    raise ValueError("the body must be a JSON object")
+            except ValueError as e:
+                self._send_error(400, 'bad_request', f"Invalid JSON: {e}")
+                return
+
+            try:
+                result = service.call(operation, payload)
+            except ServiceBusy:
+                self._send_error(429, 'busy', "The analysis service is busy. Please retry shortly.",
+                                 {'Retry-After': str(RETRY_AFTER_SECONDS)})
+                return
+            except Exception as e:
+                status, error = _error(e)
+                self._send_json(status, {'error': error})
+                return
+            self._send_json(200, result)
+
+        def log_message(self, format, *args):
+            pass
+
+    return AnalysisHandler
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  service: Optional[AnalysisService] = None,
+                  max_body_bytes: int = DEFAULT_MAX_BODY_BYTES) -> "ThreadingHTTPServer":
+    """
+    Create (but do not start) the HTTP server
+
+    Args:
+        host: Interface to bind
+        port: TCP port (0 picks a free port)
+        service: Service to expose (a default one is created if omitted)
+        max_body_bytes: Largest accepted request body
+
+    Returns:
+        ThreadingHTTPServer; call ``serve_forever`` to run it
+    """
+    from http.server import ThreadingHTTPServer
+
+    class AnalysisServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    server = AnalysisServer((host, port), make_handler(service or AnalysisService(), max_body_bytes))
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Serve resume analysis as a local JSON HTTP API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Concurrent operations (default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"Operations waiting for a worker before 429s (default: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"Requests per /batch call (default: {DEFAULT_MAX_BATCH})")
+    parser.add_argument('--catalog', help="Role catalog file (.json, .jsonl or SQLite)")
+    args = parser.parse_args(argv)
+
+    use_catalog_file(args.catalog)
+    metrics.configure_from_env()
+    metrics.enable()
+    service = AnalysisService(args.workers, args.max_queue, args.max_batch)
+    service.warm()
+    server = create_server(args.host, args.port, service)
+    print(f"Serving on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+What-if skill simulation with incremental re-scoring
+
+A SkillSimulator starts from the skills found in a resume and keeps the
+known-skill count of every role that shares a skill with the user. When
+skills are toggled, only the roles in the postings of the changed skills
+are re-scored, and the ranking is re-selected from those counts without
+re-running extraction or scoring the whole catalog.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.career_analyzer import build_match
+from backend.catalog import RoleCatalog, get_catalog
+from backend.scoring import RoleScore
+
+
+class SkillSimulator:
+    """
+    Incrementally maintained role scores for a hypothetical skill set
+
+    Args:
+        user_skills: Skills found in the resume
+        catalog: Catalog to score against (defaults to the current catalog)
+        fingerprint: Fingerprint of the resume the skills came from
+    """
+
+    def __init__(self, user_skills: Iterable[str], catalog: Optional[RoleCatalog] = None,
+                 fingerprint: str = ""):
+        self.catalog = catalog or get_catalog()
+        self.fingerprint = fingerprint
+        index = self.catalog.index
+        engine = self.catalog.engine
+
+        self.base_skill_ids = frozenset(index.encode(user_skills))
+        self.skill_ids: Set[int] = set(self.base_skill_ids)
+        self._counts = index.overlap_counts(self.skill_ids)
+        self._scores: Dict[int, RoleScore] = {
+            role_index: engine.role_score(role_index, known_count)
+            for role_index, known_count in self._counts.items()
+        }
+        self._base_scores = dict(self._scores)
+
+    def _apply(self, skill_id: int, delta: int) -> None:
+        engine = self.catalog.engine
+        counts = self._counts
+        scores = self._scores
+        for role_index in self.catalog.index.postings[skill_id]:
+            known_count = counts.get(role_index, 0) + delta
+            if known_count:
+                counts[role_index] = known_count
+                scores[role_index] = engine.role_score(role_index, known_count)
+            else:
+                del counts[role_index]
+                del scores[role_index]
+
+    def set_skills(self, skills: Iterable[str]) -> Set[int]:
+        """
+        Move the simulation to a new skill set, re-scoring only affected roles
+
+        Args:
+            skills: The complete hypothetical skill set (unknown skills are ignored)
+
+        Returns:
+            Indexes of the roles whose score changed
+        """
+        target = self.catalog.index.encode(skills)
+        added = target - self.skill_ids
+        removed = self.skill_ids - target
+        postings = self.catalog.index.postings
+
+        affected: Set[int] = set()
+        for skill_id in added:
+            self._apply(skill_id, 1)
+            affected.update(postings[skill_id])
+        for skill_id in removed:
+            self._apply(skill_id, -1)
+            affected.update(postings[skill_id])
+        self.skill_ids = target
+        return affected
+
+    def toggle(self, skill: str) -> Set[int]:
+        """
+        Add a skill if it is absent, remove it otherwise
+
+        Args:
+            skill: Skill name (case-insensitive)
+
+        Returns:
+            Indexes of the roles whose score changed
+        """
+        skill_id = self.catalog.index.skill_ids.get(skill.lower())
+        if skill_id is None:
+            return set()
+        if skill_id in self.skill_ids:
+            self.skill_ids.discard(skill_id)
+            self._apply(skill_id, -1)
+        else:
+            self.skill_ids.add(skill_id)
+            self._apply(skill_id, 1)
+        return set(self.catalog.index.postings[skill_id])
+
+    def reset(self) -> Set[int]:
+        """Return to the skills found in the resume"""
+        names = self.catalog.index.skill_names
+        return self.set_skills(names[skill_id] for skill_id in self.base_skill_ids)
+
+    @property
+    def skills(self) -> List[str]:
+        """Current hypothetical skills, sorted by name"""
+        names = self.catalog.index.skill_names
+        return sorted(names[skill_id] for skill_id in self.skill_ids)
+
+    def rank(self, k: Optional[int] = None) -> List[RoleScore]:
+        """
+        Select the k best roles for the current skill set
+
+        Args:
+            k: Number of roles to return (None for every role)
+
+        Returns:
+            RoleScores sorted by combined score (highest first)
+        """
+        return self.catalog.engine.select(list(self._scores.values()), k)
+
+    def base_score(self, role_index: int) -> RoleScore:
+        """Score of a role for the skills found in the resume"""
+        base = self._base_scores.get(role_index)
+        return base if base is not None else self.catalog.engine.role_score(role_index, 0)
+
+    def top_matches(self, k: int) -> List[Dict]:
+        """
+        Best roles for the current skill set with their change against the resume
+
+        Args:
+            k: Number of roles to return
+
+        Returns:
+            Role match dictionaries in the ``analyze_career_fit`` format, each
+            with an extra ``score_change`` (combined score minus the resume's)
+        """
+        matches = []
+        for role_score in self.rank(k):
+            match = build_match(self.catalog, role_score, self.skill_ids)
+            base = self.base_score(role_score.role_index)
+            match['score_change'] = round(role_score.combined_score - base.combined_score, 1)
+            matches.append(match)
+        return matches
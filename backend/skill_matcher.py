@@ -0,0 +1,225 @@
+"""
+Compiled single-pass skill matcher used for resume keyword extraction
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Words, individual punctuation marks and whitespace runs. Splitting
+# punctuation into its own tokens lets skills such as "C++", "C#",
+# "Node.js" and "CI/CD" be matched token by token.
+_TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+# Sentinel key marking the end of a skill inside the trie
+_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split lowercased text into matcher tokens
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens where every whitespace run is collapsed to a single space
+    """
+    return [
+        " " if token[0].isspace() else token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+    ]
+
+
+class SkillMatcher:
+    """
+    Token trie over a skill vocabulary that finds every skill in one pass
+
+    A skill only matches on whole tokens, so "Java" never matches inside
+    "JavaScript" and "SQL" never matches inside "MySQL". Aliases are
+    compiled into the same trie and report their canonical skill, so the
+    cost of a scan depends on the length of the text, not on the size of
+    the vocabulary or the alias table.
+
+    Args:
+        skills: Canonical skill names
+        aliases: Optional mapping of alias to canonical skill name
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self._root: Dict[str, dict] = {}
+        self._skills: List[str] = []
+        self._skill_keys: Set[Tuple[str, ...]] = set()
+        self._aliases: Dict[str, str] = {}
+        self.max_tokens = 0
+        self._fingerprint = None
+
+        for skill in skills:
+            self.add(skill)
+        for alias, skill in (aliases or {}).items():
+            self.add_alias(alias, skill)
+
+    def add(self, skill: str) -> None:
+        """
+        Compile one skill into the trie
+
+        Args:
+            skill: Skill name as it should be reported when matched
+        """
+        tokens = tokenize(skill.strip())
+        if not tokens:
+            return
+
+        node = self._insert(tokens)
+        key = tuple(tokens)
+        if key not in self._skill_keys:
+            self._skill_keys.add(key)
+            self._skills.append(skill)
+        node[_END] = skill
+
+    def add_alias(self, alias: str, skill: str) -> None:
+        """
+        Compile an alternative spelling that is reported as a canonical skill
+
+        An alias never overrides a canonical skill with the same spelling.
+
+        Args:
+            alias: Variant to match, for example "k8s"
+            skill: Canonical skill it stands for, for example "Kubernetes"
+        """
+        tokens = tokenize(alias.strip())
+        if not tokens or tuple(tokens) in self._skill_keys:
+            return
+
+        self._insert(tokens)[_END] = skill
+        self._aliases[alias] = skill
+
+    def _insert(self, tokens: List[str]) -> dict:
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        self._fingerprint = None
+        self.max_tokens = max(self.max_tokens, len(tokens))
+        return node
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the compiled vocabulary, used to key caches"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for skill in sorted(self._skills):
+                digest.update(skill.encode('utf-8') + b"\0")
+            for alias, skill in sorted(self._aliases.items()):
+                digest.update(alias.encode('utf-8') + b"\1" + skill.encode('utf-8') + b"\0")
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def skills(self) -> List[str]:
+        """Skills compiled into the matcher, in insertion order"""
+        return list(self._skills)
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """Aliases compiled into the matcher, mapped to their canonical skill"""
+        return dict(self._aliases)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def find_in_tokens(self, tokens: List[str]) -> Set[str]:
+        """
+        Find all skills in an already tokenized text
+
+        Args:
+            tokens: Tokens produced by ``tokenize``
+
+        Returns:
+            Set of matched skill names
+        """
+        root = self._root
+        found = set()
+        count = len(tokens)
+
+        for start in range(count):
+            node = root.get(tokens[start])
+            position = start
+            while node is not None:
+                skill = node.get(_END)
+                if skill is not None:
+                    found.add(skill)
+                position += 1
+                if position >= count:
+                    break
+                node = node.get(tokens[position])
+
+        return found
+
+    def scanner(self) -> "SkillScanner":
+        """
+        Create an incremental scanner for text that arrives in chunks
+
+        Returns:
+            A new SkillScanner bound to this matcher
+        """
+        return SkillScanner(self)
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Find all skills mentioned in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched skill names
+        """
+        return self.find_in_tokens(tokenize(text))
+
+
+class SkillScanner:
+    """
+    Incremental skill scanner fed one chunk (for example one PDF page) at a time
+
+    Chunks are treated as separated by whitespace. The last few tokens of
+    each chunk are carried over so multi-word skills split across chunk
+    boundaries are still found.
+    """
+
+    def __init__(self, matcher: SkillMatcher):
+        self._matcher = matcher
+        self._carry: List[str] = []
+        self.found: Set[str] = set()
+
+    def feed(self, text: str) -> Set[str]:
+        """
+        Scan the next chunk of text
+
+        Args:
+            text: Next chunk of text
+
+        Returns:
+            Skills newly found in this chunk
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return set()
+
+        window = self._carry
+        if window and window[-1] == " " and tokens[0] == " ":
+            tokens = tokens[1:]
+        elif window and window[-1] != " " and tokens[0] != " ":
+            window.append(" ")
+        window.extend(tokens)
+
+        new_skills = self._matcher.find_in_tokens(window) - self.found
+        self.found |= new_skills
+
+        keep = max(self._matcher.max_tokens - 1, 0)
+        self._carry = window[-keep:] if keep else []
+        return new_skills
+
+    @property
+    def complete(self) -> bool:
+        """True once every skill in the vocabulary has been found"""
+        return len(self.found) >= len(self._matcher)
@@ -0,0 +1 @@
+# Career Compass AI benchmark suite
@@ -0,0 +1,279 @@
+"""
+Reproducible benchmarks for the parse, extract and score stages
+
+Usage:
+    python -m benchmarks.run [--profile quick|full] [-o results.json] [--baseline old.json]
+
+Every case is timed per call and reported with mean, p50 and p95 latency,
+throughput and the peak traced memory of one call. Results are written as
+JSON so runs from different commits can be compared with --baseline.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from backend.career_analyzer import analyze_career_fit, get_learning_plan
+from backend.catalog import catalog_from_dict, get_catalog, set_catalog
+from backend.pdf_pool import MIN_PAGES_PER_RANGE, configure_pdf_pool, get_pdf_pool
+from backend.reports import REPORT_FORMATS, AnalysisReport, generate_report, render_report
+from backend.resume_parser import extract_skills_from_text, extract_text_from_pdf, pdf_support_available
+from benchmarks.synthetic import make_catalog, make_pdf, make_resume_text
+
+PROFILES = {
+    'quick': {
+        'iterations': 20,
+        'resume_words': [300, 3000],
+        'pdf_pages': [2, 20],
+        'catalogs': [(7, 75), (1000, 1000)],
+        'users': 50
+    },
+    'full': {
+        'iterations': 100,
+        'resume_words': [300, 3000, 30000],
+        'pdf_pages': [2, 20, 100],
+        'catalogs': [(7, 75), (1000, 1000), (10000, 5000)],
+        'users': 200
+    }
+}
+
+WORDS_PER_PAGE = 45 * 12
+
+
+def _percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    rank = max(int(round(fraction * len(sorted_samples) + 0.5)) - 1, 0)
+    return sorted_samples[min(rank, len(sorted_samples) - 1)]
+
+
+def measure(benchmark: str, params: Dict[str, Any], function: Callable[[Any], Any],
+            inputs: Sequence[Any], iterations: int, units_per_call: float = 1,
+            unit: str = "calls") -> Dict:
+    """
+    Time a function over a cycle of inputs
+
+    Args:
+        benchmark: Benchmark name
+        params: Parameters describing the case
+        function: Callable taking one input
+        inputs: Inputs, used round-robin
+        iterations: Number of timed calls
+        units_per_call: Work units processed per call, for throughput
+        unit: Name of the work unit
+
+    Returns:
+        Result record
+    """
+    function(inputs[0])
+
+    samples = []
+    for iteration in range(iterations):
+        argument = inputs[iteration % len(inputs)]
+        started = time.perf_counter()
+        function(argument)
+        samples.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    function(inputs[0])
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        'benchmark': benchmark,
+        'params': params,
+        'iterations': iterations,
+        'mean_ms': round(mean * 1000, 4),
+        'p50_ms': round(_percentile(samples, 0.50) * 1000, 4),
+        'p95_ms': round(_percentile(samples, 0.95) * 1000, 4),
+        'min_ms': round(samples[0] * 1000, 4),
+        'max_ms': round(samples[-1] * 1000, 4),
+        'throughput': {'value': round(units_per_call / mean, 2) if mean else None, 'unit': f"{unit}/s"},
+        'peak_memory_bytes': peak_memory
+    }
+
+
+def bench_pdf_extraction(profile: Dict) -> List[Dict]:
+    """Time extract_text_from_pdf over small to large documents, inline and in page ranges"""
+    if not pdf_support_available():
+        print("PyPDF2 is not installed; skipping PDF extraction benchmarks", file=sys.stderr)
+        return []
+
+    pool = get_pdf_pool()
+    results = []
+    try:
+        for pages in profile['pdf_pages']:
+            pdf = make_pdf(make_resume_text(pages * WORDS_PER_PAGE, get_catalog().skills, seed=pages))
+            iterations = max(profile['iterations'] // max(pages // 10, 1), 3)
+            modes = [('extract_text_from_pdf', 0)]
+            if pool.workers > 1 and pages >= 2 * MIN_PAGES_PER_RANGE:
+                modes.append(('extract_text_from_pdf_parallel', 1))
+            for name, threshold in modes:
+                configure_pdf_pool(threshold, pool.workers)
+                results.append(measure(
+                    name, {'pages': pages, 'bytes': len(pdf)},
+                    lambda content: extract_text_from_pdf(io.BytesIO(content)),
+                    [pdf], iterations, units_per_call=pages, unit="pages"
+                ))
+    finally:
+        configure_pdf_pool(pool.threshold, pool.workers)
+    return results
+
+
+def bench_catalog(profile: Dict, role_count: int, skill_count: int) -> List[Dict]:
+    """Time skill extraction, scoring and reporting against one synthetic catalog"""
+    roles, skills = make_catalog(role_count, skill_count, seed=role_count)
+    catalog = catalog_from_dict(roles, skills, source="synthetic")
+    set_catalog(catalog)
+    catalog_params = {'roles': role_count, 'skills': skill_count}
+    results = []
+
+    started = time.perf_counter()
+    catalog.index
+    catalog.engine
+    catalog.matcher
+    results.append({
+        'benchmark': 'compile_catalog',
+        'params': catalog_params,
+        'iterations': 1,
+        'mean_ms': round((time.perf_counter() - started) * 1000, 4)
+    })
+
+    for words in profile['resume_words']:
+        texts = [make_resume_text(words, skills, seed=seed) for seed in range(5)]
+        results.append(measure(
+            'extract_skills_from_text', dict(catalog_params, words=words),
+            extract_skills_from_text, texts, profile['iterations'],
+            units_per_call=sum(map(len, texts)) / len(texts) / 1024, unit="KiB"
+        ))
+
+    rng = random.Random(skill_count)
+    users = [set(rng.sample(skills, min(len(skills), rng.randint(5, 30)))) for _ in range(profile['users'])]
+    results.append(measure(
+        'analyze_career_fit', catalog_params, analyze_career_fit, users,
+        max(profile['iterations'] // max(role_count // 1000, 1), 3), unit="resumes"
+    ))
+
+    matches = [analyze_career_fit(user)[0] for user in users[:10]]
+    results.append(measure(
+        'get_learning_plan', catalog_params, get_learning_plan, matches, profile['iterations'] * 10,
+        unit="plans"
+    ))
+    results.append(measure(
+        'generate_report', catalog_params, generate_report, matches, profile['iterations'] * 10,
+        unit="reports"
+    ))
+
+    all_matches = analyze_career_fit(users[0])
+    resume_data = {'fingerprint': "benchmark", 'skills': users[0]}
+    for fmt in REPORT_FORMATS:
+        results.append(measure(
+            'render_report', dict(catalog_params, format=fmt),
+            lambda matches: render_report(fmt, AnalysisReport(resume_data, matches)),
+            [all_matches], max(profile['iterations'] // max(role_count // 100, 1), 3),
+            units_per_call=len(all_matches), unit="roles"
+        ))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(profile_name: str) -> Dict:
+    """
+    Run every benchmark of a profile
+
+    Args:
+        profile_name: Key of PROFILES
+
+    Returns:
+        Report with metadata and one record per case
+    """
+    profile = PROFILES[profile_name]
+    original_catalog = get_catalog()
+    results = bench_pdf_extraction(profile)
+    try:
+        for role_count, skill_count in profile['catalogs']:
+            results.extend(bench_catalog(profile, role_count, skill_count))
+    finally:
+        set_catalog(original_catalog)
+
+    return {
+        'meta': {
+            'profile': profile_name,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+
+
+def _case_key(record: Dict) -> str:
+    return record['benchmark'] + json.dumps(record['params'], sort_keys=True)
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None) -> None:
+    """
+    Print a summary table, with p50 change against a baseline report if given
+
+    Args:
+        report: Report produced by ``run``
+        baseline: Earlier report to compare with
+    """
+    previous = {_case_key(record): record for record in (baseline or {}).get('results', [])}
+    for record in report['results']:
+        params = ", ".join(f"{key}={value}" for key, value in record['params'].items())
+        line = f"{record['benchmark']:<26} {params:<42} p50 {record.get('p50_ms', record['mean_ms']):>10.3f} ms"
+        if 'p95_ms' in record:
+            line += f"  p95 {record['p95_ms']:>10.3f} ms  peak {record['peak_memory_bytes'] / 1024:>9.1f} KiB"
+        old = previous.get(_case_key(record))
+        if old is not None:
+            old_p50 = old.get('p50_ms', old['mean_ms'])
+            new_p50 = record.get('p50_ms', record['mean_ms'])
+            if old_p50:
+                line += f"  ({(new_p50 - old_p50) / old_p50 * 100:+.1f}% vs baseline)"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--baseline', help="Earlier JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.profile)
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Cold-start import cost report
+
+Usage:
+    python -m benchmarks.startup [-n RUNS] [--top N] [-o startup.json] [--baseline old.json] [MODULE ...]
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+the self and cumulative import time of every module it pulls in is
+reported (median over the runs), so the cost a container start or a
+Streamlit worker pays before serving the first request can be compared
+across commits.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+DEFAULT_MODULES = [
+    'backend.resume_parser',
+    'backend.career_analyzer',
+    'backend.jobs',
+    'backend.artifacts',
+    'streamlit'
+]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module: str) -> Dict[str, Dict[str, int]]:
+    """
+    Import a module in a fresh interpreter and collect per-module import times
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Mapping of imported module name to {'self_us', 'cumulative_us', 'depth'}
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, cwd=_REPO_ROOT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr.strip().splitlines()[-1]}")
+
+    # Children are listed before their parent, so the module's own subtree is
+    # the block ending at its depth-0 line; interpreter start-up (site) is dropped
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = (len(indent) - 1) // 2
+            timings[name] = {'self_us': int(self_us), 'cumulative_us': int(cumulative_us), 'depth': depth}
+            if depth == 0:
+                if name == module:
+                    break
+                timings = {}
+    return timings
+
+
+def profile_module(module: str, runs: int, top: int) -> Dict:
+    """
+    Median import cost of a module and its most expensive dependencies
+
+    Args:
+        module: Dotted module name
+        runs: Number of fresh interpreters to average over
+        top: Number of dependencies to report
+
+    Returns:
+        Record with total_ms and the top dependencies by cumulative time
+    """
+    samples = [measure_import(module) for _ in range(runs)]
+    names = set().union(*samples)
+
+    def median_ms(name: str, field: str) -> float:
+        return round(statistics.median(sample.get(name, {}).get(field, 0) for sample in samples) / 1000, 3)
+
+    dependencies = sorted(
+        (
+            {'module': name, 'cumulative_ms': median_ms(name, 'cumulative_us'), 'self_ms': median_ms(name, 'self_us')}
+            for name in names if name != module
+        ),
+        key=lambda record: -record['cumulative_ms']
+    )
+    return {
+        'module': module,
+        'total_ms': median_ms(module, 'cumulative_us'),
+        'modules_loaded': len(names),
+        'heaviest': dependencies[:top],
+        'loaded': sorted(names)
+    }
+
+
+def print_report(report: List[Dict], baseline: Optional[List[Dict]] = None) -> None:
+    """
+    Print the import cost of every profiled module, with change against a baseline
+
+    Args:
+        report: Records produced by ``profile_module``
+        baseline: Earlier report to compare with
+    """
+    previous = {record['module']: record for record in baseline or []}
+    for record in report:
+        line = f"{record['module']:<28} {record['total_ms']:>9.1f} ms  {record['modules_loaded']:>4} modules"
+        old = previous.get(record['module'])
+        if old is not None and old['total_ms']:
+            line += f"  ({(record['total_ms'] - old['total_ms']) / old['total_ms'] * 100:+.1f}% vs baseline)"
+            newly_loaded = sorted(set(record['loaded']) - set(old['loaded']))
+            if newly_loaded:
+                line += f"\n{'':<30}newly loaded: {', '.join(newly_loaded[:10])}"
+        print(line)
+        for dependency in record['heaviest']:
+            print(f"    {dependency['module']:<40} {dependency['cumulative_ms']:>9.1f} ms cumulative"
+                  f"  {dependency['self_ms']:>8.1f} ms self")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Report per-module import cost at cold start")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument('-n', '--runs', type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument('--top', type=int, default=8, help="Heaviest dependencies to list")
+    parser.add_argument('-o', '--output', help="JSON results file")
+    parser.add_argument('--baseline', help="Earlier JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    report = [profile_module(module, max(args.runs, 1), args.top) for module in args.modules]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Deterministic synthetic resumes, PDFs and role catalogs for benchmarks
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from backend.data.job_roles_data import COMMON_SKILLS
+
+_FILLER_WORDS = (
+    "designed built delivered improved led team project system service data platform "
+    "customers reduced latency increased revenue migrated pipeline stakeholders reporting "
+    "responsible for owned the roadmap mentored engineers using with and across quarterly"
+).split()
+
+
+def make_skill_vocabulary(size: int) -> List[str]:
+    """
+    Build a skill vocabulary of the requested size
+
+    The real COMMON_SKILLS come first so small vocabularies stay realistic;
+    larger ones are padded with generated multi-word skills.
+
+    Args:
+        size: Number of skills
+
+    Returns:
+        List of skill names
+    """
+    skills = list(COMMON_SKILLS[:size])
+    for number in range(size - len(skills)):
+        skills.append(f"Skill{number:05d} Toolkit" if number % 2 else f"Framework{number:05d}")
+    return skills
+
+
+def make_catalog(role_count: int, skill_count: int, seed: int = 0) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Build a JOB_ROLES_DB shaped catalog
+
+    Args:
+        role_count: Number of roles
+        skill_count: Size of the skill vocabulary
+        seed: Random seed
+
+    Returns:
+        Tuple of (roles, skills)
+    """
+    rng = random.Random(seed)
+    skills = make_skill_vocabulary(skill_count)
+    roles = {}
+    for number in range(role_count):
+        required = rng.sample(skills, min(len(skills), rng.randint(8, 15)))
+        roles[f"Role {number:05d}"] = {
+            'required_skills': required,
+            'demand_score': rng.randint(50, 99),
+            'description': f"Synthetic role number {number} used for benchmarking",
+            'learning_resources': {
+                skill: {
+                    'youtube': f"https://www.youtube.com/results?search_query={skill.replace(' ', '+')}",
+                    'estimated_hours': rng.choice((20, 30, 40, 60, 80))
+                }
+                for skill in required[:5]
+            },
+            'career_path': [f"Junior Role {number}", f"Role {number}", f"Senior Role {number}"]
+        }
+    return roles, skills
+
+
+def make_resume_text(word_count: int, skills: List[str], skill_mentions: int = 20, seed: int = 0) -> str:
+    """
+    Build resume-like text with skill mentions scattered through filler words
+
+    Args:
+        word_count: Approximate number of words
+        skills: Vocabulary to draw mentioned skills from
+        skill_mentions: Number of skill mentions
+        seed: Random seed
+
+    Returns:
+        Resume text
+    """
+    rng = random.Random(seed)
+    words = [rng.choice(_FILLER_WORDS) for _ in range(word_count)]
+    for _ in range(skill_mentions):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(skills))
+
+    lines = []
+    for start in range(0, len(words), 12):
+        lines.append(" ".join(words[start:start + 12]))
+    return "\n".join(lines)
+
+
+def make_pdf(text: str, lines_per_page: int = 45) -> bytes:
+    """
+    Render text into a minimal multi-page PDF
+
+    Args:
+        text: Text to render, one PDF line per text line
+        lines_per_page: Number of lines on each page
+
+    Returns:
+        PDF file content
+    """
+    lines = text.splitlines() or [""]
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    page_refs = []
+    for page_lines in pages:
+        escaped = (
+            line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            for line in page_lines
+        )
+        stream = ("BT /F1 10 Tf 40 760 Td 14 TL " + " ".join(f"({line}) '" for line in escaped) + " ET")
+        stream = stream.encode('latin-1', errors='replace')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode('ascii')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
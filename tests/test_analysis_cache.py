@@ -0,0 +1,130 @@
+"""
+Single-flight computation, expiry and eviction of the shared analysis cache
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.analysis_cache import AnalysisCache
+
+WAITERS = 8
+
+
+class Cancelled(Exception):
+    pass
+
+
+def run_concurrently(cache: AnalysisCache, compute, count: int = WAITERS, **kwargs):
+    """Start count callers for the same key while compute blocks, then release it"""
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [
+            executor.submit(cache.get_or_compute, 'key', compute, lambda value: 1, **kwargs)
+            for _ in range(count)
+        ]
+        # Every caller but the leader is now waiting on the leader's flight
+        while cache.misses + cache.coalesced < count:
+            threading.Event().wait(0.01)
+        compute.release.set()
+        return futures
+
+
+def blocking(result=None, error=None):
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        if error is not None and len(calls) == 1:
+            raise error
+        return result
+    compute.calls = calls
+    compute.release = release
+    return compute
+
+
+def test_concurrent_callers_share_one_computation():
+    cache = AnalysisCache()
+    compute = blocking(result='analysis')
+    futures = run_concurrently(cache, compute)
+    outcomes = sorted(future.result()[1] for future in futures)
+
+    assert len(compute.calls) == 1
+    assert outcomes == ['coalesced'] * (WAITERS - 1) + ['miss']
+    assert {future.result()[0] for future in futures} == {'analysis'}
+    assert cache.get_or_compute('key', compute, lambda value: 1) == ('analysis', 'hit')
+
+
+def test_waiting_callers_receive_the_leaders_error():
+    cache = AnalysisCache()
+    compute = blocking(error=ValueError("unreadable"))
+    futures = run_concurrently(cache, compute)
+
+    for future in futures:
+        with pytest.raises(ValueError, match="unreadable"):
+            future.result()
+    assert len(compute.calls) == 1
+    assert cache.get('key') is None
+
+
+def test_waiting_callers_retry_after_a_cancelled_leader():
+    cache = AnalysisCache()
+    compute = blocking(result='analysis', error=Cancelled())
+    futures = run_concurrently(cache, compute, retry_on=(Cancelled,))
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Cancelled:
+            results.append('cancelled')
+    assert results.count('cancelled') == 1
+    assert len(compute.calls) == 2
+    finished = [result for result in results if result != 'cancelled']
+    assert {value for value, outcome in finished} == {'analysis'}
+    assert [outcome for value, outcome in finished].count('miss') == 1
+
+
+def test_abort_check_stops_a_waiting_caller():
+    cache = AnalysisCache()
+    release = threading.Event()
+    leader = threading.Thread(
+        target=cache.get_or_compute, args=('key', lambda: release.wait(5) and 'analysis', lambda value: 1)
+    )
+    leader.start()
+    while cache.misses == 0:
+        threading.Event().wait(0.01)
+
+    def abort():
+        raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        cache.get_or_compute('key', lambda: 'other', lambda value: 1, abort_check=abort)
+    release.set()
+    leader.join()
+    assert cache.get('key') == 'analysis'
+
+
+def test_entries_expire_and_are_evicted_by_size():
+    now = [0.0]
+    cache = AnalysisCache(max_bytes=10, ttl_seconds=60, clock=lambda: now[0])
+    cache.put('a', 'A', 4)
+    cache.put('b', 'B', 4)
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C', 4)
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    now[0] = 61.0
+    assert cache.get('a') is None
+    assert cache.evictions == 1
+    assert cache.expirations == 1
+
+
+def test_zero_bytes_caches_nothing_but_keeps_single_flight():
+    cache = AnalysisCache(max_bytes=0)
+    compute = blocking(result='analysis')
+    run_concurrently(cache, compute)
+    assert len(compute.calls) == 1
+    assert cache.get('key') is None
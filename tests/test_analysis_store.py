@@ -0,0 +1,124 @@
+"""
+Batched writes of the analysis store, including duplicate and failed batches
+"""
+
+import sqlite3
+
+import pytest
+
+from backend import jobs, metrics
+from backend.analysis_store import AnalysisStore, import_resumes
+from backend.catalog import catalog_from_dict
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="tests")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "analyses.db"), batch_size=1000, flush_seconds=0)
+    yield store
+    store.close()
+
+
+def resume(fingerprint, skills, text="Python developer"):
+    return {'fingerprint': fingerprint, 'skills': set(skills), 'text': text}
+
+
+def test_flush_writes_queued_resumes(store, catalog):
+    store.add(resume('a', ['Python', 'SQL']), label="a.txt", catalog=catalog)
+    store.add(resume('b', ['Docker']), label="b.txt", catalog=catalog)
+    assert store.flush() == 2
+    assert len(store) == 2
+    assert store.get('a')['skills'] == {'Python', 'SQL'}
+    assert [row['fingerprint'] for row in store.find_by_skills(['python', 'sql'])] == ['a']
+
+
+def test_resume_queued_twice_keeps_its_latest_analysis(store, catalog):
+    store.add(resume('a', ['Python']), label="first.txt", catalog=catalog)
+    store.add(resume('a', ['Python', 'Docker'], text="Python and Docker"), label="second.txt", catalog=catalog)
+    assert store.flush() == 1
+    stored = store.get('a')
+    assert stored['label'] == "second.txt"
+    assert stored['skills'] == {'Python', 'Docker'}
+    assert [row['fingerprint'] for row in store.search_text('docker')] == ['a']
+
+
+def test_resume_added_again_in_a_later_batch_replaces_the_first(store, catalog):
+    store.add(resume('a', ['Python']), catalog=catalog)
+    store.flush()
+    store.add(resume('a', ['SQL']), catalog=catalog)
+    store.flush()
+    assert len(store) == 1
+    assert store.get('a')['skills'] == {'SQL'}
+    assert store.find_by_skills(['python']) == []
+
+
+def test_failed_batch_is_requeued(store, catalog, monkeypatch):
+    store.add(resume('a', ['Python']), catalog=catalog)
+    write = store._write
+
+    def failing_write(pending):
+        monkeypatch.setattr(store, '_write', write)
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, '_write', failing_write)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    store.add(resume('b', ['SQL']), catalog=catalog)
+    assert store.flush() == 2
+    assert store.get('a') is not None and store.get('b') is not None
+
+
+def break_writes(store, monkeypatch):
+    def failing_write(pending):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, '_write', failing_write)
+    monkeypatch.setattr(metrics, '_enabled', True)
+    return metrics.STORE_WRITE_FAILURES.value('add'), metrics.STORE_WRITE_FAILURES.value('flush')
+
+
+def test_try_add_reports_write_errors(store, catalog, monkeypatch):
+    store.batch_size = 1
+    failed_adds, _ = break_writes(store, monkeypatch)
+    assert store.try_add(resume('a', ['Python']), catalog=catalog) is False
+    assert metrics.STORE_WRITE_FAILURES.value('add') == failed_adds + 1
+    assert [item.fingerprint for item in store._pending] == ['a']
+
+
+def test_background_flush_reports_write_errors(store, catalog, monkeypatch):
+    store.add(resume('a', ['Python']), catalog=catalog)
+    _, failed_flushes = break_writes(store, monkeypatch)
+    store._flush_in_background()
+    assert metrics.STORE_WRITE_FAILURES.value('flush') == failed_flushes + 1
+
+
+def test_store_errors_do_not_fail_the_analysis(store, monkeypatch):
+    store.batch_size = 1
+    failed_adds, _ = break_writes(store, monkeypatch)
+    monkeypatch.setattr(jobs, 'get_analysis_store', lambda: store)
+    analysis = jobs.run_analysis("store-failure.txt", b"Python, SQL, Docker and a failing archive")
+    assert analysis.skills >= {'Python', 'SQL', 'Docker'}
+    assert metrics.STORE_WRITE_FAILURES.value('add') == failed_adds + 1
+
+
+def test_top_for_role_ranks_stored_scores(store, catalog):
+    role_name = 'Data Scientist'
+    required = JOB_ROLES_DB[role_name]['required_skills']
+    store.add(resume('few', required[:1]), catalog=catalog)
+    store.add(resume('many', required[:4]), catalog=catalog)
+    ranked = store.top_for_role(role_name, catalog_version=catalog.version)
+    assert [row['fingerprint'] for row in ranked] == ['many', 'few']
+    assert ranked[0]['known_count'] == 4
+
+
+def test_import_of_identical_files(store, tmp_path):
+    for name in ('one.txt', 'two.txt'):
+        (tmp_path / name).write_text("Python, SQL and Docker")
+    paths = [str(tmp_path / 'one.txt'), str(tmp_path / 'two.txt'), str(tmp_path / 'missing.txt')]
+    assert import_resumes(store, paths) == (2, 1)
+    assert len(store) == 1
@@ -0,0 +1,92 @@
+"""
+Batch runs stream one record per resume, including failed files and dead workers
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from backend import batch
+from backend import catalog as catalog_module
+
+RESUME_TEXT = "Data analyst with Python, SQL, Tableau and Excel"
+
+
+@pytest.fixture(autouse=True)
+def keep_catalog():
+    previous = catalog_module._catalog
+    yield
+    catalog_module.set_catalog(previous)
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    paths = []
+    for number in range(12):
+        path = tmp_path / f"resume{number}.txt"
+        path.write_text(RESUME_TEXT)
+        paths.append(str(path))
+    return paths
+
+
+def run(paths, **kwargs):
+    output = io.StringIO()
+    summary = batch.run_batch(paths, output, **kwargs)
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_inline_run_writes_error_records_for_unreadable_files(resumes, tmp_path):
+    missing = str(tmp_path / "missing.txt")
+    summary, records = run(resumes[:2] + [missing], workers=1, chunk_size=2, top_roles=3)
+
+    assert summary['processed'] == 3 and summary['failed'] == 1
+    assert [record['path'] for record in records] == resumes[:2] + [missing]
+    assert records[0]['skills'] == ['Excel', 'Python', 'SQL', 'Tableau']
+    assert len(records[0]['roles']) == 3
+    assert records[2]['error'].startswith("FileNotFoundError")
+
+
+def test_discover_resumes_reads_directories_and_manifests(resumes, tmp_path):
+    (tmp_path / "notes.md").write_text("not a resume")
+    assert list(batch.discover_resumes(str(tmp_path))) == sorted(resumes)
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# resumes\nresume0.txt\n\n" + resumes[1] + "\n")
+    assert list(batch.discover_resumes(str(manifest))) == resumes[:2]
+
+
+_analyze_file = batch.analyze_file
+
+
+def _crash_on_marked_files(path, top_roles=batch.DEFAULT_TOP_ROLES):
+    if 'crash' in os.path.basename(path):
+        os._exit(1)
+    # Keep healthy files slower than noticing the dead worker
+    time.sleep(0.05)
+    return _analyze_file(path, top_roles)
+
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="workers must inherit the patched analyze_file")
+def test_run_continues_after_a_worker_dies(resumes, tmp_path, monkeypatch):
+    crash = tmp_path / "crash.txt"
+    crash.write_text(RESUME_TEXT)
+    paths = resumes[:1] + [str(crash)] + resumes[1:]
+    monkeypatch.setattr(batch, 'analyze_file', _crash_on_marked_files)
+
+    summary, records = run(paths, workers=2, chunk_size=1, top_roles=1)
+
+    assert summary['processed'] == len(paths)
+    assert sorted(record['path'] for record in records) == sorted(paths)
+    crashed = next(record for record in records if record['path'] == str(crash))
+    assert crashed['error'].startswith("BrokenProcessPool")
+    # Only the chunks in flight when the worker died are lost (at most two
+    # per worker); later chunks run in a new pool
+    by_path = {record['path']: record for record in records}
+    assert summary['failed'] <= 4
+    assert all('roles' in by_path[path] for path in paths[-4:])
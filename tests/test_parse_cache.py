@@ -0,0 +1,47 @@
+from backend.parse_cache import ParseCache
+
+
+def result(text):
+    return {'text': text, 'skills': {'Python'}, 'skill_count': 1, 'fingerprint': text[:8]}
+
+
+def test_memory_tier_evicts_by_text_bytes():
+    cache = ParseCache(max_text_bytes=250)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, result(key * 100))
+
+    assert cache.get('a') is None
+    assert cache.get('c')['text'] == 'c' * 100
+    stats = cache.stats()
+    assert stats['size'] == 2
+    assert stats['text_bytes'] == 200
+    assert stats['evictions'] == 1
+
+
+def test_oversized_text_is_kept_only_on_disk(tmp_path):
+    cache = ParseCache(max_text_bytes=50, disk_dir=str(tmp_path))
+    cache.put('big', result('x' * 100))
+
+    assert cache.stats()['size'] == 0
+    assert cache.get('big')['text'] == 'x' * 100
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.stats()['text_bytes'] == 0
+
+
+def test_replacing_an_entry_does_not_double_count():
+    cache = ParseCache(max_text_bytes=1000)
+    cache.put('a', result('a' * 100))
+    cache.put('a', result('a' * 300))
+
+    assert cache.stats()['text_bytes'] == 300
+
+
+def test_text_limit_follows_the_resume_text_setting(monkeypatch):
+    monkeypatch.setenv("CAREER_COMPASS_MAX_RESUME_TEXT_BYTES", "0")
+    cache = ParseCache()
+    cache.put('a', result('some text'))
+    cache.put('empty', result(''))
+
+    assert cache.max_text_bytes == 0
+    assert cache.get('a') is None
+    assert cache.get('empty') is not None
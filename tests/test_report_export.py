@@ -0,0 +1,47 @@
+"""
+Report exports render only the requested roles
+"""
+
+import pytest
+
+from backend import analysis_state, artifacts
+from backend.analysis_state import CompactAnalysis
+from backend.catalog import catalog_from_dict
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.reports import REPORT_FORMATS, AnalysisReport, render_report
+
+
+@pytest.fixture
+def analysis():
+    catalog = catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="tests")
+    resume_data = {'fingerprint': 'resume', 'skills': {'Python', 'SQL', 'Docker'}, 'text': ""}
+    artifacts._export_cache.clear()
+    return CompactAnalysis.from_resume(resume_data, catalog)
+
+
+@pytest.mark.parametrize("fmt", sorted(REPORT_FORMATS))
+def test_export_matches_a_report_over_every_role(analysis, fmt):
+    full = AnalysisReport(analysis.resume_data(), analysis.matches(), analysis.catalog_version)
+    selected = analysis.role_names[1:3]
+    assert artifacts.get_report_export(analysis, fmt, selected) == render_report(fmt, full, selected)
+    assert artifacts.get_report_export(analysis, fmt) == render_report(fmt, full)
+
+
+def test_single_role_export_builds_one_match(analysis, monkeypatch):
+    built = []
+    original = analysis_state.build_match
+
+    def counting_build_match(*args):
+        match = original(*args)
+        built.append(match['role_name'])
+        return match
+
+    monkeypatch.setattr(analysis_state, 'build_match', counting_build_match)
+    role_name = analysis.role_names[2]
+    report = artifacts.get_report_export(analysis, 'markdown', [role_name])
+
+    assert built == [role_name]
+    assert f"## {role_name}" in report.decode('utf-8')
+    # The rendered bytes are cached, not the matches
+    assert artifacts.get_report_export(analysis, 'markdown', [role_name]) is report
+    assert built == [role_name]
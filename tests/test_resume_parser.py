@@ -0,0 +1,56 @@
+"""
+Extraction budgets of parse_resume and the truncated flag
+"""
+
+import io
+
+import pytest
+
+from benchmarks.synthetic import make_pdf
+from backend.resume_parser import parse_resume
+
+
+def upload(name, content):
+    uploaded_file = io.BytesIO(content)
+    uploaded_file.name = name
+    return uploaded_file
+
+
+def test_text_resume_within_budget_is_not_truncated():
+    result = parse_resume(upload("cv.txt", b"Python and SQL"), use_cache=False, max_chars=14)
+    assert result['truncated'] is False
+    assert result['text'] == "Python and SQL"
+
+
+def test_text_resume_cut_by_max_chars_is_truncated():
+    result = parse_resume(upload("cv.txt", b"Python and SQL"), use_cache=False, max_chars=6)
+    assert result['truncated'] is True
+    assert result['text'] == "Python"
+    assert result['skills'] == {'Python'}
+
+
+@pytest.fixture(scope="module")
+def three_page_pdf():
+    pytest.importorskip("PyPDF2")
+    return make_pdf("Python\nSQL\nDocker", lines_per_page=1)
+
+
+def test_pdf_within_budgets_is_not_truncated(three_page_pdf):
+    result = parse_resume(upload("cv.pdf", three_page_pdf), use_cache=False, max_pages=3)
+    assert result['truncated'] is False
+    assert result['skills'] == {'Python', 'SQL', 'Docker'}
+
+
+def test_pdf_cut_by_max_pages_is_truncated(three_page_pdf):
+    result = parse_resume(upload("cv.pdf", three_page_pdf), use_cache=False, max_pages=2, skills_only=True)
+    assert result['truncated'] is True
+    assert result['skills'] == {'Python', 'SQL'}
+
+
+def test_pdf_cut_by_max_chars_is_truncated(three_page_pdf):
+    full = parse_resume(upload("cv.pdf", three_page_pdf), use_cache=False, max_chars=None)
+    first_page = full['text'].split("\n")[0]
+    at_page_end = parse_resume(upload("cv.pdf", three_page_pdf), use_cache=False, max_chars=len(first_page))
+    assert at_page_end['truncated'] is True
+    assert at_page_end['text'] == first_page + "\n"
+    assert full['truncated'] is False
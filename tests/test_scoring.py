@@ -0,0 +1,117 @@
+"""
+Ranking through the role index agrees with scoring every role one by one
+"""
+
+import random
+from typing import Dict, List, Set
+
+import pytest
+
+from backend import catalog as catalog_module
+from backend.career_analyzer import analyze_career_fit, calculate_match_score, top_k_roles
+from backend.catalog import RoleCatalog, catalog_from_dict
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.data.skill_aliases import SKILL_ALIASES
+from benchmarks.synthetic import make_catalog
+
+
+def reference_ranking(catalog: RoleCatalog, user_skills: Set[str]) -> List[Dict]:
+    """Score every role with calculate_match_score, as the analyzer originally did"""
+    matches = []
+    for role_name, role_data in catalog.roles.items():
+        match_score = calculate_match_score(user_skills, role_data['required_skills'])
+        matches.append({
+            'role_name': role_name,
+            'match_score': match_score,
+            'combined_score': round(match_score * 0.7 + role_data['demand_score'] * 0.3, 1)
+        })
+    matches.sort(key=lambda match: match['combined_score'], reverse=True)
+    return matches
+
+
+def random_skill_sets(catalog: RoleCatalog, count: int, seed: int = 0) -> List[Set[str]]:
+    rng = random.Random(seed)
+    skills = list(catalog.skills)
+    skill_sets = []
+    for _ in range(count):
+        chosen = rng.sample(skills, rng.randint(0, min(len(skills), 25)))
+        skill_sets.append({skill.upper() if rng.random() < 0.2 else skill for skill in chosen} | {"Unknown Skill"})
+    return skill_sets
+
+
+def summaries(matches: List[Dict]) -> List[tuple]:
+    return [(match['role_name'], match['match_score'], match['combined_score']) for match in matches]
+
+
+@pytest.fixture
+def builtin_catalog():
+    previous = catalog_module._catalog
+    catalog = catalog_module.set_catalog(
+        catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="builtin", aliases=SKILL_ALIASES)
+    )
+    yield catalog
+    catalog_module.set_catalog(previous)
+
+
+@pytest.fixture(scope="module")
+def synthetic_catalog() -> RoleCatalog:
+    roles, skills = make_catalog(400, 150, seed=3)
+    return catalog_from_dict(roles, skills, source="synthetic")
+
+
+def test_analyze_career_fit_matches_reference(builtin_catalog):
+    for user_skills in random_skill_sets(builtin_catalog, 300):
+        assert summaries(analyze_career_fit(user_skills)) == summaries(reference_ranking(builtin_catalog, user_skills))
+
+
+@pytest.mark.parametrize("k", [1, 3, 7, 20])
+def test_top_k_roles_is_a_prefix_of_the_full_ranking(builtin_catalog, k):
+    for user_skills in random_skill_sets(builtin_catalog, 100, seed=k):
+        assert top_k_roles(user_skills, k) == analyze_career_fit(user_skills)[:k]
+
+
+@pytest.mark.parametrize("k", [1, 10, 50, None])
+def test_rank_matches_reference_on_a_large_catalog(synthetic_catalog, k):
+    index, engine = synthetic_catalog.index, synthetic_catalog.engine
+    for user_skills in random_skill_sets(synthetic_catalog, 50, seed=7):
+        expected = summaries(reference_ranking(synthetic_catalog, user_skills))[:k]
+        ranked = [
+            (index.role_names[score.role_index], score.match_score, score.combined_score)
+            for score in engine.rank(index.encode(user_skills), k)
+        ]
+        assert ranked == expected
+
+
+def test_select_fills_untouched_roles_from_the_zero_ranking(synthetic_catalog):
+    index, engine = synthetic_catalog.index, synthetic_catalog.engine
+    for user_skills in random_skill_sets(synthetic_catalog, 50, seed=11):
+        skill_ids = index.encode(user_skills)
+        touched = engine.score_touched(skill_ids)
+        every_role = sorted(engine.score_ids(skill_ids), key=lambda score: (-score.combined_score, score.role_index))
+        assert engine.select(touched) == every_role
+        assert engine.select(touched, 5) == every_role[:5]
+
+
+def test_rank_min_score_drops_low_roles(synthetic_catalog):
+    index, engine = synthetic_catalog.index, synthetic_catalog.engine
+    skill_ids = index.encode(random_skill_sets(synthetic_catalog, 1, seed=5)[0])
+    ranked = engine.rank(skill_ids, min_score=40.0)
+    assert ranked == [score for score in engine.rank(skill_ids) if score.combined_score >= 40.0]
+
+
+def test_duplicate_required_skills_count_like_calculate_match_score():
+    roles = {
+        name: dict(role_data, required_skills=list(role_data['required_skills']))
+        for name, role_data in JOB_ROLES_DB.items()
+    }
+    role_name = next(iter(roles))
+    required = roles[role_name]['required_skills']
+    required.extend(required[:2])
+    catalog = catalog_from_dict(roles, COMMON_SKILLS, source="duplicates")
+
+    user_skills = {required[0], required[2]}
+    expected = calculate_match_score(user_skills, required)
+    role_index = catalog.index.role_ids[role_name]
+    scores = {score.role_index: score for score in catalog.engine.rank(catalog.index.encode(user_skills))}
+    assert scores[role_index].match_score == expected
+    assert catalog.engine.score_ids(catalog.index.encode(user_skills))[role_index].match_score == expected
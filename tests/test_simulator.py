@@ -0,0 +1,75 @@
+"""
+Incremental what-if re-scoring of SkillSimulator against full scoring
+"""
+
+import pytest
+
+from backend.catalog import catalog_from_dict
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.simulator import SkillSimulator
+
+RESUME_SKILLS = {'Python', 'SQL', 'Excel', 'Git'}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="tests")
+
+
+def full_ranking(catalog, skills):
+    scores = catalog.engine.score(set(skills))
+    return sorted(scores, key=lambda role_score: (-role_score.combined_score, role_score.role_index))
+
+
+@pytest.mark.parametrize("skill", ['Docker', 'Machine Learning', 'Tableau', 'Python', 'SQL'])
+def test_toggling_a_skill_ranks_like_full_scoring(catalog, skill):
+    simulator = SkillSimulator(RESUME_SKILLS, catalog)
+    simulator.toggle(skill)
+    expected_skills = RESUME_SKILLS ^ {skill}
+
+    assert set(simulator.skills) == expected_skills
+    assert simulator.rank() == full_ranking(catalog, expected_skills)
+    assert simulator.rank(5) == full_ranking(catalog, expected_skills)[:5]
+
+
+def test_removing_an_added_skill_restores_the_original_ranking(catalog):
+    simulator = SkillSimulator(RESUME_SKILLS, catalog)
+    original = simulator.rank()
+    assert original == full_ranking(catalog, RESUME_SKILLS)
+
+    simulator.toggle('Docker')
+    simulator.toggle('Kubernetes')
+    assert simulator.rank() != original
+    simulator.toggle('Kubernetes')
+    simulator.toggle('Docker')
+    assert simulator.rank() == original
+
+
+def test_set_skills_and_reset_match_full_scoring(catalog):
+    simulator = SkillSimulator(RESUME_SKILLS, catalog)
+    target = {'Python', 'Docker', 'AWS', 'Linux'}
+    affected = simulator.set_skills(target)
+
+    assert simulator.rank() == full_ranking(catalog, target)
+    index = catalog.index
+    changed = index.encode(target) ^ index.encode(RESUME_SKILLS)
+    assert affected == {role_index for skill_id in changed for role_index in index.postings[skill_id]}
+
+    simulator.reset()
+    assert simulator.rank() == full_ranking(catalog, RESUME_SKILLS)
+
+
+def test_unknown_skill_changes_nothing(catalog):
+    simulator = SkillSimulator(RESUME_SKILLS, catalog)
+    assert simulator.toggle('Underwater Basket Weaving') == set()
+    assert simulator.rank() == full_ranking(catalog, RESUME_SKILLS)
+
+
+def test_top_matches_report_the_change_against_the_resume(catalog):
+    simulator = SkillSimulator(RESUME_SKILLS, catalog)
+    base = {role_score.role_index: role_score.combined_score for role_score in simulator.rank()}
+    simulator.toggle('Docker')
+
+    for match in simulator.top_matches(5):
+        role_index = catalog.index.role_ids[match['role_name']]
+        assert match['score_change'] == round(match['combined_score'] - base[role_index], 1)
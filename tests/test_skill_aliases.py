@@ -0,0 +1,53 @@
+"""
+Alias spellings report their canonical skill and never fire inside other skills
+"""
+
+import pytest
+
+from backend.catalog import catalog_from_dict
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.data.skill_aliases import SKILL_ALIASES
+from backend.skill_matcher import SkillMatcher, tokenize
+
+
+@pytest.fixture(scope="module")
+def matcher() -> SkillMatcher:
+    return catalog_from_dict(JOB_ROLES_DB, COMMON_SKILLS, source="tests", aliases=SKILL_ALIASES).matcher
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("k8s clusters", {"Kubernetes"}),
+    ("sklearn models", {"Scikit-learn"}),
+    ("Postgres and Mongo", {"PostgreSQL", "MongoDB"}),
+    ("Amazon Web Services", {"AWS"}),
+])
+def test_aliases_report_the_canonical_skill(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+@pytest.mark.parametrize("text, unexpected", [
+    ("Node.js and React JS", "JavaScript"),
+    ("ML Ops engineer", "Machine Learning"),
+    ("scikit-image filters", "Scikit-learn"),
+    ("JSON APIs", "JavaScript"),
+])
+def test_aliases_do_not_fire_inside_other_skills(matcher, text, unexpected):
+    assert unexpected not in matcher.find(text)
+
+
+def test_alias_table_has_no_variant_inside_another_skill():
+    spellings = {skill: [skill] for skill in COMMON_SKILLS}
+    for skill, variants in SKILL_ALIASES.items():
+        spellings.setdefault(skill, [skill]).extend(variants)
+
+    def contains(outer, inner):
+        return any(outer[i:i + len(inner)] == inner for i in range(len(outer) - len(inner) + 1))
+
+    for skill, variants in SKILL_ALIASES.items():
+        for variant in variants:
+            tokens = tokenize(variant)
+            for other, other_spellings in spellings.items():
+                if other == skill:
+                    continue
+                for spelling in other_spellings:
+                    assert not contains(tokenize(spelling), tokens), (variant, skill, spelling)
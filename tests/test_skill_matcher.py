@@ -0,0 +1,40 @@
+"""
+Token boundaries of the compiled skill matcher
+"""
+
+import pytest
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.skill_matcher import SkillMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher() -> SkillMatcher:
+    return SkillMatcher(COMMON_SKILLS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("JavaScript developer", {"JavaScript"}),
+    ("Java and JavaScript", {"Java", "JavaScript"}),
+    ("MySQL administration", {"MySQL"}),
+    ("SQL, MySQL and NoSQL", {"SQL", "MySQL", "NoSQL"}),
+    ("C++ and C# services", {"C++", "C#"}),
+    ("Node.js backends", {"Node.js"}),
+    ("CI/CD pipelines", {"CI/CD"}),
+    ("javascript, PYTHON and sql", {"JavaScript", "Python", "SQL"}),
+])
+def test_skills_match_on_whole_tokens(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_skill_spanning_a_line_break(matcher):
+    assert matcher.find("Machine\n   Learning") == {"Machine Learning"}
+
+
+def test_scanner_matches_skills_split_across_chunks(matcher):
+    pages = ["Experience with Machine", "Learning, C++ and Node.js", "on Kubernetes"]
+    scanner = matcher.scanner()
+    found = set()
+    for page in pages:
+        found |= scanner.feed(page)
+    assert found == matcher.find(" ".join(pages)) == {"Machine Learning", "C++", "Node.js", "Kubernetes"}